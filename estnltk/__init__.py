@@ -1,18 +1,73 @@
 # -*- coding: utf-8 -*-
+"""
+Estnltk -- open source tools for Estonian natural language processing.
+
+The public names of the package are imported lazily, on their first access,
+so that ``import estnltk`` does not load NLTK, pandas, the NER models or the
+Java-based taggers until they are actually needed.
+"""
 from __future__ import unicode_literals, print_function, absolute_import
 
+import sys
+import importlib
+
+import six
+
 from .__about__ import __version__
 
-from .vabamorf.morf import Vabamorf, analyze, spellcheck, fix_spelling, synthesize, disambiguate
-from .vabamorf.morf import syllabify_word, syllabify_words
-from .text import Text
-from .textcleaner import TextCleaner, EST_ALPHA, RUS_ALPHA, DIGITS, WHITESPACE, PUNCTUATION, ESTONIAN, RUSSIAN
-from .disambiguator import Disambiguator
-from .ner import NerTrainer, NerTagger
-from .timex import TimexTagger
-from .clausesegmenter import ClauseSegmenter
-from .disambiguator import Disambiguator
-from .prettyprinter import PrettyPrinter
-from .grammar import *
-from .database import elastic
-from .tokenizers.word_tokenizer import EstWordTokenizer
+# public name -> (module relative to this package, attribute of the module or None for the module itself)
+_LAZY_ATTRIBUTES = {}
+
+
+def _register(module, names):
+    for name in names:
+        _LAZY_ATTRIBUTES[name] = (module, name)
+
+
+_register('vabamorf.morf', ['Vabamorf', 'analyze', 'analyze_sentences', 'spellcheck', 'fix_spelling',
+                            'synthesize', 'disambiguate', 'syllabify_word', 'syllabify_words'])
+_register('text', ['Text', 'TextView', 'analyze_texts'])
+_register('textcleaner', ['TextCleaner', 'EST_ALPHA', 'RUS_ALPHA', 'DIGITS', 'WHITESPACE', 'PUNCTUATION',
+                          'ESTONIAN', 'RUSSIAN'])
+_register('disambiguator', ['Disambiguator'])
+_register('ner', ['NerTrainer', 'NerTagger'])
+_register('timex', ['TimexTagger'])
+_register('clausesegmenter', ['ClauseSegmenter'])
+_register('prettyprinter', ['PrettyPrinter'])
+_register('grammar.grammar', ['Symbol', 'Regex', 'IRegex', 'Lemmas', 'Postags', 'Suffix', 'Layer', 'LayerRegex',
+                              'Union', 'Intersection', 'Concatenation', 'AllGaps', 'Gaps',
+                              'concat', 'allgaps', 'gaps'])
+_register('grammar.match', ['Match', 'concatenate_matches', 'copy_rename', 'intersect'])
+_register('grammar.conflictresolver', ['resolve_using_maximal_coverage'])
+_register('tokenizers.word_tokenizer', ['EstWordTokenizer'])
+_LAZY_ATTRIBUTES['elastic'] = ('database.elastic', None)
+
+__all__ = sorted(_LAZY_ATTRIBUTES) + ['__version__']
+
+
+def __getattr__(name):
+    """Import the module of a public name on its first access (PEP 562)."""
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    try:
+        module = importlib.import_module('.' + module_name, __name__)
+        value = module if attribute is None else getattr(module, attribute)
+    except Exception as e:
+        # an AttributeError escaping from here would be reported as a missing name, hiding the cause
+        six.raise_from(ImportError('cannot import name {!r} from {!r}: {}: {}'.format(
+            name, __name__ + '.' + module_name, type(e).__name__, e)), e)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+# module level __getattr__ is not supported before Python 3.7, import everything eagerly
+if sys.version_info < (3, 7):
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
+    del _name
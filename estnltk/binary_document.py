@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""Binary document format with separately readable layers.
+
+A document is stored as a table of contents followed by the text and the layers, so that
+only the requested layers have to be read and decoded. The spans of simple layers are stored
+as arrays of integers, which can be used directly from the memory-mapped file.
+
+File layout (integers are little-endian):
+
+  header     : magic (4 bytes), version (16-bit), length of the table of contents (32-bit)
+  contents   : UTF-8 encoded JSON object with the position and length of the text, the other
+               attributes of the document and every layer
+  sections   : the text, the attributes and the layers; every layer is stored as
+               the spans of its elements (32-bit integers: start, end, start, end, ...)
+               and the JSON list of the other attributes of its elements, or as
+               the JSON list of its elements, if the layer is not simple
+
+The span arrays are aligned to 4 bytes.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import io
+import sys
+import mmap
+import json
+import struct
+from array import array
+
+import six
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from .names import TEXT, START, END
+from .columnar import ColumnarLayer
+from .corpus_io import json_default
+
+MAGIC = b'ETXB'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHI')
+
+
+def is_binary_document(fnm):
+    """Check whether the file is in the binary document format."""
+    with io.open(fnm, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def is_layer(value):
+    """Check whether a value of a document is a layer: a list of elements with START and END positions.
+
+    Other lists, for example of categories or authors, are ordinary attributes of the document.
+    An empty list is taken to be an empty layer.
+    """
+    if isinstance(value, ColumnarLayer):
+        return True
+    return isinstance(value, list) and all(isinstance(elem, Mapping) and START in elem and END in elem
+                                           for elem in value)
+
+
+def _is_simple(elements):
+    return len(elements) > 0 and all(isinstance(elem[START], six.integer_types) and
+                                     isinstance(elem[END], six.integer_types) for elem in elements)
+
+
+def _dumps(value):
+    return json.dumps(value, default=json_default).encode('utf-8')
+
+
+def encode_document(document):
+    """Encode a document in the binary format.
+
+    Parameters
+    ----------
+    document: dict or Text
+        The document.
+
+    Returns
+    -------
+    bytes
+    """
+    sections = []
+    position = [0]
+
+    def add(data, align=1):
+        padding = -position[0] % align
+        if padding:
+            sections.append(b'\0' * padding)
+            position[0] += padding
+        sections.append(data)
+        position[0] += len(data)
+        return [position[0] - len(data), len(data)]
+
+    text = add(document[TEXT].encode('utf-8'))
+    attributes = dict((key, value) for key, value in document.items()
+                      if key != TEXT and not is_layer(value))
+    contents = {'text': text, 'attributes': add(_dumps(attributes)), 'layers': {}}
+    for name, elements in document.items():
+        if name == TEXT or not is_layer(elements):
+            continue
+        layer = {'n': len(elements)}
+        if _is_simple(elements):
+            spans = array('i')
+            for elem in elements:
+                spans.append(elem[START])
+                spans.append(elem[END])
+            if sys.byteorder != 'little':
+                spans.byteswap()
+            layer['spans'] = add(spans.tostring() if six.PY2 else spans.tobytes(), align=4)
+            other = [dict((key, value) for key, value in elem.items() if key not in (START, END)) for elem in elements]
+            # the elements that have only spans are not stored
+            layer['data'] = add(_dumps(other)) if any(other) else None
+        else:
+            layer['spans'] = None
+            layer['data'] = add(_dumps(list(elements)))
+        contents['layers'][name] = layer
+
+    # the positions are relative to the end of the contents, which is padded to keep the arrays aligned
+    contents_data = _dumps(contents)
+    contents_data += b' ' * (-(_HEADER.size + len(contents_data)) % 4)
+    return b''.join([_HEADER.pack(MAGIC, VERSION, len(contents_data)), contents_data] + sections)
+
+
+def write_binary_document(document, fnm):
+    """Write a document to a file in the binary format.
+
+    Parameters
+    ----------
+    document: dict or Text
+        The document.
+    fnm: str
+        The path of the file.
+    """
+    with io.open(fnm, 'wb') as f:
+        f.write(encode_document(document))
+
+
+class BinaryDocument(object):
+    """A document in the binary format, whose layers are decoded on request.
+
+    Parameters
+    ----------
+    buffer: mmap.mmap or bytes
+        The encoded document (see :py:func:`encode_document`).
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        magic, version, contents_len = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a binary document.')
+        self._base = _HEADER.size + contents_len
+        self._contents = json.loads(buffer[_HEADER.size:self._base].decode('utf-8'))
+
+    @classmethod
+    def open(cls, fnm):
+        """Open a document file with mmap."""
+        with io.open(fnm, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except (ValueError, struct.error):
+            buffer.close()
+            raise
+
+    def close(self):
+        """Close the memory-mapped file. The span arrays returned by :py:meth:`spans` must be released before."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _section(self, section):
+        start = self._base + section[0]
+        return self._buffer[start:start + section[1]]
+
+    @property
+    def layers(self):
+        """The names of the layers."""
+        return sorted(self._contents['layers'])
+
+    @property
+    def text(self):
+        return self._section(self._contents['text']).decode('utf-8')
+
+    def attributes(self):
+        """The attributes of the document that are not layers."""
+        return json.loads(self._section(self._contents['attributes']).decode('utf-8'))
+
+    def spans(self, layer):
+        """The positions of the elements of a simple layer: start, end, start, end, ...
+
+        On Python 3 and little-endian machines, this is a memoryview of the memory-mapped file
+        (``spans[0::2]`` are the starts, ``spans[1::2]`` the ends), otherwise an array.
+
+        Returns
+        -------
+        sequence of int or None
+            The positions, or None if the layer is not simple.
+        """
+        section = self._contents['layers'][layer]['spans']
+        if section is None:
+            return None
+        if not six.PY2 and sys.byteorder == 'little':
+            start = self._base + section[0]
+            return memoryview(self._buffer)[start:start + section[1]].cast('i')
+        spans = array('i')
+        if six.PY2:
+            spans.fromstring(self._section(section))
+        else:
+            spans.frombytes(self._section(section))
+        if sys.byteorder != 'little':
+            spans.byteswap()
+        return spans
+
+    def layer(self, layer):
+        """The elements of a layer as a list of dicts."""
+        info = self._contents['layers'][layer]
+        data = json.loads(self._section(info['data']).decode('utf-8')) if info['data'] else None
+        if info['spans'] is None:
+            return data or []
+        spans = self.spans(layer)
+        starts, ends = spans[0::2].tolist(), spans[1::2].tolist()
+        if isinstance(spans, memoryview):
+            spans.release()
+        if data is None:
+            data = [{} for _ in range(info['n'])]
+        for elem, start, end in zip(data, starts, ends):
+            elem[START] = start
+            elem[END] = end
+        return data
+
+    def to_dict(self, layers=None):
+        """Decode the text, the attributes and the given layers.
+
+        Parameters
+        ----------
+        layers: list of str
+            The names of the layers to decode (default: all layers). Missing layers are ignored.
+        """
+        document = self.attributes()
+        document[TEXT] = self.text
+        for layer in (self.layers if layers is None else layers):
+            if layer in self._contents['layers']:
+                document[layer] = self.layer(layer)
+        return document
+
+
+def read_binary_document(fnm, layers=None):
+    """Read a document in the binary format.
+
+    Parameters
+    ----------
+    fnm: str
+        The path of the document.
+    layers: list of str
+        The names of the layers to read (default: all layers).
+
+    Returns
+    -------
+    dict
+    """
+    with BinaryDocument.open(fnm) as document:
+        return document.to_dict(layers)
@@ -17,6 +17,13 @@ import os.path
 import re
 
 CLAUSE_ANNOT = 'clauseAnnotation'
+PHONETIC_MARKUP = re.compile('[?<\]]([aioueöäõü])')
+
+
+def clean_root(root):
+    """Remove the phonetic markup from the root."""
+    return PHONETIC_MARKUP.sub('\\1', root.replace('~', ''))
+
 
 class ClauseSegmenter(JavaProcess):
     """ Wrapper class around Java-based clause segmenter (Osalausestaja). 
@@ -28,13 +35,52 @@ class ClauseSegmenter(JavaProcess):
         ignore_missing_commas = kwargs.get('ignore_missing_commas', False)
         if ignore_missing_commas:
             args.append('-ins_comma_mis')
-        JavaProcess.__init__(self, 'Osalau.jar', args)
+        JavaProcess.__init__(self, 'Osalau.jar', args, workers=kwargs.get('workers', 1))
 
     def tag(self, text):
-        sentences = text.divide()
-        for sentence in sentences:
-            self.mark_annotations(sentence)
+        self.tag_texts([text])
         return text
+
+    def tag_texts(self, texts):
+        """Tag clause annotations of several texts with a single request to the
+        clause segmenter.
+
+        Parameters
+        ----------
+        texts: list of Text
+            The texts with morphological analysis.
+
+        Returns
+        -------
+        list of Text
+            The same texts.
+        """
+        sentences = [sentence for text in texts for sentence in text.divide()]
+        for sentence, annotations in zip(sentences, self.detect_annotations_batch(sentences)):
+            assert len(sentence) == len(annotations)
+            for w, a in zip(sentence, annotations):
+                for k, v in a.items():
+                    w[k] = v
+        return texts
+
+    def detect_annotations_batch(self, sentences):
+        """Detect the clause annotations of several sentences with a single request.
+
+        Parameters
+        ----------
+        sentences: list of list of dict
+            The words of the sentences, with morphological analysis.
+
+        Returns
+        -------
+        list of list of dict
+            The clause annotations of the words of each sentence.
+        """
+        if not sentences:
+            return []
+        input_data = {SENTENCES: [{WORDS: self.prepare_words(sentence)} for sentence in sentences]}
+        result = json.loads(self.process_line(json.dumps(input_data)))
+        return [self.rename_annotations(self.annotate_indices(sentence[WORDS])) for sentence in result[SENTENCES]]
     
     def detect_annotations(self, sentence):
         prep_sentence = self.prepare_sentence(deepcopy(sentence))
@@ -50,14 +96,23 @@ class ClauseSegmenter(JavaProcess):
                 w[k] = v
         return sentence
     
+    def prepare_words(self, sentence):
+        """Prepare the words of the sentence for segment detection.
+        Only the fields read by the clause segmenter are copied."""
+        return [{TEXT: word[TEXT],
+                 ANALYSIS: [{ROOT: clean_root(analysis[ROOT]),
+                             POSTAG: analysis[POSTAG],
+                             FORM: analysis[FORM],
+                             ENDING: analysis[ENDING]} for analysis in word[ANALYSIS]]}
+                for word in sentence]
+
     def prepare_sentence(self, sentence):
         """Prepare the sentence for segment detection."""
         # depending on how the morphological analysis was added, there may be
         # phonetic markup. Remove it, if it exists.
         for word in sentence:
             for analysis in word[ANALYSIS]:
-                analysis[ROOT] = analysis[ROOT].replace('~', '')
-                analysis[ROOT] = re.sub('[?<\]]([aioueöäõü])', '\\1', analysis[ROOT])
+                analysis[ROOT] = clean_root(analysis[ROOT])
         return json.dumps({WORDS: sentence})
     
         
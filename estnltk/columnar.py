@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""Columnar storage of simple layers.
+
+A :py:class:`ColumnarLayer` keeps the elements of a layer in columns instead of a list of dicts:
+start and end positions in integer arrays, other attributes as indices into a vocabulary of
+distinct values and the morphological analyses of words as an offset-indexed ragged array.
+This takes a fraction of the memory of the dicts of a large document.
+
+The layer can still be used as a list of dicts: ``text['words'][i]`` returns a mutable
+mapping, whose changes are stored back in the columns. The analyses of a word are decoded
+anew on every read, so changed analyses must be assigned back: ``word['analysis'] = analyses``. Texts are converted with
+:py:meth:`~estnltk.text.Text.compact` and back with :py:meth:`~estnltk.text.Text.expand`.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+from array import array
+from copy import deepcopy
+
+import six
+
+try:
+    from collections.abc import Sequence, MutableMapping
+except ImportError:
+    from collections import Sequence, MutableMapping
+
+from .names import START, END, ANALYSIS
+
+MISSING = -1
+
+
+def value_key(value):
+    """The key of a value in column vocabulary, or None if the value is not stored only once."""
+    if value is None or isinstance(value, (six.string_types, six.integer_types, float)):
+        return type(value), value
+    if isinstance(value, list) and all(isinstance(v, six.string_types) for v in value):
+        return list, tuple(value)
+    return None
+
+
+class Column(object):
+    """Column of attribute values, stored as indices into a vocabulary.
+
+    Equal strings, numbers and lists of strings (such as root tokens) are stored only once.
+    Other values are stored as they are.
+
+    Parameters
+    ----------
+    n: int
+        The initial number of (missing) values.
+    """
+
+    def __init__(self, n=0):
+        self.codes = array('i', [MISSING]) * n
+        self.vocabulary = []
+        self.__index = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def encode(self, value):
+        key = value_key(value)
+        if key is not None:
+            code = self.__index.get(key)
+            if code is None:
+                code = len(self.vocabulary)
+                self.__index[key] = code
+                self.vocabulary.append(key[1])
+            return code
+        self.vocabulary.append(value)
+        return len(self.vocabulary) - 1
+
+    def decode(self, code):
+        value = self.vocabulary[code]
+        if isinstance(value, tuple):
+            return list(value)
+        return value
+
+    def has(self, idx):
+        return self.codes[idx] != MISSING
+
+    def get(self, idx):
+        code = self.codes[idx]
+        if code == MISSING:
+            raise KeyError(idx)
+        return self.decode(code)
+
+    def set(self, idx, value):
+        self.codes[idx] = self.encode(value)
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def append_missing(self):
+        self.codes.append(MISSING)
+
+
+class ColumnarLayer(Sequence):
+    """Simple layer stored in columns.
+
+    Parameters
+    ----------
+    elements: iterable of dict
+        The elements of the layer. Their positions must be simple (start, end) spans.
+    """
+
+    def __init__(self, elements=()):
+        self.starts = array('i')
+        self.ends = array('i')
+        self.columns = {}
+        self.analysis_offsets = array('i', [0])
+        self.analysis_columns = {}
+        self.__analysis = {}  # analyses assigned after construction
+        self.__no_analysis = set()
+        for elem in elements:
+            self.append(elem)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [ColumnarElement(self, i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('layer index out of range')
+        return ColumnarElement(self, idx)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, ColumnarLayer)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_list())
+
+    def append(self, elem):
+        """Add an element to the end of the layer."""
+        start, end = elem[START], elem[END]
+        if not isinstance(start, six.integer_types) or not isinstance(end, six.integer_types):
+            raise ValueError('Only layers of simple spans can be stored in columns.')
+        n = len(self)
+        self.starts.append(start)
+        self.ends.append(end)
+        for key, value in elem.items():
+            if key in (START, END, ANALYSIS):
+                continue
+            if key not in self.columns:
+                self.columns[key] = Column(n)
+            self.columns[key].append(value)
+        for column in self.columns.values():
+            if len(column) == n:
+                column.append_missing()
+        total = self.analysis_offsets[-1]
+        if ANALYSIS in elem:
+            for analysis in elem[ANALYSIS]:
+                for key, value in analysis.items():
+                    if key not in self.analysis_columns:
+                        self.analysis_columns[key] = Column(total)
+                    self.analysis_columns[key].append(value)
+                total += 1
+                for column in self.analysis_columns.values():
+                    if len(column) < total:
+                        column.append_missing()
+        else:
+            self.__no_analysis.add(n)
+        self.analysis_offsets.append(total)
+
+    def has(self, idx, key):
+        if key in (START, END):
+            return True
+        if key == ANALYSIS:
+            return idx not in self.__no_analysis
+        column = self.columns.get(key)
+        return column is not None and column.has(idx)
+
+    def keys(self, idx):
+        keys = [START, END]
+        keys.extend(key for key, column in self.columns.items() if column.has(idx))
+        if idx not in self.__no_analysis:
+            keys.append(ANALYSIS)
+        return keys
+
+    def get(self, idx, key):
+        if key == START:
+            return self.starts[idx]
+        if key == END:
+            return self.ends[idx]
+        if key == ANALYSIS:
+            # the decoded analyses are not kept, that would bring back the dicts of every word
+            analysis = self.__analysis.get(idx)
+            if analysis is None:
+                return self.__decode_analysis(idx)
+            return analysis
+        column = self.columns.get(key)
+        if column is None:
+            raise KeyError(key)
+        try:
+            return column.get(idx)
+        except KeyError:
+            raise KeyError(key)
+
+    def set(self, idx, key, value):
+        if key == START:
+            self.starts[idx] = value
+        elif key == END:
+            self.ends[idx] = value
+        elif key == ANALYSIS:
+            self.__analysis[idx] = value
+            self.__no_analysis.discard(idx)
+        else:
+            if key not in self.columns:
+                self.columns[key] = Column(len(self))
+            self.columns[key].set(idx, value)
+
+    def delete(self, idx, key):
+        if not self.has(idx, key):
+            raise KeyError(key)
+        if key in (START, END):
+            raise TypeError('Element positions cannot be deleted.')
+        if key == ANALYSIS:
+            self.__analysis.pop(idx, None)
+            self.__no_analysis.add(idx)
+        else:
+            self.columns[key].codes[idx] = MISSING
+
+    def __decode_analysis(self, idx):
+        if idx in self.__no_analysis:
+            raise KeyError(ANALYSIS)
+        analyses = []
+        for i in range(self.analysis_offsets[idx], self.analysis_offsets[idx+1]):
+            analyses.append(dict((key, column.decode(column.codes[i]))
+                                 for key, column in self.analysis_columns.items() if column.has(i)))
+        return analyses
+
+    def element(self, idx):
+        """The element with given index as a new dict."""
+        elem = dict((key, self.get(idx, key)) for key in self.keys(idx) if key != ANALYSIS)
+        if idx not in self.__no_analysis:
+            analysis = self.__analysis.get(idx)
+            elem[ANALYSIS] = analysis if analysis is not None else self.__decode_analysis(idx)
+        return elem
+
+    def to_list(self):
+        """The elements of the layer as a list of dicts."""
+        return [self.element(idx) for idx in range(len(self))]
+
+    def values(self, key):
+        """The values of given attribute of all elements.
+
+        Raises KeyError, if an element does not have the attribute.
+        """
+        if key == START:
+            return list(self.starts)
+        if key == END:
+            return list(self.ends)
+        if key == ANALYSIS:
+            return [self.get(idx, ANALYSIS) for idx in range(len(self))]
+        column = self.columns.get(key)
+        if column is None:
+            if len(self) > 0:
+                raise KeyError(key)
+            return []
+        decoded = [column.decode(code) for code in range(len(column.vocabulary))]
+        values = []
+        for code in column.codes:
+            if code == MISSING:
+                raise KeyError(key)
+            values.append(decoded[code])
+        return values
+
+    def analysis_values(self, key):
+        """The values of given analysis attribute of every element.
+
+        Returns
+        -------
+        list of list
+            The values for all analyses of each element that have the attribute.
+        """
+        result = []
+        column = self.analysis_columns.get(key)
+        offsets = self.analysis_offsets
+        for idx in range(len(self)):
+            analysis = self.__analysis.get(idx)
+            if analysis is not None:
+                result.append([an[key] for an in analysis if key in an])
+            elif idx in self.__no_analysis:
+                raise KeyError(ANALYSIS)
+            elif column is None:
+                result.append([])
+            else:
+                codes = column.codes
+                result.append([column.decode(codes[i]) for i in range(offsets[idx], offsets[idx+1])
+                               if codes[i] != MISSING])
+        return result
+
+
+class ColumnarElement(MutableMapping):
+    """An element of a :py:class:`ColumnarLayer` that behaves as a dict."""
+
+    __slots__ = ('layer', 'idx')
+
+    def __init__(self, layer, idx):
+        self.layer = layer
+        self.idx = idx
+
+    def __getitem__(self, key):
+        return self.layer.get(self.idx, key)
+
+    def __setitem__(self, key, value):
+        self.layer.set(self.idx, key, value)
+
+    def __delitem__(self, key):
+        self.layer.delete(self.idx, key)
+
+    def __contains__(self, key):
+        return self.layer.has(self.idx, key)
+
+    def __iter__(self):
+        return iter(self.layer.keys(self.idx))
+
+    def __len__(self):
+        return len(self.layer.keys(self.idx))
+
+    def copy(self):
+        return self.layer.element(self.idx)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(self.copy(), memo)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+LAYER_TYPES = (list, ColumnarLayer)
@@ -2,6 +2,9 @@
 from __future__ import unicode_literals, print_function, absolute_import
 
 from .text import Text
+from .corpus_io import yield_jsonl, write_jsonl
+from .binary_document import is_layer, is_binary_document, read_binary_document, write_binary_document
+from .names import TEXT
 
 import codecs
 import json
@@ -11,6 +14,7 @@ def yield_json_corpus(fnm):
     """Function to read a JSON corpus from a file.
     A JSON corpus contains one document per line, encoded in JSON.
     Each line is yielded after it is read.
+    See :py:func:`estnltk.corpus_io.yield_jsonl` for reading compressed corpora in parallel.
 
     Parameters
     ----------
@@ -21,11 +25,8 @@ def yield_json_corpus(fnm):
     -------
     generator of Text
     """
-    with codecs.open(fnm, 'rb', 'ascii') as f:
-        line = f.readline()
-        while line != '':
-            yield Text(json.loads(line))
-            line = f.readline()
+    for doc in yield_jsonl(fnm):
+        yield Text(doc)
 
 
 def read_json_corpus(fnm):
@@ -55,29 +56,37 @@ def write_json_corpus(documents, fnm):
     fnm: str
         The path to save the corpus.
     """
-    with codecs.open(fnm, 'wb', 'ascii') as f:
-        for document in documents:
-            f.write(json.dumps(document) + '\n')
+    write_jsonl(documents, fnm)
     return documents
 
 
-def read_document(fnm):
-    """Read a document that is stored in a text file as JSON.
+def read_document(fnm, layers=None):
+    """Read a document that is stored in a text file as JSON or in the binary format.
 
     Parameters
     ----------
     fnm: str
         The path of the document.
+    layers: list of str
+        The names of the layers to read (default: all layers). Documents in the binary format
+        (see :py:mod:`estnltk.binary_document`) decode only these layers, JSON documents are
+        decoded fully and the other layers are dropped.
 
     Returns
     -------
     Text
     """
+    if is_binary_document(fnm):
+        return Text(read_binary_document(fnm, layers))
     with codecs.open(fnm, 'rb', 'ascii') as f:
-        return Text(json.loads(f.read()))
+        doc = json.loads(f.read())
+    if layers is not None:
+        doc = dict((key, value) for key, value in doc.items()
+                   if key in layers or key == TEXT or not is_layer(value))
+    return Text(doc)
 
 
-def write_document(doc, fnm):
+def write_document(doc, fnm, binary=False):
     """Write a Text document to file.
 
     Parameters
@@ -86,6 +95,12 @@ def write_document(doc, fnm):
         The document to save.
     fnm: str
         The filename to save the document
+    binary: boolean (default: False)
+        If True, write the document in the binary format, whose layers can be read separately
+        (see :py:mod:`estnltk.binary_document`).
     """
+    if binary:
+        write_binary_document(doc, fnm)
+        return
     with codecs.open(fnm, 'wb', 'ascii') as f:
         f.write(json.dumps(doc, indent=2))
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""Reading and writing large JSON-lines corpora.
+
+A JSON-lines corpus contains one document per line, encoded in JSON (see also :py:mod:`estnltk.corpus`).
+The files can be compressed with gzip (``.gz``) or zstandard (``.zst``, requires the ``zstandard`` package).
+They are read and written in large chunks, the lines can be decoded in a pool of worker processes
+and reading can be resumed from the position after any document::
+
+    from estnltk.corpus_io import yield_jsonl, write_jsonl
+
+    for offset, doc in yield_jsonl('corpus.jsonl.gz', processes=4, with_offsets=True):
+        ...
+    # later, continue after the last processed document
+    for doc in yield_jsonl('corpus.jsonl.gz', offset=offset):
+        ...
+
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import gc
+import io
+import json
+import gzip
+import multiprocessing
+from collections import deque
+
+from .columnar import ColumnarLayer, ColumnarElement
+
+# the number of bytes read or written at once
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def open_corpus_file(fnm, mode='rb'):
+    """Open a corpus file for reading or writing bytes, decompressing or compressing it by its extension.
+
+    Parameters
+    ----------
+    fnm: str
+        The path of the file. Files ending with ``.gz`` are gzip compressed,
+        files ending with ``.zst`` or ``.zstd`` are zstandard compressed.
+    mode: str
+        Either 'rb' or 'wb'.
+
+    Returns
+    -------
+    file object
+    """
+    if mode not in ('rb', 'wb'):
+        raise ValueError('Unsupported mode <{0}>!'.format(mode))
+    if fnm.endswith('.gz'):
+        return gzip.open(fnm, mode)
+    if fnm.endswith('.zst') or fnm.endswith('.zstd'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('Reading and writing zstandard compressed corpora requires the "zstandard" package.')
+        fh = io.open(fnm, mode)
+        if mode == 'rb':
+            return zstandard.ZstdDecompressor().stream_reader(fh, closefd=True)
+        return zstandard.ZstdCompressor().stream_writer(fh, closefd=True)
+    return io.open(fnm, mode)
+
+
+def skip_bytes(stream, offset, chunk_size=CHUNK_SIZE):
+    """Move the position of a stream forward by `offset` bytes, also if the stream does not support seeking."""
+    if offset <= 0:
+        return
+    try:
+        if stream.seekable():
+            stream.seek(offset)
+            return
+    except (AttributeError, IOError, OSError):
+        pass
+    while offset > 0:
+        data = stream.read(min(offset, chunk_size))
+        if not data:
+            break
+        offset -= len(data)
+
+
+def read_line_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Read the stream in chunks of whole lines.
+
+    Yields
+    ------
+    list of bytes
+        The lines of a chunk, including the line breaks.
+    """
+    pending = b''
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        data = pending + data
+        end = data.rfind(b'\n') + 1
+        pending = data[end:]
+        if end > 0:
+            yield data[:end].splitlines(True)
+    if pending:
+        yield [pending]
+
+
+def iter_decode_lines(lines):
+    """Decode the JSON documents of the lines one by one, skipping the empty lines."""
+    for line in lines:
+        if line.strip():
+            yield json.loads(line.decode('utf-8'))
+
+
+def decode_lines(lines):
+    """Decode the JSON documents of the lines, skipping the empty lines."""
+    return _without_gc(lambda: list(iter_decode_lines(lines)))
+
+
+def _without_gc(func):
+    # the cyclic garbage collector would repeatedly scan the documents being created
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return func()
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def yield_jsonl(fnm, as_text=False, offset=0, processes=None, with_offsets=False, chunk_size=CHUNK_SIZE,
+                max_in_flight=None, **kwargs):
+    """Read the documents of a JSON-lines corpus.
+
+    Parameters
+    ----------
+    fnm: str
+        The path of the corpus, possibly compressed (see :py:func:`open_corpus_file`).
+    as_text: boolean (default: False)
+        If True, yield :py:class:`~estnltk.text.Text` instances instead of plain dictionaries.
+    offset: int
+        The position in the (uncompressed) corpus to start reading from.
+        Must be the start of a line, for example an offset yielded with `with_offsets`.
+        Compressed corpora are decompressed up to the offset.
+    processes: int
+        The number of worker processes decoding the lines (default: decode in this process).
+        The decoded documents are sent back to this process, which takes about the half of
+        the decoding time, so the workers pay off only with several free CPU cores.
+    with_offsets: boolean (default: False)
+        If True, yield (offset, document) pairs, where the offset is the position after the document
+        and can be used to resume reading.
+    chunk_size: int
+        The number of bytes read at once. A chunk is decoded by a single worker.
+    max_in_flight: int
+        The maximum number of chunks being decoded at once (default: two times the number of processes).
+    kwargs:
+        Keyword arguments for :py:class:`~estnltk.text.Text`, if `as_text` is True.
+
+    Yields
+    ------
+    dict or Text or (int, dict) or (int, Text)
+        The documents in the order of the corpus.
+    """
+    if as_text:
+        from .text import Text
+    with open_corpus_file(fnm, 'rb') as stream:
+        skip_bytes(stream, offset, chunk_size)
+        for lines, docs in _decode_chunks(read_line_chunks(stream, chunk_size), processes, max_in_flight):
+            if with_offsets:
+                # the lines are matched with the documents, as the empty lines have no document
+                docs = iter(docs)
+                for line in lines:
+                    offset += len(line)
+                    if line.strip():
+                        doc = next(docs)
+                        yield offset, Text(doc, **kwargs) if as_text else doc
+            else:
+                for doc in docs:
+                    yield Text(doc, **kwargs) if as_text else doc
+
+
+def _decode_chunks(chunks, processes, max_in_flight):
+    if not processes or processes <= 1:
+        for lines in chunks:
+            yield lines, iter_decode_lines(lines)
+        return
+    max_in_flight = max_in_flight or 2 * processes
+    pool = multiprocessing.Pool(processes)
+    try:
+        in_flight = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < max_in_flight:
+                try:
+                    lines = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight.append((lines, pool.apply_async(decode_lines, (lines, ))))
+            if not in_flight:
+                break
+            lines, result = in_flight.popleft()
+            yield lines, _without_gc(result.get)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def json_default(value):
+    """Convert the values that the json module cannot serialize, for the `default` argument of json.dumps."""
+    # columnar layers (see Text.compact) are written as lists of dicts
+    if isinstance(value, ColumnarLayer):
+        return value.to_list()
+    if isinstance(value, ColumnarElement):
+        return value.copy()
+    raise TypeError('Object of type {0} is not JSON serializable'.format(type(value).__name__))
+
+
+def write_jsonl(documents, fnm, chunk_size=CHUNK_SIZE, ensure_ascii=True):
+    """Write the documents as a JSON-lines corpus.
+
+    Parameters
+    ----------
+    documents: iterable of dict or Text
+        The documents of the corpus.
+    fnm: str
+        The path of the corpus, compressed according to its extension (see :py:func:`open_corpus_file`).
+    chunk_size: int
+        The number of bytes buffered before writing.
+    ensure_ascii: boolean (default: True)
+        Escape the non-ASCII characters, as :py:func:`estnltk.corpus.write_json_corpus` does.
+
+    Returns
+    -------
+    int
+        The number of documents written.
+    """
+    n_documents = 0
+    with open_corpus_file(fnm, 'wb') as stream:
+        buffer = []
+        buffered = 0
+        for document in documents:
+            line = (json.dumps(document, ensure_ascii=ensure_ascii, default=json_default) + '\n').encode('utf-8')
+            buffer.append(line)
+            buffered += len(line)
+            n_documents += 1
+            if buffered >= chunk_size:
+                stream.write(b''.join(buffer))
+                buffer = []
+                buffered = 0
+        if buffer:
+            stream.write(b''.join(buffer))
+    return n_documents
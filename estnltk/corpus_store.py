@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""Sharded corpus store with random access to its documents.
+
+A corpus store is a directory of shard files, each containing documents as JSON lines
+(see :py:mod:`estnltk.corpus_io`), and an index file that maps the document ids to the shard,
+byte offset and length of the documents, along with some metadata of the documents::
+
+    from estnltk.corpus_store import CorpusStore, write_corpus_store
+
+    write_corpus_store(parse_tei_corpora('koondkorpus'), 'koond_store')
+    store = CorpusStore('koond_store')
+    doc = store.get(12345)
+    # give every worker process its own shards
+    for shards in store.partitions(4):
+        ...
+
+The index is written when the store is closed, so a store without an index is incomplete.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import io
+import os
+import json
+from array import array
+
+from .names import FILE
+from .corpus_io import json_default, decode_lines
+
+VERSION = 1
+INDEX_FILE = 'index.jsonl'
+SHARD_FILE = 'shard-{0:05d}.jsonl'
+
+# the default maximum size of a shard in bytes, the offsets in a shard must fit to a 32-bit integer
+SHARD_SIZE = 256 * 1024 * 1024
+MAX_SHARD_SIZE = 2 ** 31 - 1
+
+
+class CorpusStoreWriter(object):
+    """Writes documents to a new corpus store.
+
+    Parameters
+    ----------
+    path: str
+        The directory of the store. It is created, if it does not exist.
+    shard_size: int
+        The maximum size of a shard in bytes (default: 256 MB). A document larger than that gets a shard of its own.
+    meta_keys: list of str
+        The keys of the document attributes stored in the index (default: the FILE attribute of TEI documents).
+    """
+
+    def __init__(self, path, shard_size=SHARD_SIZE, meta_keys=(FILE, )):
+        if not 0 < shard_size <= MAX_SHARD_SIZE:
+            raise ValueError('The shard size must be between 1 and {0} bytes.'.format(MAX_SHARD_SIZE))
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            raise ValueError('Corpus store <{0}> already exists!'.format(path))
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.shard_size = shard_size
+        self.meta_keys = list(meta_keys)
+        self.__shards = []
+        self.__shard = None
+        self.__shard_bytes = 0
+        self.__entries = []
+        self.__ids = set()
+
+    def add(self, document, doc_id=None):
+        """Add a document to the store.
+
+        Parameters
+        ----------
+        document: dict or Text
+            The document.
+        doc_id: str or int
+            The id of the document (default: the number of documents added before it).
+
+        Returns
+        -------
+        str or int
+            The id of the document.
+        """
+        if self.__entries is None:
+            raise ValueError('The corpus store writer has been closed.')
+        if doc_id is None:
+            doc_id = len(self.__entries)
+        if doc_id in self.__ids:
+            raise ValueError('Duplicate document id <{0}>!'.format(doc_id))
+        line = (json.dumps(document, default=json_default) + '\n').encode('utf-8')
+        if self.__shard is None or (self.__shard_bytes > 0 and self.__shard_bytes + len(line) > self.shard_size):
+            self.__new_shard()
+        meta = dict((key, document[key]) for key in self.meta_keys if key in document)
+        self.__entries.append([doc_id, len(self.__shards) - 1, self.__shard_bytes, len(line), meta or None])
+        self.__ids.add(doc_id)
+        self.__shard.write(line)
+        self.__shard_bytes += len(line)
+        return doc_id
+
+    def __new_shard(self):
+        if self.__shard is not None:
+            self.__shard.close()
+        name = SHARD_FILE.format(len(self.__shards))
+        self.__shards.append(name)
+        self.__shard = io.open(os.path.join(self.path, name), 'wb')
+        self.__shard_bytes = 0
+
+    def close(self):
+        """Finish the last shard and write the index."""
+        if self.__entries is None:
+            return
+        if self.__shard is not None:
+            self.__shard.close()
+        index_file = os.path.join(self.path, INDEX_FILE)
+        # write to a temporary file first, so that an incomplete index is never read
+        tmp_file = index_file + '.tmp'
+        with io.open(tmp_file, 'wb') as f:
+            header = {'version': VERSION, 'shards': self.__shards, 'meta_keys': self.meta_keys}
+            f.write((json.dumps(header) + '\n').encode('utf-8'))
+            for entry in self.__entries:
+                f.write((json.dumps(entry) + '\n').encode('utf-8'))
+        os.rename(tmp_file, index_file)
+        self.__entries = None
+        self.__ids = None
+
+    def abort(self):
+        """Close the last shard without writing the index, leaving the store incomplete."""
+        if self.__entries is None:
+            return
+        if self.__shard is not None:
+            self.__shard.close()
+        self.__entries = None
+        self.__ids = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # a store written up to an error must not be opened as a complete one
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_corpus_store(documents, path, shard_size=SHARD_SIZE, meta_keys=(FILE, )):
+    """Write the documents to a new corpus store, numbering them from 0.
+
+    See :py:class:`CorpusStoreWriter` for the description of the parameters.
+
+    Returns
+    -------
+    CorpusStore
+        The written store.
+    """
+    with CorpusStoreWriter(path, shard_size, meta_keys) as writer:
+        for document in documents:
+            writer.add(document)
+    return CorpusStore(path)
+
+
+class CorpusStore(object):
+    """Random access to the documents of a corpus store.
+
+    The index is loaded into memory, the shard files are opened when they are first read.
+    An instance can be shared with forked worker processes, they open the shards again.
+
+    Parameters
+    ----------
+    path: str
+        The directory of the store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        index_file = os.path.join(path, INDEX_FILE)
+        if not os.path.exists(index_file):
+            raise ValueError('<{0}> is not a corpus store or it has not been closed.'.format(path))
+        with io.open(index_file, 'rb') as f:
+            header = json.loads(f.readline().decode('utf-8'))
+            if header.get('version') != VERSION:
+                raise ValueError('Unsupported corpus store version <{0}>!'.format(header.get('version')))
+            self.shards = header['shards']
+            self.meta_keys = header['meta_keys']
+            entries = decode_lines(f)
+        self.__ids = [entry[0] for entry in entries]
+        self.__positions = dict((doc_id, idx) for idx, doc_id in enumerate(self.__ids))
+        self.__shard = array('i', (entry[1] for entry in entries))
+        self.__offset = array('l', (entry[2] for entry in entries))
+        self.__length = array('l', (entry[3] for entry in entries))
+        self.__meta = dict((idx, entry[4]) for idx, entry in enumerate(entries) if entry[4])
+        self.__files = {}
+        self.__pid = os.getpid()
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.__positions
+
+    def __iter__(self):
+        return iter(self.__ids)
+
+    def ids(self):
+        """The ids of the documents in the order they were added."""
+        return list(self.__ids)
+
+    def __file(self, shard):
+        if self.__pid != os.getpid():
+            # the file positions would be shared with the parent process
+            self.__files = {}
+            self.__pid = os.getpid()
+        f = self.__files.get(shard)
+        if f is None:
+            f = io.open(os.path.join(self.path, self.shards[shard]), 'rb')
+            self.__files[shard] = f
+        return f
+
+    def get(self, doc_id, as_text=False, **kwargs):
+        """Read the document with given id.
+
+        Parameters
+        ----------
+        doc_id: str or int
+            The id of the document.
+        as_text: boolean (default: False)
+            If True, return a :py:class:`~estnltk.text.Text` instead of a plain dictionary.
+        kwargs:
+            Keyword arguments for :py:class:`~estnltk.text.Text`, if `as_text` is True.
+
+        Raises
+        ------
+        KeyError
+            If there is no document with given id.
+        """
+        idx = self.__positions[doc_id]
+        f = self.__file(self.__shard[idx])
+        f.seek(self.__offset[idx])
+        document = json.loads(f.read(self.__length[idx]).decode('utf-8'))
+        if as_text:
+            from .text import Text
+            return Text(document, **kwargs)
+        return document
+
+    def __getitem__(self, doc_id):
+        return self.get(doc_id)
+
+    def metadata(self, doc_id):
+        """The metadata of the document stored in the index (see `meta_keys`)."""
+        return dict(self.__meta.get(self.__positions[doc_id]) or {})
+
+    def shard_ids(self, shard):
+        """The ids of the documents in given shard."""
+        return [doc_id for idx, doc_id in enumerate(self.__ids) if self.__shard[idx] == shard]
+
+    def iter_shard(self, shard, as_text=False, **kwargs):
+        """Read the documents of a shard sequentially.
+
+        Yields
+        ------
+        (str or int, dict or Text)
+            The ids and the documents.
+        """
+        ids = self.shard_ids(shard)
+        with io.open(os.path.join(self.path, self.shards[shard]), 'rb') as f:
+            for doc_id, line in zip(ids, f):
+                document = json.loads(line.decode('utf-8'))
+                if as_text:
+                    from .text import Text
+                    document = Text(document, **kwargs)
+                yield doc_id, document
+
+    def shard_sizes(self):
+        """The sizes of the shards in bytes."""
+        sizes = [0] * len(self.shards)
+        for shard, length in zip(self.__shard, self.__length):
+            sizes[shard] += length
+        return sizes
+
+    def partitions(self, n):
+        """Divide the shards into at most `n` groups of about equal size, for example one per worker process.
+
+        Returns
+        -------
+        list of (list of int)
+            The shard numbers of every group.
+        """
+        if n < 1:
+            raise ValueError('The number of partitions must be positive.')
+        sizes = self.shard_sizes()
+        groups = [[] for _ in range(min(n, len(sizes)))]
+        totals = [0] * len(groups)
+        # the largest shards first, each to the group with the least data so far
+        for shard in sorted(range(len(sizes)), key=lambda shard: -sizes[shard]):
+            group = totals.index(min(totals))
+            groups[group].append(shard)
+            totals[group] += sizes[shard]
+        return [sorted(group) for group in groups]
+
+    def close(self):
+        """Close the opened shard files."""
+        for f in self.__files.values():
+            f.close()
+        self.__files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
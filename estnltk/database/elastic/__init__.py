@@ -106,7 +106,7 @@ class Index:
             for i in itertools.product(*[set(j) for j in list_of_lists]):
                 yield ' '.join(i)
 
-        sents = document.split_by_sentences()
+        sents = document.sentence_views()
         for order, sent in enumerate(sents):
             postags = list(unroll_lists(sent.postag_lists))
             lemmas = list(unroll_lists(sent.lemma_lists))
@@ -79,9 +79,19 @@ class Tagger():
             Predicted token Labels for each sentence in the document
         """
 
-        labels = []
-        for snt in nerdoc.sentences:
-            xseq = [t.feature_list() for t in snt]
-            yseq = self.tagger.tag(xseq)
-            labels.append(yseq)
-        return labels
+        return self.tag_sequences([t.feature_list() for t in snt] for snt in nerdoc.sentences)
+
+    def tag_sequences(self, xseqs):
+        """Tag the given feature sequences.
+
+        Parameters
+        ----------
+        xseqs: iterable of lists of lists of str
+            The features of every token for each sentence.
+
+        Returns
+        -------
+        labels: list of lists of str
+            Predicted token labels for each sentence
+        """
+        return [self.tagger.tag(xseq) for xseq in xseqs]
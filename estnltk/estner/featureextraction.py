@@ -6,10 +6,20 @@ from __future__ import unicode_literals, print_function
 
 import re
 import codecs
+import sys
 from collections import defaultdict
 from functools import reduce
 from itertools import product
 
+from .gazetteertrie import open_trie, ROOT
+
+if sys.version_info[0] >= 3:
+    from sys import intern
+else:
+    # Python 2 can intern only byte strings
+    def intern(string):
+        return string
+
 # Separator of field values.
 separator = ' '
 
@@ -245,10 +255,14 @@ class GazetteerFeatureExtractor(BaseFeatureExtractor):
     compose multi-token phrases for dictionary lookup. When look_ahead=N, phrases
     (t[i], ..., t[i+N]) will be composed. If the phrase matches the dictionary, each
     token will be assigned the corresponding value.
+
+    The gazetteer is looked up from a memory-mapped prefix trie over the lemma tokens
+    of the phrases (see :py:mod:`estnltk.estner.gazetteertrie`), which is built next
+    to the gazetteer file on the first use.
     """
 
     def __init__(self, settings, look_ahead=3):
-        """Loads a gazetteer file. Can take some time!
+        """Opens the gazetteer trie. Building the trie the first time can take some time!
 
         Parameters
         -----------
@@ -260,26 +274,27 @@ class GazetteerFeatureExtractor(BaseFeatureExtractor):
 
         """
         self.look_ahead = look_ahead
-        self.data = defaultdict(set)
-        with codecs.open(settings.GAZETTEER_FILE, 'rb', encoding="utf8") as f:
-            for ln in f:
-                word, lbl = ln.strip().rsplit("\t", 1)
-                self.data[word].add(lbl)
+        self.trie = open_trie(settings.GAZETTEER_FILE, getattr(settings, 'GAZETTEER_TRIE_FILE', None))
 
     def process(self, doc):
         tokens = list(doc.tokens)
         look_ahead = self.look_ahead
+        trie = self.trie
         for i in range(len(tokens)):
             if "iu" in tokens[i]:  # Only capitalised strings
-                for j in range(i + 1, i + 1 + look_ahead):
-                    phrase = " ".join(token["lem"] for token in tokens[i:j])
-                    if phrase in self.data:
-                        labels = self.data[phrase]
+                # walk the trie along the phrase (t[i], ..., t[j-1])
+                node = ROOT
+                for j in range(i + 1, min(i + 1 + look_ahead, len(tokens) + 1)):
+                    node = trie.walk(node, tokens[j - 1]["lem"])
+                    if node is None:
+                        break
+                    labels = trie.labels(node)
+                    if labels:
                         for tok in tokens[i:j]:
                             try:
                                 tok["gaz"] |= labels
                             except KeyError:
-                                tok["gaz"] = labels
+                                tok["gaz"] = set(labels)
 
 
 class GlobalContextFeatureExtractor(BaseFeatureExtractor):
@@ -515,26 +530,92 @@ def apply_templates(toks, templates):
     toks: list of tokens
         A list of processed toknes.
 
-    templates: list of template tuples (str, int)
+    templates: list of template tuples (str, int) or CompiledTemplates
         A feature template consists of a tuple of (name, offset) pairs,
         where name and offset specify a field name and offset from which
         the template extracts a feature value.
     """
-    for template in templates:
-        name = '|'.join(['%s[%d]' % (f, o) for f, o in template])
-        for t in range(len(toks)):
-            values_list = []
+    if not isinstance(templates, CompiledTemplates):
+        templates = CompiledTemplates(templates)
+    for tok, features in zip(toks, templates.features(toks)):
+        if features:
+            tok['F'].extend(features)
+
+
+class CompiledTemplates(object):
+    """Feature templates compiled for applying them repeatedly.
+
+    The names of the templates are formatted once, the range of tokens a template
+    applies to is computed from its offsets once per sentence and the values of a
+    field are looked up once per token. The generated feature strings are interned,
+    as the same features occur in many sentences.
+    """
+
+    def __init__(self, templates):
+        """Compile the templates.
+
+        Parameters
+        ----------
+        templates: list of template tuples (str, int)
+            The feature templates, see :py:func:`apply_templates`.
+        """
+        self.templates = []
+        for template in templates:
+            template = tuple((field, offset) for field, offset in template)
+            prefix = '|'.join(['%s[%d]' % (f, o) for f, o in template]) + '='
+            offsets = [offset for field, offset in template] or [0]
+            self.templates.append((intern(prefix), template, min(offsets), max(offsets)))
+
+    def features(self, toks):
+        """Generate the template features of the tokens of a sentence.
+
+        Parameters
+        ----------
+        toks: list of tokens
+            A list of processed tokens.
+
+        Returns
+        -------
+        list of list of str
+            The features of every token, in the order of templates.
+        """
+        n = len(toks)
+        result = [[] for _ in range(n)]
+        # the values of every used field, so that a field is looked up once per token
+        columns = {}
+        for prefix, template, min_offset, max_offset in self.templates:
+            first = max(0, -min_offset)
+            last = min(n, n - max_offset)
+            if first >= last:
+                continue
+            template_columns = []
             for field, offset in template:
-                p = t + offset
-                if p < 0 or p >= len(toks):
-                    values_list = []
-                    break
-                if field in toks[p]:
-                    value = toks[p][field]
-                    values_list.append(value if isinstance(value, (set, list)) else [value])
-            if len(template) == len(values_list):
-                for values in product(*values_list):
-                    toks[t]['F'].append('%s=%s' % (name, '|'.join(values)))
+                if field not in columns:
+                    columns[field] = [tok.get(field) for tok in toks]
+                template_columns.append((columns[field], offset))
+            if len(template_columns) == 1:
+                column, offset = template_columns[0]
+                for t in range(first, last):
+                    value = column[t + offset]
+                    if value is None:
+                        continue
+                    if isinstance(value, (set, list)):
+                        result[t].extend([intern(prefix + v) for v in value])
+                    else:
+                        result[t].append(intern(prefix + value))
+                continue
+            for t in range(first, last):
+                values_list = []
+                for column, offset in template_columns:
+                    value = column[t + offset]
+                    if value is None:
+                        break
+                    values_list.append(value if isinstance(value, (set, list)) else (value, ))
+                else:
+                    features = result[t]
+                    for values in product(*values_list):
+                        features.append(intern(prefix + '|'.join(values)))
+        return result
 
 
 class FeatureExtractor(object):
@@ -551,6 +632,7 @@ class FeatureExtractor(object):
             The settings and configuration of the NER system.
         """
         self.settings = settings
+        self.templates = CompiledTemplates(settings.TEMPLATES)
         self.fex_list = []
         for fex_name in settings.FEATURE_EXTRACTORS:
             fex_class = FeatureExtractor._get_class(fex_name)
@@ -562,16 +644,40 @@ class FeatureExtractor(object):
         for fex in self.fex_list:
             fex.prepare(docs)
 
-    def process(self, docs):
-        # extract features
+    def extract(self, docs):
+        """Decorate the tokens of the documents with the fields of the feature extractors."""
         for fex in self.fex_list:
             for doc in docs:
                 fex.process(doc)
 
+    def process(self, docs):
+        self.extract(docs)
+
         # apply the feature templates.
         for doc in docs:
             for snt in doc.sentences:
-                apply_templates(snt, self.settings.TEMPLATES)
+                apply_templates(snt, self.templates)
+
+    def sentence_features(self, snt):
+        """Compute the features of a sentence without storing them in the tokens.
+
+        The tokens must have been decorated with :py:meth:`extract`.
+
+        Parameters
+        ----------
+        snt: estnltk.estner.ner.Sentence
+            The sentence.
+
+        Returns
+        -------
+        list of list of str
+            The features of every token, ready to be given to crfsuite.
+        """
+        features = self.templates.features(snt)
+        for tok, tok_features in zip(snt, features):
+            if tok['F']:
+                tok_features[:0] = tok['F']
+        return features
 
     @staticmethod
     def _get_class(kls):
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""Binary, memory-mapped prefix trie of the NER gazetteer.
+
+The trie is built once from the gazetteer text file (a phrase and its label on every line, separated by a tab)
+and then opened with mmap, so that building a NER tagger does not read the whole gazetteer into memory and
+every worker process shares the same pages. The edges of the trie are labelled with the space-separated
+tokens of the phrases, so that a phrase can be looked up token by token.
+
+File layout (all integers are little-endian unsigned 32-bit, unless noted otherwise):
+
+  header      : magic (4 bytes), version, size of the gazetteer file, number of labels, number of nodes,
+                position of the node table, position of the edge table
+  labels      : for every label: length (16-bit), label
+  tokens      : the UTF-8 encoded edge tokens
+  node table  : for every node: index of its first edge, number of edges, bit mask of the node's labels
+  edge table  : for every edge: position of the token, length of the token, child node;
+                the edges of a node are consecutive and sorted by the UTF-8 bytes of their tokens
+
+The root of the trie is the node 0. The trie can be built ahead of time with::
+
+    python -m estnltk.estner.gazetteertrie
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import mmap
+import codecs
+import struct
+from collections import deque
+
+MAGIC = b'EGZT'
+VERSION = 1
+ROOT = 0
+MAX_LABELS = 32
+
+_HEADER = struct.Struct('<4s6I')
+_NODE = struct.Struct('<3I')
+_EDGE = struct.Struct('<3I')
+_LABEL_LEN = struct.Struct('<H')
+
+
+def read_gazetteer(gazetteer_file):
+    """Reads the gazetteer text file.
+
+    Returns
+    -------
+    dict of str to set of str
+      The labels of every phrase.
+
+    """
+    data = {}
+    with codecs.open(gazetteer_file, 'rb', encoding='utf8') as f:
+        for ln in f:
+            word, lbl = ln.strip().rsplit('\t', 1)
+            data.setdefault(word, set()).add(lbl)
+    return data
+
+
+def compile_trie(gazetteer_file):
+    """Compiles the gazetteer text file into the binary trie.
+
+    Parameters
+    ----------
+    gazetteer_file : str
+      Path of the gazetteer text file.
+
+    Returns
+    -------
+    bytes
+      The trie in the binary format described in the module documentation.
+
+    """
+    data = read_gazetteer(gazetteer_file)
+    labels = sorted(set(label for phrase_labels in data.values() for label in phrase_labels))
+    if len(labels) > MAX_LABELS:
+        raise ValueError('The gazetteer has more than {0} labels.'.format(MAX_LABELS))
+    label_bits = dict((label, 1 << i) for i, label in enumerate(labels))
+    entries = []
+    for phrase, phrase_labels in data.items():
+        mask = 0
+        for label in phrase_labels:
+            mask |= label_bits[label]
+        entries.append((tuple(token.encode('utf-8') for token in phrase.split(' ')), mask))
+    del data
+    entries.sort()
+
+    # breadth first, so that the edges of every node are added at once and stay consecutive
+    nodes = []
+    edges = []
+    token_positions = {}
+    token_blob = []
+    tokens_pos = _HEADER.size + sum(_LABEL_LEN.size + len(label.encode('utf-8')) for label in labels)
+    tokens_size = 0
+    queue = deque([(0, len(entries), 0)])
+    while queue:
+        lo, hi, depth = queue.popleft()
+        mask = 0
+        # the phrase ending at this node sorts before the longer phrases
+        if lo < hi and len(entries[lo][0]) == depth:
+            mask = entries[lo][1]
+            lo += 1
+        nodes.append((len(edges), 0, mask))
+        n_edges = 0
+        while lo < hi:
+            token = entries[lo][0][depth]
+            end = lo + 1
+            while end < hi and entries[end][0][depth] == token:
+                end += 1
+            if token not in token_positions:
+                token_positions[token] = tokens_pos + tokens_size
+                token_blob.append(token)
+                tokens_size += len(token)
+            # the child is numbered in the order it is taken from the queue
+            edges.append((token_positions[token], len(token), len(nodes) + len(queue)))
+            queue.append((lo, end, depth + 1))
+            n_edges += 1
+            lo = end
+        nodes[-1] = (nodes[-1][0], n_edges, mask)
+
+    node_table_pos = tokens_pos + tokens_size
+    edge_table_pos = node_table_pos + _NODE.size * len(nodes)
+    parts = [_HEADER.pack(MAGIC, VERSION, os.path.getsize(gazetteer_file), len(labels), len(nodes),
+                          node_table_pos, edge_table_pos)]
+    for label in labels:
+        label = label.encode('utf-8')
+        parts.append(_LABEL_LEN.pack(len(label)))
+        parts.append(label)
+    parts.extend(token_blob)
+    parts.append(struct.pack('<%dI' % (3 * len(nodes)), *[value for node in nodes for value in node]))
+    parts.append(struct.pack('<%dI' % (3 * len(edges)), *[value for edge in edges for value in edge]))
+    return b''.join(parts)
+
+
+def build_trie(gazetteer_file, trie_file):
+    """Builds the binary trie file from the gazetteer text file.
+
+    Parameters
+    ----------
+    gazetteer_file : str
+      Path of the gazetteer text file.
+    trie_file : str
+      Path of the trie file to be written.
+
+    """
+    trie = compile_trie(gazetteer_file)
+    # write to a temporary file first, so that concurrent readers never see a partial trie
+    tmp_file = '%s.%d.tmp' % (trie_file, os.getpid())
+    with open(tmp_file, 'wb') as fout:
+        fout.write(trie)
+    os.rename(tmp_file, trie_file)
+
+
+class GazetteerTrie(object):
+    """Prefix trie of gazetteer phrases over their tokens.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+      The trie in the binary format created by `compile_trie`.
+
+    """
+
+    # the maximal number of cached child lookups
+    cache_size = 100000
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        (magic, version, self.gazetteer_size, n_labels, self._n_nodes, self._node_table_pos,
+         self._edge_table_pos) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a gazetteer trie.')
+        labels = []
+        position = _HEADER.size
+        for _ in range(n_labels):
+            label_len = _LABEL_LEN.unpack_from(buffer, position)[0]
+            position += _LABEL_LEN.size
+            labels.append(buffer[position:position + label_len].decode('utf-8'))
+            position += label_len
+        self._labels = labels
+        self._label_sets = {0: frozenset()}
+        self._children = {}
+
+    @classmethod
+    def open(cls, trie_file):
+        """Opens a trie file with mmap."""
+        with open(trie_file, 'rb') as fin:
+            buffer = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except (ValueError, struct.error):
+            buffer.close()
+            raise
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def is_up_to_date(self, gazetteer_file):
+        """Checks whether the trie was built from the given version of the gazetteer file."""
+        return self.gazetteer_size == os.path.getsize(gazetteer_file)
+
+    def child(self, node, token):
+        """Returns the node reached from `node` by the edge labelled with `token`, or None if there is none."""
+        key = (node, token)
+        try:
+            return self._children[key]
+        except KeyError:
+            pass
+        if len(self._children) >= self.cache_size:
+            self._children.clear()
+        child = self._find_child(node, token)
+        self._children[key] = child
+        return child
+
+    def _find_child(self, node, token):
+        buffer = self._buffer
+        key = token.encode('utf-8')
+        lo, n_edges, _ = _NODE.unpack_from(buffer, self._node_table_pos + node * _NODE.size)
+        hi = lo + n_edges
+        while lo < hi:
+            mid = (lo + hi) // 2
+            position, length, child = _EDGE.unpack_from(buffer, self._edge_table_pos + mid * _EDGE.size)
+            edge_token = buffer[position:position + length]
+            if edge_token < key:
+                lo = mid + 1
+            elif edge_token > key:
+                hi = mid
+            else:
+                return child
+        return None
+
+    def walk(self, node, phrase):
+        """Returns the node reached from `node` by the space-separated tokens of `phrase`, or None."""
+        for token in phrase.split(' '):
+            node = self.child(node, token)
+            if node is None:
+                return None
+        return node
+
+    def labels(self, node):
+        """Returns the labels of the phrase ending at `node` (empty, if no phrase ends there)."""
+        mask = _NODE.unpack_from(self._buffer, self._node_table_pos + node * _NODE.size)[2]
+        labels = self._label_sets.get(mask)
+        if labels is None:
+            labels = frozenset(label for i, label in enumerate(self._labels) if mask & (1 << i))
+            self._label_sets[mask] = labels
+        return labels
+
+    def __contains__(self, phrase):
+        node = self.walk(ROOT, phrase)
+        return node is not None and bool(self.labels(node))
+
+    def __getitem__(self, phrase):
+        node = self.walk(ROOT, phrase)
+        labels = self.labels(node) if node is not None else None
+        if not labels:
+            raise KeyError(phrase)
+        return labels
+
+
+def default_trie_file(gazetteer_file):
+    """Returns the path of the trie file kept next to the gazetteer file."""
+    return os.path.splitext(gazetteer_file)[0] + '.trie'
+
+
+def open_trie(gazetteer_file, trie_file=None):
+    """Opens the trie of the gazetteer, (re)building it first if it is missing or out of date.
+
+    If the trie file cannot be written (e.g. the data directory is not writable),
+    the trie is built in memory.
+
+    Parameters
+    ----------
+    gazetteer_file : str
+      Path of the gazetteer text file.
+    trie_file : str, optional
+      Path of the trie file (default: the gazetteer file with `.trie` extension).
+
+    Returns
+    -------
+    GazetteerTrie
+      The opened trie.
+
+    """
+    trie_file = trie_file or default_trie_file(gazetteer_file)
+    try:
+        if os.path.exists(trie_file):
+            trie = GazetteerTrie.open(trie_file)
+            if trie.is_up_to_date(gazetteer_file):
+                return trie
+            trie.close()
+        build_trie(gazetteer_file, trie_file)
+        return GazetteerTrie.open(trie_file)
+    except (IOError, OSError, ValueError, struct.error):
+        return GazetteerTrie(compile_trie(gazetteer_file))
+
+
+if __name__ == '__main__':
+    from estnltk.estner.settings import GAZETTEER_FILE
+    build_trie(GAZETTEER_FILE, default_trie_file(GAZETTEER_FILE))
+    print('Gazetteer trie written to', default_trie_file(GAZETTEER_FILE))
@@ -6,7 +6,7 @@ import os.path
 import argparse
 import logging
 
-from estnltk.teicorpus import parse_tei_corpus
+from estnltk.teicorpus import yield_tei_corpus
 from estnltk.corpus import write_document
 
 logging.basicConfig(level=logging.DEBUG)
@@ -47,7 +47,7 @@ def process(start_dir, out_dir, encoding=None):
                 logger.info('Skipping file {0}, because it seems to be already processed'.format(full_fnm))
                 continue
             logger.info('Processing file {0} with target {1}'.format(full_fnm, target))
-            docs = parse_tei_corpus(full_fnm, target=target, encoding=encoding)
+            docs = yield_tei_corpus(full_fnm, target=target, encoding=encoding)
             for doc_id, doc in enumerate(docs):
                 out_fnm = '{0}_{1}.txt'.format(out_prefix, doc_id)
                 logger.info('Writing document {0}'.format(out_fnm))
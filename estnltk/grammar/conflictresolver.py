@@ -1,13 +1,59 @@
 # -*- coding: utf-8 -*-
-"""Module containing functionality to resolve conflicting matches."""
+"""Module containing functionality to resolve conflicting matches.
+
+The resolvers can be benchmarked on synthetic and real matches with::
+
+    python -m estnltk.grammar.conflictresolver
+"""
 from __future__ import unicode_literals, print_function, absolute_import
 
+import heapq
+
 
 def resolve_using_maximal_coverage(matches):
     """Given a list of matches, select a subset of matches
     such that there are no overlaps and the total number of
     covered characters is maximal.
 
+    Runs in O(N log N) time and gives the same result as
+    :py:func:`resolve_using_maximal_coverage_quadratic`.
+
+    Parameters
+    ----------
+    matches: list of Match
+
+    Returns
+    --------
+    list of Match
+    """
+    if len(matches) == 0:
+        return matches
+    matches.sort()
+    N = len(matches)
+    scores = [0] * N
+    prev = [-1] * N
+    # processed matches ordered by their end positions, waiting for a match they are before
+    pending = []
+    # the best chain among the matches that end before the current match starts;
+    # in case of equal scores, the first match in sorted order is preferred
+    bestscore = 0
+    bestprev = -1
+    for i, match in enumerate(matches):
+        while pending and pending[0][0] <= match.start:
+            j = heapq.heappop(pending)[1]
+            if bestprev == -1 or scores[j] > bestscore or (scores[j] == bestscore and j < bestprev):
+                bestscore = scores[j]
+                bestprev = j
+        scores[i] = bestscore + len(match)
+        prev[i] = bestprev
+        heapq.heappush(pending, (match.end, i))
+    return _backtrack(matches, scores, prev)
+
+
+def resolve_using_maximal_coverage_quadratic(matches):
+    """O(N^2) version of :py:func:`resolve_using_maximal_coverage`,
+    kept as a reference implementation.
+
     Parameters
     ----------
     matches: list of Match
@@ -42,6 +88,10 @@ def resolve_using_maximal_coverage(matches):
             j = j - 1
         scores[i] = bestscore
         prev[i] = bestprev
+    return _backtrack(matches, scores, prev)
+
+
+def _backtrack(matches, scores, prev):
     # first find the matching with highest combined score
     bestscore = max(scores)
     bestidx = len(scores) - scores[-1::-1].index(bestscore) -1
@@ -54,3 +104,38 @@ def resolve_using_maximal_coverage(matches):
     # filter the matches
     return [matches[idx] for idx in reversed(keepidxs)]
 
+
+def random_matches(n, text_length=None, max_length=20, seed=0):
+    """Generate random (possibly overlapping) matches for testing and benchmarking."""
+    import random
+    from .match import Match
+    rnd = random.Random(seed)
+    text_length = text_length or 5 * n
+    matches = []
+    for _ in range(n):
+        start = rnd.randint(0, text_length - 1)
+        end = start + rnd.randint(1, max_length)
+        matches.append(Match(start, end, 'x' * (end - start)))
+    return matches
+
+
+def _benchmark():
+    import timeit
+    from ..text import Text
+    from .grammar import Union, Lemmas, Postags, Regex, Concatenation
+
+    def compare(name, matches):
+        for resolver in (resolve_using_maximal_coverage_quadratic, resolve_using_maximal_coverage):
+            elapsed = min(timeit.repeat(lambda: resolver(list(matches)), number=1, repeat=3))
+            print('{0:<12} N={1:<7} {2:<42} {3:.4f}s'.format(name, len(matches), resolver.__name__, elapsed))
+
+    for n in (1000, 3000):
+        compare('synthetic', random_matches(n))
+    text = Text(' '.join(['Kass hüppas ja hiir kargas, aga suur koer magas edasi.'] * 200))
+    symbol = Union(Postags('S|V|A'), Lemmas('kass', 'hiir', 'koer'),
+                   Concatenation(Postags('A'), Postags('S'), sep=Regex(r'\s+')))
+    compare('grammar', symbol.get_matches(text, conflict_resolver=lambda matches: matches))
+
+
+if __name__ == '__main__':
+    _benchmark()
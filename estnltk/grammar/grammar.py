@@ -6,6 +6,7 @@ from functools import reduce
 from itertools import chain
 from collections import defaultdict
 import six
+from bisect import bisect_left, bisect_right
 from ..text import Text
 from .match import Match, concatenate_matches, copy_rename, intersect
 from .conflictresolver import resolve_using_maximal_coverage
@@ -294,21 +295,76 @@ class Concatenation(Symbol):
         return matches
 
 
-def allgaps(matches_a, matches_b, text, name=None):
-    matches = []
+def _following_ranges(matches_a, matches_b, max_gap=None, sentence_ends=None):
+    """For every match `a` of `matches_a`, yield `a`, the sorted `matches_b` list and
+    the range of its indices that may follow `a`, and the position that the following match
+    must not end after (None, if there is no such limit).
+    """
+    matches_b = sorted(matches_b, key=lambda m: m.start)
+    starts = [b.start for b in matches_b]
     for a in matches_a:
-        for b in matches_b:
-            if a.end <= b.start:
-                matches.append(concatenate_matches(a, b, text.text, name))
-    return matches
+        lo = bisect_left(starts, a.end)
+        hi = len(starts) if max_gap is None else bisect_right(starts, a.end + max_gap, lo)
+        limit = None
+        if sentence_ends is not None:
+            sent_idx = bisect_right(sentence_ends, a.start)
+            if sent_idx == len(sentence_ends):
+                continue
+            limit = sentence_ends[sent_idx]
+            hi = bisect_left(starts, limit, lo, hi)
+        yield a, matches_b, lo, hi, limit
+
+
+def allgaps(matches_a, matches_b, text, name=None, max_gap=None, sentence_ends=None):
+    """Concatenate every match of `matches_a` with every match of `matches_b` that
+    starts after it.
+
+    Parameters
+    ----------
+    matches_a: iterable of Match
+        The left hand side matches, consumed lazily.
+    matches_b: list of Match
+        The right hand side matches.
+    text: Text
+        The text of the matches.
+    name: str
+        The name of the concatenated matches.
+    max_gap: int
+        If given, the maximal number of characters between the concatenated matches.
+    sentence_ends: list of int
+        If given, the sorted end positions of sentences. The concatenated matches must
+        then be in the same sentence.
+
+    Yields
+    ------
+    Match
+    """
+    for a, matches_b, lo, hi, limit in _following_ranges(matches_a, matches_b, max_gap, sentence_ends):
+        for idx in range(lo, hi):
+            b = matches_b[idx]
+            if limit is None or b.end <= limit:
+                yield concatenate_matches(a, b, text.text, name)
 
 
 class AllGaps(Symbol):
     """Concatenate symbols, but allow gaps of any size between the symbols."""
 
     def __init__(self, *symbols, **kwargs):
+        """
+
+        Parameters
+        ----------
+        symbol.. : list of :py:class:`~estnltk.grammar.Symbol`
+            The symbols that are going to be concatenated.
+        max_gap: int
+            The optional maximal number of characters between the symbols.
+        same_sentence: boolean (default: False)
+            If True, all the symbols must be in the same sentence.
+        """
         super(AllGaps, self).__init__(kwargs.get('name'))
         self.__symbols = symbols
+        self.max_gap = kwargs.get('max_gap', None)
+        self.same_sentence = kwargs.get('same_sentence', False)
 
     @property
     def symbols(self):
@@ -316,27 +372,41 @@ class AllGaps(Symbol):
 
     def get_matches_without_cache(self, text, **env):
         symbol_matches = [e.get_matches(text, **env) for e in self.symbols]
-        matches = list(reduce(lambda a, b: allgaps(a, b, text), symbol_matches))
+        sentence_ends = text.sentence_ends if self.same_sentence else None
+        matches = list(reduce(lambda a, b: allgaps(a, b, text, max_gap=self.max_gap, sentence_ends=sentence_ends),
+                              symbol_matches))
         if self.name is not None:
             matches = [copy_rename(m, self.name) for m in matches]
         return matches
 
 
-def gaps(matches_a, matches_b, text, name=None):
-    matches = []
-    for a in matches_a:
-        for b in matches_b:
-            if a.end <= b.start:
-                matches.append(concatenate_matches(a, b, text.text, name))
+def gaps(matches_a, matches_b, text, name=None, max_gap=None, sentence_ends=None):
+    """Concatenate every match of `matches_a` with the first match of `matches_b` that
+    starts after it.
+
+    See :py:func:`allgaps` for the description of the parameters.
+
+    Yields
+    ------
+    Match
+    """
+    for a, matches_b, lo, hi, limit in _following_ranges(matches_a, matches_b, max_gap, sentence_ends):
+        for idx in range(lo, hi):
+            b = matches_b[idx]
+            if limit is None or b.end <= limit:
+                yield concatenate_matches(a, b, text.text, name)
                 break
-    return matches
 
 
 class Gaps(Symbol):
+    """Concatenate symbols, each symbol with the first following match of the next symbol."""
 
     def __init__(self, *symbols, **kwargs):
+        """See :py:class:`~estnltk.grammar.AllGaps` for the description of the parameters."""
         super(Gaps, self).__init__(kwargs.get('name'))
         self.__symbols = symbols
+        self.max_gap = kwargs.get('max_gap', None)
+        self.same_sentence = kwargs.get('same_sentence', False)
 
     @property
     def symbols(self):
@@ -344,8 +414,9 @@ class Gaps(Symbol):
 
     def get_matches_without_cache(self, text, **env):
         symbol_matches = [e.get_matches(text, **env) for e in self.symbols]
-        matches = list(reduce(lambda a, b: gaps(a, b, text), symbol_matches))
+        sentence_ends = text.sentence_ends if self.same_sentence else None
+        matches = list(reduce(lambda a, b: gaps(a, b, text, max_gap=self.max_gap, sentence_ends=sentence_ends),
+                              symbol_matches))
         if self.name is not None:
             matches = [copy_rename(m, self.name) for m in matches]
         return matches
-
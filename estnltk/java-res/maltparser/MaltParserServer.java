@@ -0,0 +1,87 @@
+/*
+ *  A long-running MaltParser worker used by estnltk.syntax.parsers.MaltParser.
+ *
+ *  The model is loaded once at the start-up, and then sentences are parsed
+ *  one by one from the standard input:
+ *    *) the input of each sentence consists of CONLL formatted lines (one line
+ *       per token), followed by an empty line;
+ *    *) for each input sentence, the worker writes out CONLL formatted lines
+ *       with HEAD and DEPREL filled in, followed by an empty line;
+ *  After the model has been loaded, the worker writes out a single line "READY".
+ *
+ *  The worker is shipped precompiled (for Java 8+) in MaltParserServer.jar,
+ *  and launched in the directory containing the model file:
+ *
+ *     java -cp MaltParserServer.jar:maltparser-1.9.0.jar MaltParserServer <model_name>
+ *
+ *  After changing this file, rebuild the jar with:
+ *
+ *     javac -source 8 -target 8 -cp maltparser-1.9.0.jar MaltParserServer.java
+ *     jar cfe MaltParserServer.jar MaltParserServer MaltParserServer.class
+ */
+import java.io.BufferedReader;
+import java.io.BufferedWriter;
+import java.io.InputStreamReader;
+import java.io.OutputStreamWriter;
+import java.io.PrintStream;
+import java.io.PrintWriter;
+import java.util.ArrayList;
+import java.util.List;
+
+import org.maltparser.MaltParserService;
+
+public class MaltParserServer {
+
+    // Number of input columns used by the parser (ID FORM LEMMA CPOSTAG POSTAG FEATS)
+    private static final int INPUT_COLUMNS = 6;
+
+    public static void main(String[] args) throws Exception {
+        if (args.length < 1) {
+            System.err.println("Usage: MaltParserServer <model_name>");
+            System.exit(1);
+        }
+        // Keep the standard output clean for the protocol: anything MaltParser
+        // prints during its work is redirected to the standard error
+        PrintStream stdout = System.out;
+        System.setOut(System.err);
+        PrintWriter out = new PrintWriter(new BufferedWriter(new OutputStreamWriter(stdout, "UTF-8")));
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+
+        MaltParserService service = new MaltParserService();
+        service.initializeParserModel("-c " + args[0] + " -m parse");
+        out.println("READY");
+        out.flush();
+
+        List<String> tokens = new ArrayList<String>();
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.length() > 0) {
+                tokens.add(line);
+                continue;
+            }
+            if (!tokens.isEmpty()) {
+                String[] input = new String[tokens.size()];
+                for (int i = 0; i < input.length; i++) {
+                    String[] columns = ((String) tokens.get(i)).split("\t");
+                    StringBuilder sb = new StringBuilder();
+                    for (int j = 0; j < INPUT_COLUMNS && j < columns.length; j++) {
+                        if (j > 0) {
+                            sb.append('\t');
+                        }
+                        sb.append(columns[j]);
+                    }
+                    input[i] = sb.toString();
+                }
+                String[] output = service.parseTokens(input);
+                for (String token : output) {
+                    // PHEAD and PDEPREL are left unspecified
+                    out.println(token + "\t_\t_");
+                }
+                tokens.clear();
+            }
+            out.println();
+            out.flush();
+        }
+        service.terminateParserModel();
+    }
+}
@@ -1,87 +1,492 @@
-# -*- coding: utf-8 -*-
-"""Functionality for using Java-based components.
-
-Attributes
-----------
-JAVARES_PATH: str
-    The root path for Java components of Estnltk library.
-"""
-from __future__ import unicode_literals, print_function
-
-from estnltk.core import PACKAGE_PATH, as_unicode, as_binary
-import subprocess
-import os
-
-JAVARES_PATH = os.path.join(PACKAGE_PATH, 'java-res')
-
-
-class JavaProcess(object):
-    """Base class for Java-based components.
-    
-    It opens a pipe to a Java VM running the component and interacts with
-    it using standard input and standard output.
-    
-    The data is encoded as a single line and then flushed down the pipe.
-    The Java component receives the input, processes it and writes the
-    output also encoded on a single line and flushes it.
-    
-    This line-based approach is easy to implement and debug.
-    
-    To implement a Java component, inherit from this class and use
-    `process_line` method to interact with the process.
-    
-    It deals with input/output and errors.
-    """
-
-    def __init__(self, runnable_jar, args=[]):
-        """Initialize a Java VM.
-        
-        Parameters
-        ----------
-        runnable_jar: str
-            Path of the JAR file to be run. The java program is expected
-            to reside in `java-res` folder of the estnltk project.
-        args: list of str
-            The list of arguments given to the Java program.
-        """
-        self._process = subprocess.Popen(['java', '-jar', os.path.join(JAVARES_PATH, runnable_jar)] + args,
-                                         stdin=subprocess.PIPE,
-                                         stdout=subprocess.PIPE,
-                                         stderr=subprocess.PIPE)
-                                         
-    def process_line(self, line):
-        """Process a line of data.
-        
-        Sends the data through the pipe to the process and flush it. Reads a resulting line
-        and returns it.
-        
-        Parameters
-        ----------
-        
-        line: str
-            The data sent to process. Make sure it does not contain any newline characters.
-
-        Returns
-        -------
-        str: The line returned by the Java process
-        
-        Raises
-        ------
-        Exception
-            In case of EOF is encountered.
-        IoError
-            In case it was impossible to read or write from the subprocess standard input / output.
-        """
-        assert isinstance(line, str)
-        try:
-            self._process.stdin.write(as_binary(line))
-            self._process.stdin.write(as_binary('\n'))
-            self._process.stdin.flush()
-            result = as_unicode(self._process.stdout.readline())
-            if result == '':
-                stderr = as_unicode(self._process.stderr.read())
-                raise Exception('EOF encountered while reading stream. Stderr is {0}.'.format(stderr))
-            return result
-        except Exception:
-            self._process.terminate()
-            raise
+# -*- coding: utf-8 -*-
+"""Functionality for using Java-based components.
+
+Attributes
+----------
+JAVARES_PATH: str
+    The root path for Java components of Estnltk library.
+"""
+from __future__ import unicode_literals, print_function
+
+from estnltk.core import PACKAGE_PATH, as_unicode, as_binary
+from collections import deque
+from six.moves import queue
+from multiprocessing.pool import ThreadPool
+import subprocess
+import threading
+import time
+import os
+
+JAVARES_PATH = os.path.join(PACKAGE_PATH, 'java-res')
+
+
+class JavaProcess(object):
+    """Base class for Java-based components.
+
+    It opens a pipe to a Java VM running the component and interacts with
+    it using standard input and standard output.
+
+    The data is encoded as a single line and then flushed down the pipe.
+    The Java component receives the input, processes it and writes the
+    output also encoded on a single line and flushes it.
+
+    This line-based approach is easy to implement and debug.
+
+    To implement a Java component, inherit from this class and use
+    `process_line` method to interact with the process.
+
+    It deals with input/output and errors. The standard error of the Java VM
+    is drained in a background thread, so that the VM never blocks on a full
+    stderr pipe.
+
+    If more than one worker is requested, the component is run in a
+    :py:class:`JavaWorkerPool` and the lines are processed concurrently
+    when `process_line` is called from several threads.
+    """
+
+    # number of stderr lines kept for error reporting
+    stderr_max_lines = 100
+
+    def __init__(self, runnable_jar, args=[], workers=1):
+        """Initialize a Java VM.
+
+        Parameters
+        ----------
+        runnable_jar: str
+            Path of the JAR file to be run. The java program is expected
+            to reside in `java-res` folder of the estnltk project.
+        args: list of str
+            The list of arguments given to the Java program.
+        workers: int
+            The number of Java VMs (default: 1).
+        """
+        self._runnable_jar = runnable_jar
+        self._args = list(args)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+        self._process = None
+        self._pool = None
+        self._busy = False
+        self._stderr_lines = deque(maxlen=self.stderr_max_lines)
+        self.requests = 0
+        self.errors = 0
+        self.restarts = 0
+        self.total_latency = 0.0
+        self.last_latency = None
+        if workers > 1:
+            self._pool = JavaWorkerPool(runnable_jar, args, workers)
+        else:
+            self._start()
+
+    def _start(self):
+        self._process = subprocess.Popen(['java', '-jar', os.path.join(JAVARES_PATH, self._runnable_jar)] + self._args,
+                                         stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE)
+        self._stderr_lines = deque(maxlen=self.stderr_max_lines)
+        self._stderr_reader = threading.Thread(target=self._read_stderr,
+                                               args=(self._process.stderr, self._stderr_lines))
+        self._stderr_reader.daemon = True
+        self._stderr_reader.start()
+
+    @staticmethod
+    def _read_stderr(stream, lines):
+        for line in iter(stream.readline, b''):
+            lines.append(line.decode('utf-8', 'replace').rstrip())
+
+    @property
+    def stderr(self):
+        """The last lines written to the standard error by the Java VM."""
+        return '\n'.join(self._stderr_lines)
+
+    @property
+    def queue_depth(self):
+        """The number of lines waiting for the Java VM (or for an idle worker of the pool)."""
+        if self._pool is not None:
+            return self._pool.queue_depth
+        return self._waiting
+
+    def is_alive(self):
+        """Returns True, if the Java VM (or every worker of the pool) is running."""
+        if self._pool is not None:
+            return all(worker.is_alive() for worker in self._pool.workers)
+        return self._process is not None and self._process.poll() is None
+
+    def restart(self):
+        """Restart the Java VM."""
+        with self._lock:
+            self._terminate()
+            self._start()
+            self.restarts += 1
+
+    def _terminate(self):
+        process, self._process = self._process, None
+        if process is not None:
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+            process.stdin.close()
+            process.stdout.close()
+
+    def close(self):
+        """Stop the Java VM(s)."""
+        if self._pool is not None:
+            self._pool.close()
+        with self._lock:
+            self._terminate()
+
+    def process_line(self, line):
+        """Process a line of data.
+
+        Sends the data through the pipe to the process and flush it. Reads a resulting line
+        and returns it.
+
+        Parameters
+        ----------
+
+        line: str
+            The data sent to process. Make sure it does not contain any newline characters.
+
+        Returns
+        -------
+        str: The line returned by the Java process
+
+        Raises
+        ------
+        Exception
+            In case of EOF is encountered.
+        IoError
+            In case it was impossible to read or write from the subprocess standard input / output.
+        """
+        assert isinstance(line, str)
+        if self._pool is not None:
+            return self._pool.process_line(line)
+        with self._waiting_lock:
+            self._waiting += 1
+        try:
+            self._lock.acquire()
+        finally:
+            with self._waiting_lock:
+                self._waiting -= 1
+        try:
+            self._check_not_busy()
+            start = time.time()
+            try:
+                self._process.stdin.write(as_binary(line))
+                self._process.stdin.write(as_binary('\n'))
+                self._process.stdin.flush()
+                result = as_unicode(self._process.stdout.readline())
+                if result == '':
+                    self._process.wait()
+                    self._stderr_reader.join(1)
+                    raise Exception('EOF encountered while reading stream. Stderr is {0}.'.format(self.stderr))
+                return result
+            except Exception:
+                self.errors += 1
+                self._process.terminate()
+                raise
+            finally:
+                self.requests += 1
+                self.last_latency = time.time() - start
+                self.total_latency += self.last_latency
+        finally:
+            self._lock.release()
+
+    def process_lines(self, lines):
+        """Process several lines of data, concurrently if there are several workers.
+
+        Parameters
+        ----------
+        lines: list of str
+            The data sent to process.
+
+        Returns
+        -------
+        list of str: The lines returned by the Java process(es), in the order of input lines.
+        """
+        if self._pool is not None:
+            return self._pool.process_lines(lines)
+        return [self.process_line(line) for line in lines]
+
+    def iter_process_lines(self, lines, max_in_flight=10):
+        """Process several lines of data, writing the next lines to the Java VM
+        before the results of the previous ones have been read.
+
+        The lines are taken from `lines` in the calling thread, and written in a
+        background thread, so that the Java VM does not wait for the caller between
+        the lines.
+
+        While the generator is running, the Java VM is reserved for it: calling
+        `process_line` or `iter_process_lines` in the meantime raises RuntimeError.
+        Exhaust or close the generator to release the Java VM.
+
+        Parameters
+        ----------
+        lines: iterable of str
+            The data sent to process, consumed lazily.
+        max_in_flight: int
+            The maximal number of lines written but not yet read (default: 10).
+
+        Yields
+        ------
+        str: The lines returned by the Java process(es), in the order of input lines.
+        """
+        if self._pool is not None:
+            for result in self._pool.iter_process_lines(lines, max_in_flight):
+                yield result
+            return
+        with self._lock:
+            self._check_not_busy()
+            self._busy = True
+        try:
+            for result in self._iter_process_lines(iter(lines), max(1, max_in_flight)):
+                yield result
+        finally:
+            self._busy = False
+
+    def _check_not_busy(self):
+        if self._busy:
+            raise RuntimeError('The Java process is reserved by an unfinished iter_process_lines generator, '
+                               'exhaust or close the generator first.')
+
+    def _iter_process_lines(self, lines, max_in_flight):
+        to_write = queue.Queue()
+        write_errors = []
+        process = self._process
+
+        def write():
+            while True:
+                line = to_write.get()
+                if line is None:
+                    break
+                try:
+                    process.stdin.write(as_binary(line))
+                    process.stdin.write(as_binary('\n'))
+                    process.stdin.flush()
+                except Exception as e:
+                    write_errors.append(e)
+                    break
+
+        writer = threading.Thread(target=write)
+        writer.daemon = True
+        writer.start()
+        in_flight = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and in_flight < max_in_flight:
+                    try:
+                        line = next(lines)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    assert isinstance(line, str)
+                    to_write.put(line)
+                    in_flight += 1
+                if in_flight == 0:
+                    break
+                start = time.time()
+                result = as_unicode(process.stdout.readline())
+                self.requests += 1
+                self.last_latency = time.time() - start
+                self.total_latency += self.last_latency
+                if result == '':
+                    self.errors += 1
+                    process.wait()
+                    self._stderr_reader.join(1)
+                    if write_errors:
+                        raise write_errors[0]
+                    raise Exception('EOF encountered while reading stream. Stderr is {0}.'.format(self.stderr))
+                in_flight -= 1
+                yield result
+        finally:
+            to_write.put(None)
+            writer.join()
+            # read the results of already written lines, so that the next request does not get them
+            while in_flight > 0 and not write_errors:
+                if process.stdout.readline() == b'':
+                    break
+                in_flight -= 1
+
+    def stats(self):
+        """Statistics of the Java VM(s).
+
+        Returns
+        -------
+        list of dict
+            For every Java VM, its process id, whether it is running, the number of lines waiting
+            for it (queue_depth), the number of processed lines, errors and restarts, and the mean
+            and last latency of processing a line (in seconds).
+        """
+        if self._pool is not None:
+            return self._pool.stats()
+        return [{'pid': self._process.pid if self._process is not None else None,
+                 'alive': self.is_alive(),
+                 'queue_depth': self._waiting,
+                 'requests': self.requests,
+                 'errors': self.errors,
+                 'restarts': self.restarts,
+                 'mean_latency': self.total_latency / self.requests if self.requests else None,
+                 'last_latency': self.last_latency}]
+
+
+class JavaWorkerPool(object):
+    """A pool of Java VMs running the same component.
+
+    Every line is dispatched to an idle worker, so the pool can be used from several
+    threads (or from asyncio with `process_line_async`) at once. Workers that have died
+    are restarted before they are given a new line, and a worker is restarted after
+    an error, so that a crash does not take the pool down.
+    """
+
+    def __init__(self, runnable_jar, args=[], workers=2):
+        """Start the Java VMs.
+
+        Parameters
+        ----------
+        runnable_jar: str
+            Path of the JAR file to be run, relative to `java-res` folder.
+        args: list of str
+            The list of arguments given to the Java program.
+        workers: int
+            The number of Java VMs (default: 2).
+        """
+        if workers < 1:
+            raise ValueError('The number of workers must be positive.')
+        self.workers = [JavaProcess(runnable_jar, args) for _ in range(workers)]
+        self._idle = queue.Queue()
+        for worker in self.workers:
+            self._idle.put(worker)
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+        self._thread_pool = None
+
+    @property
+    def queue_depth(self):
+        """The number of lines waiting for an idle worker."""
+        return self._waiting
+
+    def _acquire(self):
+        with self._waiting_lock:
+            self._waiting += 1
+        try:
+            worker = self._idle.get()
+        finally:
+            with self._waiting_lock:
+                self._waiting -= 1
+        if not worker.is_alive():
+            worker.restart()
+        return worker
+
+    def process_line(self, line):
+        """Process a line of data on an idle worker (waiting for one, if all are busy).
+
+        See :py:meth:`JavaProcess.process_line`.
+        """
+        worker = self._acquire()
+        try:
+            return worker.process_line(line)
+        except Exception:
+            worker.restart()
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def process_lines(self, lines):
+        """Process several lines of data concurrently.
+
+        Returns
+        -------
+        list of str: The lines returned by the workers, in the order of input lines.
+        """
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPool(len(self.workers))
+        return self._thread_pool.map(self.process_line, lines)
+
+    def iter_process_lines(self, lines, max_in_flight=None):
+        """Process several lines of data concurrently, consuming the lines lazily.
+
+        Parameters
+        ----------
+        lines: iterable of str
+            The data sent to process.
+        max_in_flight: int
+            The maximal number of lines being processed or waiting to be yielded
+            (default: two times the number of workers).
+
+        Yields
+        ------
+        str: The lines returned by the workers, in the order of input lines.
+        """
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPool(len(self.workers))
+        max_in_flight = max_in_flight or 2 * len(self.workers)
+        in_flight = deque()
+        for line in lines:
+            in_flight.append(self._thread_pool.apply_async(self.process_line, (line, )))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
+
+    def process_line_async(self, line, loop=None):
+        """Process a line of data in asyncio event loop's executor.
+
+        Returns
+        -------
+        asyncio.Future: The future of the line returned by the worker.
+        """
+        import asyncio
+        loop = loop or asyncio.get_event_loop()
+        return loop.run_in_executor(None, self.process_line, line)
+
+    def health_check(self):
+        """Restart the idle workers that are not running.
+
+        Returns
+        -------
+        int: The number of restarted workers.
+        """
+        restarted = 0
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in idle:
+            if not worker.is_alive():
+                worker.restart()
+                restarted += 1
+            self._idle.put(worker)
+        return restarted
+
+    def stats(self):
+        """Statistics of the workers, see :py:meth:`JavaProcess.stats`.
+
+        The lines are queued in the pool until a worker becomes idle, so the queue depth of a
+        worker is zero unless it is used directly. The number of lines waiting in the pool is
+        given in `pool_queue_depth` of every worker.
+        """
+        pool_queue_depth = self.queue_depth
+        stats = []
+        for worker in self.workers:
+            worker_stats = worker.stats()[0]
+            worker_stats['pool_queue_depth'] = pool_queue_depth
+            stats.append(worker_stats)
+        return stats
+
+    def close(self):
+        """Stop the workers."""
+        if self._thread_pool is not None:
+            self._thread_pool.terminate()
+            self._thread_pool = None
+        for worker in self.workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -75,7 +75,7 @@ def json_document_to_estner_document(jsondoc):
         A ner document.
     """
     sentences = []
-    for json_sent in jsondoc.split_by_sentences():
+    for json_sent in jsondoc.sentence_views():
         snt = Sentence()
         zipped = list(zip(
             json_sent.word_texts,
@@ -197,10 +197,10 @@ class NerTagger(object):
 
     def tag_documents(self, documents):
         nerdocs = [json_document_to_estner_document(jsondoc) for jsondoc in documents]
-        self.fex.process(nerdocs)
-        # add the labels
+        self.fex.extract(nerdocs)
+        # add the labels, the template features of a sentence are given straight to crfsuite
         for nerdoc, jsondoc in zip(nerdocs, documents):
-            snt_labels = self.tagger.tag(nerdoc)
+            snt_labels = self.tagger.tag_sequences(self.fex.sentence_features(snt) for snt in nerdoc.sentences)
             doc_labels = [label for labels in snt_labels for label in labels]
             words = jsondoc.words
             assert len(words) == len(doc_labels)
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-process corpus annotation pipeline.
+
+Vabamorf has a global state and Java-based taggers (:py:class:`~estnltk.timex.TimexTagger`,
+:py:class:`~estnltk.clausesegmenter.ClauseSegmenter`) communicate through a single pipe,
+so none of them can be shared between processes. The pipeline distributes documents
+over a pool of worker processes, each of which holds its own instances of the taggers
+required for the requested layers.
+
+Example usage::
+
+    from estnltk.pipeline import Pipeline
+    from estnltk.names import ANALYSIS, NAMED_ENTITIES, TIMEXES
+
+    with Pipeline([ANALYSIS, NAMED_ENTITIES, TIMEXES], processes=4) as pipeline:
+        for text in pipeline.process(documents):
+            print(text.named_entities, text.timex_values)
+
+Results are yielded in the same order as the input documents.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+from collections import deque
+import multiprocessing
+
+from .names import *
+from .core import VERB_CHAIN_RES_PATH
+
+# layers that require a NerTagger, a TimexTagger, a ClauseSegmenter or a VerbChainDetector
+NER_LAYERS = frozenset([NAMED_ENTITIES])
+TIMEX_LAYERS = frozenset([TIMEXES])
+CLAUSE_LAYERS = frozenset([CLAUSE_ANNOTATION, CLAUSES, VERB_CHAINS])
+VERB_CHAIN_LAYERS = frozenset([VERB_CHAINS])
+
+# the state of a worker process: list of layers and keyword arguments for Text instances
+_worker_layers = None
+_worker_kwargs = None
+
+
+def create_taggers(layers):
+    """Create the taggers required for tagging the given layers.
+
+    Parameters
+    ----------
+    layers: list of str
+        The names of the layers.
+
+    Returns
+    -------
+    dict
+        Keyword arguments for :py:class:`~estnltk.text.Text` containing the taggers.
+    """
+    layers = set(layers)
+    taggers = {}
+    if layers & NER_LAYERS:
+        from .ner import NerTagger
+        taggers['ner_tagger'] = NerTagger()
+    if layers & TIMEX_LAYERS:
+        from .timex import TimexTagger
+        taggers['timex_tagger'] = TimexTagger()
+    if layers & CLAUSE_LAYERS:
+        from .clausesegmenter import ClauseSegmenter
+        taggers['clause_segmenter'] = ClauseSegmenter()
+    if layers & VERB_CHAIN_LAYERS:
+        from .mw_verbs.verbchain_detector import VerbChainDetector
+        taggers['verbchain_detector'] = VerbChainDetector(resourcesPath=VERB_CHAIN_RES_PATH)
+    return taggers
+
+
+def check_layers(layers):
+    """Check that the layers can be tagged by :py:meth:`~estnltk.text.Text.tag`.
+
+    Raises
+    ------
+    ValueError
+        If no layers are given or a layer has no tagger.
+    """
+    from .text import Text
+    if not layers:
+        raise ValueError('No layers given for the pipeline.')
+    known = Text('').layer_tagger_mapping
+    unknown = [layer for layer in layers if layer not in known]
+    if unknown:
+        raise ValueError('Unknown layers {0}, the layers that can be tagged are {1}.'.format(
+            ', '.join(unknown), ', '.join(sorted(known))))
+
+
+def _init_worker(layers, text_kwargs):
+    """Initialize the taggers of a worker process."""
+    global _worker_layers, _worker_kwargs
+    _worker_layers = layers
+    _worker_kwargs = create_taggers(layers)
+    _worker_kwargs.update(text_kwargs)
+
+
+def tag_document(document, layers, **kwargs):
+    """Tag the given layers of a single document.
+
+    Parameters
+    ----------
+    document: str or dict
+        Either a raw text or a :py:class:`~estnltk.text.Text` instance or its JSON dictionary.
+    layers: list of str
+        The names of the layers to be tagged.
+    kwargs:
+        Keyword arguments for :py:class:`~estnltk.text.Text`.
+
+    Returns
+    -------
+    dict
+        The tagged document as a plain dictionary.
+    """
+    from .text import Text
+    text = Text(document, **kwargs)
+    text.tag_layers(layers)
+    return dict(text)
+
+
+def _tag_batch(documents):
+    """Tag a batch of documents in a worker process."""
+    return [tag_document(document, _worker_layers, **_worker_kwargs) for document in documents]
+
+
+class Pipeline(object):
+    """Process pool for annotating corpora with several processes.
+
+    Each worker process creates its own taggers for the requested layers
+    (see :py:func:`create_taggers`), so it is safe to use the taggers that rely on
+    global state or a single pipe.
+    """
+
+    def __init__(self, layers, processes=None, batch_size=1, max_in_flight=None, **kwargs):
+        """Initialize the pipeline and start the worker processes.
+
+        Parameters
+        ----------
+        layers: list of str
+            The names of the layers to be tagged, for example
+            ``['analysis', 'named_entities', 'timexes', 'clauses', 'verb_chains']``.
+        processes: int
+            The number of worker processes (default: number of CPUs).
+        batch_size: int
+            The number of documents sent to a worker at once (default: 1).
+        max_in_flight: int
+            The maximum number of batches being processed or waiting to be yielded
+            (default: two times the number of processes). This bounds the memory used
+            for documents that are not yet yielded.
+        kwargs:
+            Keyword arguments for :py:class:`~estnltk.text.Text` instances created in
+            the workers (for example ``creation_date``). Must be picklable.
+
+        Raises
+        ------
+        ValueError
+            If no layers are given or a layer has no tagger (see :py:func:`check_layers`).
+        """
+        check_layers(layers)
+        self.layers = list(layers)
+        self.processes = processes or multiprocessing.cpu_count()
+        self.batch_size = max(1, batch_size)
+        self.max_in_flight = max_in_flight or 2 * self.processes
+        self._pool = multiprocessing.Pool(self.processes, _init_worker, (self.layers, kwargs))
+
+    def _batches(self, documents):
+        batch = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def process(self, documents, as_dict=False):
+        """Tag the documents and yield the results in input order.
+
+        Parameters
+        ----------
+        documents: iterable of str or dict
+            Raw texts or :py:class:`~estnltk.text.Text` instances / their JSON dictionaries.
+            The iterable is consumed lazily.
+        as_dict: boolean (default: False)
+            If True, yield plain dictionaries instead of :py:class:`~estnltk.text.Text` instances.
+
+        Yields
+        ------
+        Text or dict
+            The tagged documents.
+        """
+        if self._pool is None:
+            raise ValueError('The pipeline has been closed.')
+        from .text import Text
+        in_flight = deque()
+        batches = self._batches(documents)
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < self.max_in_flight:
+                try:
+                    batch = next(batches)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight.append(self._pool.apply_async(_tag_batch, (batch, )))
+            if not in_flight:
+                break
+            for result in in_flight.popleft().get():
+                yield result if as_dict else Text(result)
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def process_corpus(documents, layers, processes=None, batch_size=1, max_in_flight=None, as_dict=False, **kwargs):
+    """Tag the documents with a :py:class:`Pipeline` and yield the results in input order.
+
+    See :py:class:`Pipeline` for the description of the parameters.
+    """
+    with Pipeline(layers, processes, batch_size, max_in_flight, **kwargs) as pipeline:
+        for result in pipeline.process(documents, as_dict=as_dict):
+            yield result
@@ -32,10 +32,13 @@ import os, os.path
 import codecs
 import tempfile
 import subprocess
+import threading
+from collections import deque
 
 MALTPARSER_PATH  = os.path.join(PACKAGE_PATH, 'java-res', 'maltparser')
 MALTPARSER_MODEL = 'estnltkECG_f02_b'
 MALTPARSER_JAR   = 'maltparser-1.9.0.jar'
+MALTPARSER_SERVER = 'MaltParserServer.jar'
 
 
 # (!) Note: using these constants will be deprecated in the future versions of the parser:
@@ -522,6 +525,156 @@ def _executeMaltparser( input_string, maltparser_dir, maltparser_jar, model_name
 
     return results
 
+class MaltParserProcess(object):
+    ''' A long-running MaltParser worker process. 
+    
+        Unlike _executeMaltparser(), which launches a new Java VM (and loads 
+        the model) on each call, the worker loads the model once and then 
+        parses sentences that are sent to it through a pipe. The worker is 
+        started lazily on the first call of parse(), and it is automatically 
+        restarted if it has crashed.
+        
+        The Java side of the worker is in the file MaltParserServer.java, which 
+        is shipped precompiled (for Java 8+) in MaltParserServer.jar.
+        
+        Parameters
+        ----------
+        maltparser_dir: string
+              the directory containing Maltparser's jar and the model file; 
+        maltparser_jar: string
+              name of the Maltparser's jar file;
+        model_name: string
+              name of the model that should be used;
+        server_jar: string
+              path of the jar file of the worker (default: MaltParserServer.jar 
+              in estnltk's maltparser directory);
+    '''
+
+    # Number of stderr lines kept for error reporting
+    stderr_max_lines = 100
+
+    def __init__( self, maltparser_dir, maltparser_jar, model_name, \
+                        server_jar=os.path.join(MALTPARSER_PATH, MALTPARSER_SERVER) ):
+        self.maltparser_dir = maltparser_dir
+        self.maltparser_jar = maltparser_jar
+        self.model_name     = model_name
+        self.server_jar     = server_jar
+        self._process       = None
+        self._stderr_lines  = deque( maxlen=self.stderr_max_lines )
+
+
+    def start( self ):
+        ''' Starts the worker process and waits until the model has been loaded. '''
+        self.close()
+        classpath = os.pathsep.join([ os.path.join(self.maltparser_dir, self.server_jar), \
+                                      os.path.join(self.maltparser_dir, self.maltparser_jar) ])
+        cmd = ['java', '-cp', classpath, 'MaltParserServer', self.model_name ]
+        self._stderr_lines = deque( maxlen=self.stderr_max_lines )
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, \
+                                              stdout=subprocess.PIPE, \
+                                              stderr=subprocess.PIPE, \
+                                              cwd=self.maltparser_dir)
+        # Drain stderr in the background, so that the worker never blocks on 
+        # a full stderr pipe
+        stderr_reader = threading.Thread( target=self._read_stderr, \
+                                          args=(self._process.stderr, self._stderr_lines) )
+        stderr_reader.daemon = True
+        stderr_reader.start()
+        status = self._read_line()
+        if status != 'READY':
+            self.close()
+            raise Exception(' Error on starting Maltparser worker: ', status, self.stderr)
+
+
+    @staticmethod
+    def _read_stderr( stream, lines ):
+        for line in iter(stream.readline, b''):
+            lines.append( line.decode('utf-8', 'replace').rstrip() )
+
+
+    @property
+    def stderr( self ):
+        ''' The last lines written to stderr by the worker. '''
+        return '\n'.join( self._stderr_lines )
+
+
+    def is_alive( self ):
+        ''' Returns True, if the worker process is running. '''
+        return self._process is not None and self._process.poll() is None
+
+
+    def _read_line( self ):
+        line = self._process.stdout.readline()
+        if not line:
+            raise EOFError(' Maltparser worker exited unexpectedly: '+self.stderr)
+        return line.decode('utf-8').rstrip('\r\n')
+
+
+    def _parse( self, sentences ):
+        results = []
+        for sentence in sentences:
+            self._process.stdin.write( ('\n'.join(sentence)+'\n\n').encode('utf-8') )
+            self._process.stdin.flush()
+            line = self._read_line()
+            while line:
+                results.append( line.rstrip() )
+                line = self._read_line()
+            results.append( '' )
+        return results
+
+
+    def parse( self, input_string ):
+        ''' Parses given (CONLL-style) input string, and returns the result as 
+            an array of lines (in the same format as _executeMaltparser()).
+            
+            If the worker has crashed, it is restarted, and the parsing is 
+            retried once.
+        '''
+        sentences = []
+        sentence  = []
+        for line in input_string.split('\n'):
+            if line.strip():
+                sentence.append( line )
+            elif sentence:
+                sentences.append( sentence )
+                sentence = []
+        if sentence:
+            sentences.append( sentence )
+        if not self.is_alive():
+            self.start()
+        try:
+            return self._parse( sentences )
+        except (EOFError, IOError, OSError):
+            self.start()
+            return self._parse( sentences )
+
+
+    def close( self ):
+        ''' Shuts down the worker process (if it is running). '''
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            # Closing stdin tells the worker to terminate the model and exit
+            process.stdin.close()
+            if hasattr(subprocess, 'TimeoutExpired'):
+                process.wait( timeout=10 )
+            else:
+                process.wait()
+        except Exception:
+            process.kill()
+            process.wait()
+        finally:
+            process.stdout.close()
+
+
+    def __del__( self ):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
 # =============================================================================
 # =============================================================================
 #  Converting data from CONLL to estnltk JSON
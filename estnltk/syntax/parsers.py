@@ -13,12 +13,14 @@
 #
 
 import os.path
+import warnings
 
 from estnltk.names import *
 
 from estnltk.syntax.maltparser_support import MALTPARSER_PATH, MALTPARSER_MODEL, MALTPARSER_JAR
 from estnltk.syntax.maltparser_support import CONLLFeatGenerator
 from estnltk.syntax.maltparser_support import convert_text_to_CONLL, _executeMaltparser
+from estnltk.syntax.maltparser_support import MaltParserProcess
 from estnltk.syntax.maltparser_support import augmentTextWithCONLLstr
 from estnltk.syntax.maltparser_support import align_CONLL_with_Text
 
@@ -350,6 +352,8 @@ class MaltParser(object):
     model_name        = MALTPARSER_MODEL
     maltparser_jar    = MALTPARSER_JAR
     feature_generator = None
+    use_server        = True
+    _server           = None
     
     def __init__( self, **kwargs):
         ''' Initializes MaltParser's wrapper. 
@@ -372,6 +376,13 @@ class MaltParser(object):
                 for tokens.
                 NB! This must be the same feature generator that was used for training 
                 the model of MaltParser;
+            
+            use_server : bool
+                If True (default), a long-running MaltParser worker process 
+                (MaltParserProcess) is used: the model is loaded once, and the 
+                worker is reused across parse_text() calls. If the worker cannot 
+                be started, a warning is issued, and MaltParser is launched 
+                separately for each call (as with use_server=False);
         '''
         for argName, argVal in kwargs.items():
             if argName == 'maltparser_dir':
@@ -382,6 +393,8 @@ class MaltParser(object):
                 self.maltparser_jar = argVal
             elif argName == 'feature_generator':
                self.feature_generator = argVal
+            elif argName == 'use_server':
+               self.use_server = bool(argVal)
             else:
                 raise Exception(' Unsupported argument given: '+argName)
         if not self.maltparser_dir:
@@ -483,10 +496,7 @@ class MaltParser(object):
         textConllStr = convert_text_to_CONLL( text, self.feature_generator )
 
         # Execute MaltParser and get results as CONLL formatted string
-        resultsConllStr = \
-            _executeMaltparser( textConllStr, self.maltparser_dir, \
-                                              self.maltparser_jar, \
-                                              self.model_name )
+        resultsConllStr = self._execute( textConllStr )
         # Align the results with the initial text
         alignments = \
             align_CONLL_with_Text( resultsConllStr, text, self.feature_generator, **kwargs )
@@ -521,6 +531,38 @@ class MaltParser(object):
 
 
 
+    def _execute( self, input_string ):
+        ''' Executes MaltParser on given CONLL formatted string, using the 
+            long-running worker if possible.
+        '''
+        if self.use_server:
+            if self._server is None:
+                self._server = MaltParserProcess( self.maltparser_dir, \
+                                                  self.maltparser_jar, \
+                                                  self.model_name )
+                try:
+                    self._server.start()
+                except Exception as e:
+                    # The worker cannot be started: fall back to launching 
+                    # MaltParser for each call
+                    warnings.warn( 'Unable to start the MaltParser worker, '+\
+                                   'MaltParser is launched separately for each call: '+str(e) )
+                    self._server = None
+                    self.use_server = False
+            if self._server is not None:
+                return self._server.parse( input_string )
+        return _executeMaltparser( input_string, self.maltparser_dir, \
+                                                 self.maltparser_jar, \
+                                                 self.model_name )
+
+
+    def close( self ):
+        ''' Shuts down the MaltParser worker process (if it is running). '''
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+
     @staticmethod
     def load_default_feature_generator():
         ''' Initialize CONLLFeatGenerator with default settings. '''
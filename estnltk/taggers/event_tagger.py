@@ -29,6 +29,69 @@ BSTART = 'bstart' # b - block
 
 DEFAULT_METHOD = 'ahocorasick' if version_info.major >= 3 else 'naive'
 
+# characters that have a special meaning in regexes, and quantifiers
+REGEX_SPECIAL = set('.^$*+?{}[]()|\\')
+REGEX_QUANTIFIERS = set('*+?{')
+# inline flags, e.g. (?i) or (?x:...)
+INLINE_FLAGS = re.compile(r'\(\?[-a-zA-Z]+[:)]')
+
+
+def _has_top_level_alternation(regex):
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(regex):
+        c = regex[i]
+        if c == '\\':
+            i += 2
+            continue
+        if in_class:
+            if c == ']':
+                in_class = False
+        elif c == '[':
+            in_class = True
+            # ']' right after '[' or '[^' belongs to the class
+            if regex[i + 1:i + 2] == '^':
+                i += 1
+            if regex[i + 1:i + 2] == ']':
+                i += 1
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def literal_prefix(regex):
+    """Returns the literal text that every match of the regex starts with.
+
+    The prefix is extracted conservatively: an empty string is returned for regexes
+    with inline flags or top level alternatives, and the prefix ends before the first
+    special character, character class escape or quantified character.
+    """
+    if not isinstance(regex, six.string_types) or INLINE_FLAGS.search(regex) or _has_top_level_alternation(regex):
+        return ''
+    prefix = []
+    i = 0
+    while i < len(regex):
+        c = regex[i]
+        if c == '\\':
+            if i + 1 >= len(regex) or regex[i + 1].isalnum():
+                break
+            char, step = regex[i + 1], 2
+        elif c in REGEX_SPECIAL:
+            break
+        else:
+            char, step = c, 1
+        if regex[i + step:i + step + 1] in REGEX_QUANTIFIERS:
+            break
+        prefix.append(char)
+        i += step
+    return ''.join(prefix)
+
 
 class KeywordTagger(object):
     """A class that finds a list of keywords from Text object based on user-provided vocabulary.
@@ -160,13 +223,18 @@ class RegexTagger(KeywordTagger):
     """ 
     """
     def __init__(self, regex_sequence=None, conflict_resolving_strategy='MAX', return_layer=False,
-                 layer_name='regexes'):
+                 layer_name='regexes', search_method=DEFAULT_METHOD):
         """Initialize a new RegexTagger instance.
         
         Parameters
         ----------
         regex_sequence: list-like or dict-like
             sequence of regexes to annotate
+        search_method: 'naive', 'ahocorasick'
+            Method to find regex matches in text (default: 'naive' for python2 and 'ahocorasick' for python3).
+            'naive' scans the text once per regex. 'ahocorasick' finds the literal prefixes of the regexes
+            in a single scan and tries to match the regexes only at these positions; regexes that do not
+            start with a literal text are scanned as in 'naive' method. Both methods give the same matches.
         conflict_resolving_strategy: 'ALL', 'MAX', 'MIN'
             Strategy to choose between overlapping events (default: 'MAX').
         return_layer: bool
@@ -194,8 +262,15 @@ class RegexTagger(KeywordTagger):
             self.mapping = False
         self.layer_name = layer_name
         self.return_layer = return_layer
+        if search_method not in ['naive', 'ahocorasick']:
+            raise ValueError("Unknown search_method '%s'." % search_method)
         if conflict_resolving_strategy not in ['ALL', 'MIN', 'MAX']:
             raise ValueError("Unknown conflict_resolving_strategy '%s'." % conflict_resolving_strategy)
+        if search_method == 'ahocorasick' and version_info.major < 3:
+            raise ValueError(
+                "search_method='ahocorasick' is not supported by Python %s. Try 'naive' instead." % version_info.major)
+        self.search_method = search_method
+        self.ahocorasick_automaton = None
         self.conflict_resolving_strategy = conflict_resolving_strategy
 
     def tag(self, text):
@@ -219,31 +294,71 @@ class RegexTagger(KeywordTagger):
             text[self.layer_name] = matches
 
     def _match(self, text):
-        matches = []
+        if self.search_method == 'ahocorasick':
+            return self._match_ahocorasick(text)
+        return self._match_naive(text)
+
+    def _regexes(self):
         if self.mapping:
-            seq = self.map.keys()
-        else:
-            seq = self.regex_sequence
+            return list(self.map.keys())
+        return list(self.regex_sequence)
+
+    def _result(self, r, matchobj):
+        result = {
+            'start': matchobj.start(),
+            'end': matchobj.end(),
+            'regex': r,
+            'groups': matchobj.groupdict()
+        }
+        if self.mapping:
+            for k, v in self.map[r].items():
+                if k not in result.keys():
+                    result[k] = v
+        return result
 
-        for r in seq:
+    def _match_naive(self, text):
+        matches = []
+        for r in self._regexes():
             for matchobj in re.finditer(r, text, overlapped=True):
-                groups = (matchobj.groupdict())
-                result = {
-                    'start': matchobj.start(),
-                    'end': matchobj.end(),
-                    'regex': r,
-                    'groups':groups
-                }
-
-                if self.mapping:
-                    for k, v in self.map[r].items():
-                        if k not in result.keys():
-                            result[k] = v
-
-                matches.append(
-                    result
-                )
+                matches.append(self._result(r, matchobj))
+        return matches
 
+    def _build_automaton(self):
+        self.compiled_regexes = []
+        prefixes = {}
+        for idx, r in enumerate(self._regexes()):
+            self.compiled_regexes.append((r, re.compile(r)))
+            prefix = literal_prefix(r)
+            if prefix:
+                prefixes.setdefault(prefix, []).append(idx)
+        self.ahocorasick_automaton = ahocorasick.Automaton()
+        for prefix, idxes in prefixes.items():
+            self.ahocorasick_automaton.add_word(prefix, (len(prefix), idxes))
+        self.prefixed = set(idx for idxes in prefixes.values() for idx in idxes)
+        if prefixes:
+            self.ahocorasick_automaton.make_automaton()
+
+    def _match_ahocorasick(self, text):
+        if self.ahocorasick_automaton is None:
+            self._build_automaton()
+        # start positions of the literal prefixes of every regex
+        positions = [[] for _ in self.compiled_regexes]
+        if self.prefixed:
+            for end, (length, idxes) in self.ahocorasick_automaton.iter(text):
+                for idx in idxes:
+                    positions[idx].append(end - length + 1)
+        matches = []
+        for idx, (r, regex) in enumerate(self.compiled_regexes):
+            if idx in self.prefixed:
+                # an overlapped search tries to match the regex at every position,
+                # a match can only start where the prefix does
+                for position in positions[idx]:
+                    matchobj = regex.match(text, position)
+                    if matchobj is not None:
+                        matches.append(self._result(r, matchobj))
+            else:
+                for matchobj in regex.finditer(text, overlapped=True):
+                    matches.append(self._result(r, matchobj))
         return matches
 
 
@@ -11,7 +11,10 @@ The resulting documents have paragraphs separated by two newlines and sentences
 The original plain text is not known for XML TEI files.
 Note that all punctuation has been separated from words in the TEI files.
 
-TODO: Make this module faster, it is dead slow, probably due to BeautifulSoup4.
+The files are parsed incrementally, so that the documents can be processed one at a time::
+
+    for doc in yield_tei_corpora('koondkorpus', processes=4):
+        ...
 """
 from __future__ import unicode_literals, print_function, absolute_import
 
@@ -20,11 +23,18 @@ from .names import *
 from .text import Text
 from bs4 import BeautifulSoup
 from copy import deepcopy
+from collections import deque
 
 import os
+import multiprocessing
+
+try:
+    import xml.etree.cElementTree as ElementTree
+except ImportError:
+    import xml.etree.ElementTree as ElementTree
 
 
-def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encoding=None):
+def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encoding=None, processes=None):
     """Parse documents from TEI style XML files.
     
     Gives each document FILE attribute that denotes the original filename.
@@ -41,7 +51,9 @@ def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encod
         List of <div> types, that are considered documents in the XML files (default: ["artikkel"]).
     encoding: str
         Encoding to be used for decoding the content of the XML file. If not specified (default), 
-        then no separate decoding step is applied.
+        then the encoding given in the XML declaration or UTF-8 is used.
+    processes: int
+        The number of worker processes parsing the files (default: parse in this process).
         
     Returns
     -------
@@ -49,14 +61,53 @@ def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encod
         Corpus containing parsed documents from all files. The file path
         is stored in FILE attribute of the documents.
     """
-    documents = []
-    for fnm in get_filenames(root, prefix, suffix):
-        path = os.path.join(root, fnm)
-        docs = parse_tei_corpus(path, target, encoding)
-        for doc in docs:
-            doc[FILE] = fnm
-        documents.extend(docs)
-    return documents
+    return list(yield_tei_corpora(root, prefix, suffix, target, encoding, processes))
+
+
+def yield_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encoding=None, processes=None):
+    """Parse documents from TEI style XML files one at a time.
+
+    See :py:func:`parse_tei_corpora` for the description of the parameters.
+    With worker processes, all documents of a file are sent to this process at once.
+
+    Yields
+    ------
+    estnltk.text.Text
+        The documents in the order of the files. The file path
+        is stored in FILE attribute of the documents.
+    """
+    fnms = get_filenames(root, prefix, suffix)
+    if not processes or processes <= 1:
+        for fnm in fnms:
+            for doc in yield_tei_corpus(os.path.join(root, fnm), target, encoding):
+                doc[FILE] = fnm
+                yield doc
+        return
+    pool = multiprocessing.Pool(processes)
+    try:
+        # at most two files per process are parsed ahead, so that the parsed documents do not pile up
+        in_flight = deque()
+        fnms = iter(fnms)
+        while True:
+            for fnm in fnms:
+                args = (os.path.join(root, fnm), target, encoding)
+                in_flight.append((fnm, pool.apply_async(_parse_tei_file, args)))
+                if len(in_flight) >= 2 * processes:
+                    break
+            if not in_flight:
+                break
+            fnm, result = in_flight.popleft()
+            for doc in result.get():
+                doc[FILE] = fnm
+                yield Text(doc)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _parse_tei_file(path, target, encoding):
+    # Text instances cannot be pickled, the workers return plain documents
+    return [tokenize_document(doc) for doc in iter_tei_divs(path, target, encoding)]
 
 
 def parse_tei_corpus(path, target=['artikkel'], encoding=None):
@@ -70,23 +121,143 @@ def parse_tei_corpus(path, target=['artikkel'], encoding=None):
         List of <div> types, that are considered documents in the XML files (default: ["artikkel"]).
     encoding: str
         Encoding to be used for decoding the content of the XML file. If not specified (default), 
-        then no separate decoding step is applied.
+        then the encoding given in the XML declaration or UTF-8 is used.
 
     Returns
     -------
     list of esnltk.text.Text
     """
-    with open(path, 'rb') as f:
-        html_doc = f.read()
-    if encoding:
-        html_doc = html_doc.decode( encoding )
-    soup = BeautifulSoup(html_doc, 'html5lib')
-    title = soup.find_all('title')[0].string
-    
-    documents = []
-    for div1 in soup.find_all('div1'):
-        documents.extend(parse_div(div1, dict(), target))
-    return tokenize_documents(documents)
+    return list(yield_tei_corpus(path, target, encoding))
+
+
+def yield_tei_corpus(path, target=['artikkel'], encoding=None):
+    """Parse documents from a TEI style XML file one at a time.
+
+    See :py:func:`parse_tei_corpus` for the description of the parameters.
+
+    Yields
+    ------
+    esnltk.text.Text
+    """
+    for doc in iter_tei_divs(path, target, encoding):
+        yield Text(tokenize_document(doc))
+
+
+def _local_name(tag):
+    # strip the namespace of the tag
+    return tag.rsplit('}', 1)[-1]
+
+
+def _element_text(elem):
+    return ''.join(elem.itertext())
+
+
+def _div_title(elem):
+    # html5lib ignored the <head> tags, so the title is the text up to the first element in the div or head
+    text = elem.text or ''
+    if len(elem) > 0 and _local_name(elem[0].tag) == 'head':
+        head = elem[0]
+        text += head.text or ''
+        if len(head) == 0:
+            text += head.tail or ''
+    return text.strip()
+
+
+def _div_level(name):
+    if name.startswith('div') and name[3:].isdigit():
+        return int(name[3:])
+    return None
+
+
+def iter_tei_divs(path, target=['artikkel'], encoding=None):
+    """Parse the document <div> tags of a TEI style XML file incrementally.
+
+    The structure of the divs is interpreted as in :py:func:`parse_div`, but the parsed
+    elements are discarded right after they are processed, so that the memory used
+    does not depend on the size of the file.
+
+    Parameters
+    ----------
+    path: str
+        The path of the XML file.
+    target: list of str
+        List of <div> types, that are considered documents in the XML files (default: ["artikkel"]).
+    encoding: str
+        Encoding overriding the one given in the XML declaration.
+
+    Yields
+    ------
+    dict
+        The documents with their metadata and paragraphs (see :py:func:`parse_paragraphs`).
+    """
+    parser = ElementTree.XMLParser(encoding=encoding) if encoding else None
+    # the open elements, and for the divs: (level, type, metadata, is_document, element)
+    elements = []
+    divs = []
+    for event, elem in ElementTree.iterparse(path, events=('start', 'end'), parser=parser):
+        level = _div_level(_local_name(elem.tag))
+        if event == 'start':
+            elements.append(elem)
+            if level is not None:
+                divs.append(_start_div(elem, level, divs[-1] if divs else None, target))
+            continue
+        elements.pop()
+        if level is None:
+            continue
+        div_level, div_type, metadata, is_document, _ = divs.pop()
+        if is_document:
+            yield _parse_document_div(elem, div_type, metadata)
+        if is_document or not any(div[3] for div in divs):
+            # nothing in the div is needed any more
+            elem.clear()
+            if elements and len(elements[-1]) and elements[-1][-1] is elem:
+                del elements[-1][-1]
+
+
+def _start_div(elem, level, parent, target):
+    div_type = elem.get('type', None)
+    if parent is None:
+        # like all <div1> tags of the BeautifulSoup tree
+        active = level == 1
+        metadata = dict()
+    else:
+        parent_level, parent_type, parent_metadata, parent_is_document, parent_elem = parent
+        active = parent_metadata is not None and not parent_is_document and level == parent_level + 1
+        metadata = None
+        if active:
+            # the title is known, as the <head> of the parent precedes its subdivs
+            metadata = deepcopy(parent_metadata)
+            metadata[parent_type] = _div_title(parent_elem)
+    is_document = active and div_type in target
+    return level, div_type, metadata, is_document, elem
+
+
+def _parse_document_div(elem, div_type, metadata):
+    document = {
+        'type': div_type,
+        'title': _div_title(elem),
+        PARAGRAPHS: []
+    }
+    for para in elem.iter():
+        if _local_name(para.tag) != 'p':
+            continue
+        sentences = []
+        for sent in para.iter():
+            if _local_name(sent.tag) == 's':
+                sentence = _element_text(sent).strip()
+                if len(sentence) > 0:
+                    sentences.append(sentence)
+        if len(sentences) > 0:
+            document[PARAGRAPHS].append({SENTENCES: sentences})
+    # add author, if it exists
+    for author in elem.iter():
+        if _local_name(author.tag) == 'author':
+            document['author'] = _element_text(author).strip()
+            break
+    # add collected metadata
+    for k, v in metadata.items():
+        document[k] = v
+    return document
 
 
 def get_subdiv(div):
@@ -183,13 +354,13 @@ def concatenate(texts, sep=' ', offset=0):
     return sep.join(texts), spans
 
 
+def tokenize_document(doc):
+    """Join the paragraphs and sentences of an imported document to its text."""
+    doc[TEXT] = '\n\n'.join(['\n'.join(para[SENTENCES]) for para in doc[PARAGRAPHS]])
+    del doc[PARAGRAPHS]
+    return doc
+
+
 def tokenize_documents(docs):
     """Convert the imported documents to :py:class:'~estnltk.text.Text' instances."""
-    sep = '\n\n'
-    texts = []
-    for doc in docs:
-        text = '\n\n'.join(['\n'.join(para[SENTENCES]) for para in doc[PARAGRAPHS]])
-        doc[TEXT] = text
-        del doc[PARAGRAPHS]
-        texts.append(Text(doc))
-    return texts
+    return [Text(tokenize_document(doc)) for doc in docs]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..text import Text
+from ..corpus import read_document, write_document
+from ..binary_document import BinaryDocument, encode_document, is_layer, read_binary_document, write_binary_document
+from ..names import *
+
+
+class BinaryDocumentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fnm = os.path.join(self.tmpdir, 'doc.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        text = self.text()
+        write_binary_document(text, self.fnm)
+        self.assertDictEqual(dict(text), read_binary_document(self.fnm))
+
+    def test_read_layers(self):
+        text = self.text()
+        write_binary_document(text, self.fnm)
+        doc = read_binary_document(self.fnm, layers=[WORDS, SENTENCES])
+        self.assertListEqual(sorted([TEXT, WORDS, SENTENCES, 'source']), sorted(doc.keys()))
+        self.assertListEqual(text[WORDS], doc[WORDS])
+        self.assertListEqual(text[SENTENCES], doc[SENTENCES])
+
+    def test_spans(self):
+        text = self.text()
+        write_binary_document(text, self.fnm)
+        with BinaryDocument.open(self.fnm) as document:
+            spans = document.spans(WORDS)
+            self.assertListEqual(text.word_starts, list(spans[0::2]))
+            self.assertListEqual(text.word_ends, list(spans[1::2]))
+            del spans
+            self.assertIsNone(document.spans('multi'))
+            self.assertListEqual(sorted([WORDS, SENTENCES, PARAGRAPHS, 'multi']), document.layers)
+
+    def test_compact_text(self):
+        text = self.text()
+        self.assertEqual(encode_document(text), encode_document(self.text().compact()))
+
+    def test_corpus_functions(self):
+        text = self.text()
+        write_document(text, self.fnm, binary=True)
+        self.assertEqual(text, read_document(self.fnm))
+        json_fnm = os.path.join(self.tmpdir, 'doc.json')
+        write_document(text, json_fnm)
+        for fnm in (self.fnm, json_fnm):
+            doc = read_document(fnm, layers=[WORDS])
+            self.assertIsInstance(doc, Text)
+            self.assertNotIn(SENTENCES, doc)
+            self.assertListEqual(text[WORDS], doc[WORDS])
+
+    def test_list_attributes(self):
+        text = self.text()
+        text['categories'] = ['Linnad', 'Eesti']
+        self.assertFalse(is_layer(text['categories']))
+        self.assertTrue(is_layer(text[WORDS]))
+        write_binary_document(text, self.fnm)
+        with BinaryDocument.open(self.fnm) as document:
+            self.assertNotIn('categories', document.layers)
+        json_fnm = os.path.join(self.tmpdir, 'doc.json')
+        write_document(text, json_fnm)
+        for fnm in (self.fnm, json_fnm):
+            doc = read_document(fnm, layers=[SENTENCES])
+            self.assertListEqual(['Linnad', 'Eesti'], doc['categories'])
+            self.assertNotIn(WORDS, doc)
+
+    def test_bad_file(self):
+        with open(self.fnm, 'wb') as f:
+            f.write(b'{"text": ""}')
+        self.assertRaises(ValueError, BinaryDocument.open, self.fnm)
+
+    def text(self):
+        text = Text('Mari elab Tallinnas. Jüri käib Tartus.').tag_analysis()
+        text['source'] = 'test'
+        text['multi'] = [{START: [0, 10], END: [4, 19], TEXT: ['Mari', 'Tallinnas']}]
+        return text
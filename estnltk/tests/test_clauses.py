@@ -50,3 +50,17 @@ class ClausesTest(unittest.TestCase):
         # Terminate Java process in order to avoid "OSError: [WinError 6] The handle is invalid"
         # in subsequent Java processing
         segmenter._process.terminate()
+
+    def test_batch_same_as_sentence_by_sentence(self):
+        segmenter = ClauseSegmenter()
+        texts = [Text('Kõrred, millel on toitunud viljasääse vastsed, jäävad õhukeseks. Mees, kes tuli, läks ära ja naine jäi.'),
+                 Text('Pritsimehed leidsid eest lõõmava auto, mida sohvrid üritasid lükata.', phonetic=True, compound=True)]
+        for text in texts:
+            text.tag_analysis()
+        expected = [segmenter.detect_annotations(sentence) for text in texts for sentence in text.divide()]
+        segmenter.tag_texts(texts)
+        self.assertListEqual([[{k: w[k] for k in a} for w, a in zip(sentence, annotations)]
+                              for sentence, annotations in zip([s for t in texts for s in t.divide()], expected)],
+                             expected)
+        self.assertEqual(len(texts[0].divide('words', 'clauses')), 5)
+        segmenter.close()
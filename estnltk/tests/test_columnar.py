@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import copy
+import unittest
+
+from ..text import Text
+from ..columnar import ColumnarLayer
+from ..names import *
+
+
+class ColumnarLayerTest(unittest.TestCase):
+
+    def test_elements(self):
+        words = self.words()
+        layer = ColumnarLayer(words)
+        self.assertEqual(len(words), len(layer))
+        self.assertListEqual(words, layer.to_list())
+        self.assertEqual(words[1], layer[1])
+        self.assertEqual(words[-1], layer[-1])
+        self.assertListEqual(words[1:], [dict(word) for word in layer[1:]])
+        self.assertNotIn(LABEL, layer[0])
+        self.assertRaises(KeyError, lambda: layer[0][LABEL])
+        self.assertRaises(IndexError, lambda: layer[len(words)])
+
+    def test_modifying_elements(self):
+        layer = ColumnarLayer(self.words())
+        layer[0][LABEL] = 'B-PER'
+        analysis = layer[0][ANALYSIS]
+        analysis[0][LEMMA] = 'muudetud'
+        layer[0][ANALYSIS] = analysis
+        layer[1][ANALYSIS] = []
+        del layer[2][ANALYSIS]
+        self.assertEqual('B-PER', layer[0][LABEL])
+        self.assertNotIn(LABEL, layer[1])
+        self.assertEqual('muudetud', layer[0][ANALYSIS][0][LEMMA])
+        self.assertListEqual([], layer[1][ANALYSIS])
+        self.assertNotIn(ANALYSIS, layer[2])
+        self.assertRaises(KeyError, layer.analysis_values, LEMMA)
+
+    def test_analyses_are_decoded_on_read(self):
+        layer = ColumnarLayer(self.words())
+        layer[0][ANALYSIS][0][LEMMA] = 'muudetud'
+        self.assertEqual('mari', layer[0][ANALYSIS][0][LEMMA])
+        self.assertIsNot(layer[0][ANALYSIS], layer[0][ANALYSIS])
+
+    def test_deepcopy(self):
+        layer = ColumnarLayer(self.words())
+        word = copy.deepcopy(layer[0])
+        word[ANALYSIS][0][LEMMA] = 'muudetud'
+        self.assertIsInstance(word, dict)
+        self.assertEqual('mari', layer[0][ANALYSIS][0][LEMMA])
+
+    def test_multispans_not_allowed(self):
+        self.assertRaises(ValueError, ColumnarLayer, [{START: [0, 5], END: [3, 8]}])
+
+    def words(self):
+        return Text('Mari elab.').tag_analysis()[WORDS]
+
+
+class CompactTextTest(unittest.TestCase):
+
+    def test_properties(self):
+        text = self.text()
+        compact = self.text().compact()
+        self.assertIsInstance(compact[WORDS], ColumnarLayer)
+        self.assertListEqual(text.word_texts, compact.word_texts)
+        self.assertListEqual(text.word_spans, compact.word_spans)
+        self.assertListEqual(text.lemmas, compact.lemmas)
+        self.assertListEqual(text.postags, compact.postags)
+        self.assertListEqual(text.lemma_lists, compact.lemma_lists)
+        self.assertListEqual(text.postag_lists, compact.postag_lists)
+        self.assertListEqual(text.root_tokens, compact.root_tokens)
+        self.assertListEqual(text.split_by_sentences(), compact.split_by_sentences())
+
+    def test_expand(self):
+        text = self.text()
+        compact = self.text().compact()
+        compact.expand()
+        self.assertIsInstance(compact[WORDS], list)
+        self.assertDictEqual(text, compact)
+
+    def test_cached_properties_are_cleared(self):
+        text = self.text()
+        words = text.words
+        text.compact()
+        self.assertIsNot(words, text.words)
+        self.assertIsInstance(text.words, ColumnarLayer)
+
+    def text(self):
+        return Text('Mari elab Tallinnas. Jüri käib Tartus koolis, kus ilm on ilus.').tag_analysis()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..text import Text
+from ..names import *
+from ..corpus import read_json_corpus, write_json_corpus
+from ..corpus_io import yield_jsonl, write_jsonl
+
+
+class JsonLinesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.docs = [dict(Text('Dokument number {0}, õun ja müük.'.format(i)).tokenize_words()) for i in range(50)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_roundtrip(self):
+        for name in ('corpus.jsonl', 'corpus.jsonl.gz'):
+            self.assertEqual(50, write_jsonl(self.docs, self.path(name), chunk_size=100))
+            self.assertListEqual(self.docs, list(yield_jsonl(self.path(name), chunk_size=100)))
+
+    def test_ascii(self):
+        write_jsonl(self.docs, self.path('corpus.jsonl'))
+        with io.open(self.path('corpus.jsonl'), 'rb') as f:
+            f.read().decode('ascii')
+
+    def test_as_text(self):
+        write_jsonl(self.docs, self.path('corpus.jsonl'))
+        texts = list(yield_jsonl(self.path('corpus.jsonl'), as_text=True))
+        self.assertIsInstance(texts[0], Text)
+        self.assertListEqual(self.docs, texts)
+
+    def test_resume(self):
+        for name in ('corpus.jsonl', 'corpus.jsonl.gz'):
+            write_jsonl(self.docs, self.path(name))
+            offsets = [offset for offset, doc in yield_jsonl(self.path(name), with_offsets=True, chunk_size=100)]
+            self.assertListEqual(self.docs[21:], list(yield_jsonl(self.path(name), offset=offsets[20])))
+            self.assertListEqual([], list(yield_jsonl(self.path(name), offset=offsets[-1])))
+
+    def test_empty_lines(self):
+        with io.open(self.path('corpus.jsonl'), 'wb') as f:
+            f.write(b'{"text": "a"}\n\n{"text": "b"}')
+        self.assertListEqual([{TEXT: 'a'}, {TEXT: 'b'}], list(yield_jsonl(self.path('corpus.jsonl'))))
+        self.assertListEqual([14, 28], [offset for offset, doc in yield_jsonl(self.path('corpus.jsonl'), with_offsets=True)])
+
+    def test_processes(self):
+        write_jsonl(self.docs, self.path('corpus.jsonl.gz'))
+        docs = list(yield_jsonl(self.path('corpus.jsonl.gz'), processes=2, chunk_size=1000, max_in_flight=2))
+        self.assertListEqual(self.docs, docs)
+
+    def test_compact_text(self):
+        text = Text('Mari elab Tallinnas.').tag_analysis()
+        expected = dict(text)
+        write_jsonl([text.compact()], self.path('corpus.jsonl'))
+        self.assertListEqual([expected], list(yield_jsonl(self.path('corpus.jsonl'))))
+
+    def test_json_corpus(self):
+        write_json_corpus(self.docs, self.path('corpus.json'))
+        self.assertListEqual(self.docs, read_json_corpus(self.path('corpus.json')))
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..text import Text
+from ..names import *
+from ..corpus_store import CorpusStore, CorpusStoreWriter, write_corpus_store, INDEX_FILE
+
+
+class CorpusStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'store')
+        self.docs = [{TEXT: 'Dokument number {0}, õun.'.format(i) * (i % 7 + 1), FILE: 'file{0}.xml'.format(i // 10)}
+                     for i in range(100)]
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.path))
+
+    def test_get(self):
+        store = write_corpus_store(self.docs, self.path, shard_size=1000)
+        self.assertEqual(100, len(store))
+        self.assertGreater(len(store.shards), 5)
+        for i in (99, 0, 57, 57, 3):
+            self.assertDictEqual(self.docs[i], store.get(i))
+        self.assertIsInstance(store.get(5, as_text=True), Text)
+        self.assertDictEqual({FILE: 'file5.xml'}, store.metadata(57))
+        self.assertNotIn(100, store)
+        self.assertRaises(KeyError, store.get, 100)
+        store.close()
+
+    def test_ids(self):
+        with CorpusStoreWriter(self.path, meta_keys=[]) as writer:
+            writer.add(self.docs[0], 'esimene')
+            writer.add(self.docs[1], 'teine')
+            self.assertRaises(ValueError, writer.add, self.docs[2], 'teine')
+        store = CorpusStore(self.path)
+        self.assertListEqual(['esimene', 'teine'], store.ids())
+        self.assertDictEqual(self.docs[1], store['teine'])
+        self.assertDictEqual({}, store.metadata('teine'))
+
+    def test_partitions(self):
+        store = write_corpus_store(self.docs, self.path, shard_size=1000)
+        partitions = store.partitions(3)
+        self.assertEqual(3, len(partitions))
+        self.assertListEqual(list(range(len(store.shards))), sorted(shard for group in partitions for shard in group))
+        sizes = store.shard_sizes()
+        totals = [sum(sizes[shard] for shard in group) for group in partitions]
+        self.assertLessEqual(max(totals) - min(totals), max(sizes))
+        documents = [doc for shard in range(len(store.shards)) for doc_id, doc in store.iter_shard(shard)]
+        self.assertListEqual(self.docs, documents)
+
+    def test_incomplete_store(self):
+        writer = CorpusStoreWriter(self.path)
+        writer.add(self.docs[0])
+        self.assertRaises(ValueError, CorpusStore, self.path)
+        writer.close()
+        self.assertEqual(1, len(CorpusStore(self.path)))
+        self.assertRaises(ValueError, CorpusStoreWriter, self.path)
+
+    def test_error_while_writing(self):
+        def documents():
+            yield self.docs[0]
+            raise RuntimeError('broken corpus')
+        self.assertRaises(RuntimeError, write_corpus_store, documents(), self.path)
+        self.assertRaises(ValueError, CorpusStore, self.path)
+        self.assertFalse(os.path.exists(os.path.join(self.path, INDEX_FILE)))
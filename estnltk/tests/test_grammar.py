@@ -3,6 +3,9 @@ from __future__ import unicode_literals, print_function, absolute_import
 import unittest
 
 from estnltk import Text, Lemmas, Postags, Union, Match, IRegex, Concatenation, Intersection, Suffix, LayerRegex, Layer
+from estnltk import AllGaps, Gaps
+from estnltk.grammar.conflictresolver import resolve_using_maximal_coverage, resolve_using_maximal_coverage_quadratic
+from estnltk.grammar.conflictresolver import random_matches
 
 
 class UnionTest(unittest.TestCase):
@@ -160,3 +163,54 @@ class LayerRegexTest(unittest.TestCase):
         expected = [Match(0, 5, 'Janne')]
         self.assertListEqual(expected, matches)
 
+
+
+class ConflictResolverTest(unittest.TestCase):
+
+    def spans(self, matches):
+        return [(m.start, m.end) for m in matches]
+
+    def test_maximal_coverage(self):
+        matches = [Match(0, 4, 'Kass'), Match(0, 11, 'Kass hüppas'), Match(5, 11, 'hüppas'),
+                   Match(5, 14, 'hüppas ja'), Match(12, 19, 'ja hiir')]
+        resolved = resolve_using_maximal_coverage(matches)
+        self.assertListEqual([(0, 11), (12, 19)], self.spans(resolved))
+
+    def test_same_as_quadratic(self):
+        for seed in range(20):
+            for n, text_length in ((10, 10), (100, 200), (300, 1500)):
+                matches = random_matches(n, text_length=text_length, max_length=15, seed=seed)
+                expected = resolve_using_maximal_coverage_quadratic(list(matches))
+                resolved = resolve_using_maximal_coverage(list(matches))
+                self.assertListEqual(self.spans(expected), self.spans(resolved))
+
+
+class GapsTest(unittest.TestCase):
+
+    def text(self):
+        return Text('Kass hüppas ja hiir kargas. Koer magas ja kass hüppas.')
+
+    def spans(self, matches):
+        return [(m.start, m.end) for m in matches]
+
+    def test_allgaps(self):
+        matches = AllGaps(Lemmas('kass'), Postags('V')).get_matches(self.text(), conflict_resolver=None)
+        self.assertListEqual([(0, 11), (0, 26), (0, 38), (0, 53), (42, 53)], self.spans(matches))
+
+    def test_allgaps_max_gap(self):
+        matches = AllGaps(Lemmas('kass'), Postags('V'), max_gap=8).get_matches(self.text(), conflict_resolver=None)
+        self.assertListEqual([(0, 11), (42, 53)], self.spans(matches))
+
+    def test_allgaps_same_sentence(self):
+        symbol = AllGaps(Lemmas('kass'), Postags('V'), same_sentence=True)
+        matches = symbol.get_matches(self.text(), conflict_resolver=None)
+        self.assertListEqual([(0, 11), (0, 26), (42, 53)], self.spans(matches))
+
+    def test_gaps(self):
+        matches = Gaps(Lemmas('hiir', 'koer'), Postags('V')).get_matches(self.text(), conflict_resolver=None)
+        self.assertListEqual([(15, 26), (28, 38)], self.spans(matches))
+
+    def test_gaps_same_sentence(self):
+        symbol = Gaps(Lemmas('kass', 'hiir'), Lemmas('koer', 'kass'), same_sentence=True)
+        matches = symbol.get_matches(self.text(), conflict_resolver=None)
+        self.assertListEqual([], self.spans(matches))
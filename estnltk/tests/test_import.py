@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# imports a module in a fresh interpreter and reports the import time and the loaded modules
+IMPORT_SCRIPT = '''
+import sys, time, json, importlib
+start = time.time()
+importlib.import_module(sys.argv[1])
+elapsed = time.time() - start
+text = sys.modules.get('estnltk.text')
+print(json.dumps({'time': elapsed,
+                  'modules': sorted(sys.modules),
+                  'punkt_loaded': text is not None and text.sentence_tokenizer is not None}))
+'''
+
+
+def import_estnltk(module='estnltk'):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([PACKAGE_ROOT, env.get('PYTHONPATH', '')])
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT, module], env=env)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def import_time(module, repeat=3):
+    return min(import_estnltk(module)['time'] for _ in range(repeat))
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        result = import_estnltk()
+        modules = set(result['modules'])
+        self.assertNotIn('pandas', modules)
+        self.assertNotIn('estnltk.syntax', modules)
+        self.assertNotIn('estnltk.wordnet', modules)
+        self.assertFalse(result['punkt_loaded'])
+        if sys.version_info >= (3, 7):
+            # public names are imported lazily
+            self.assertNotIn('estnltk.text', modules)
+            self.assertNotIn('nltk', modules)
+
+    def test_import_time(self):
+        estnltk_time = import_time('estnltk')
+        text_time = import_time('estnltk.text')
+        if sys.version_info >= (3, 7):
+            # nothing but the package itself is imported
+            self.assertLess(estnltk_time, 0.5 * text_time)
+        else:
+            # the public names are imported eagerly, but the heavy dependencies are still deferred
+            self.assertLess(estnltk_time, 2 * text_time)
+
+    def test_lazy_attributes(self):
+        import estnltk
+        from estnltk.text import Text
+        from estnltk.vabamorf.morf import analyze
+        self.assertIs(estnltk.Text, Text)
+        self.assertIs(estnltk.analyze, analyze)
+        self.assertIn('TimexTagger', dir(estnltk))
+        self.assertRaises(AttributeError, getattr, estnltk, 'NoSuchName')
+
+    def test_import_error_keeps_cause(self):
+        import estnltk
+        estnltk._LAZY_ATTRIBUTES['_Broken'] = ('core', 'no_such_attribute')
+        try:
+            with self.assertRaises(ImportError) as context:
+                estnltk.__getattr__('_Broken')
+            self.assertIn('no_such_attribute', str(context.exception))
+            if sys.version_info >= (3, 0):
+                self.assertIsInstance(context.exception.__cause__, AttributeError)
+        finally:
+            del estnltk._LAZY_ATTRIBUTES['_Broken']
+
+    def test_sentence_tokenizer_loaded_on_demand(self):
+        from estnltk.text import Text, load_default_sentence_tokenizer
+        text = Text('Esimene lause. Teine lause.')
+        self.assertListEqual(text.sentence_texts, ['Esimene lause.', 'Teine lause.'])
+        self.assertIsNotNone(load_default_sentence_tokenizer())
@@ -1,6 +1,7 @@
 from estnltk import Text
 from estnltk.taggers import KeywordTagger
 from estnltk.taggers import RegexTagger
+from estnltk.taggers.event_tagger import literal_prefix
 
 
 def test_keyword_tagger():
@@ -39,3 +40,23 @@ def test_regex_tagger():
         return_layer=True
     )
     assert [{'start':i['start'], 'end':i['end']} for i in k.tag(text)] == [{'end': 2, 'start': 0}, {'end': 14, 'start': 12}]
+
+
+def test_regex_tagger_search_methods():
+    text = Text('Kass kassike ja koer koerake, kassikesed ning 12 koera ja 3 kassi.')
+    regexes = ['kass\\w*', 'koer(?P<ending>\\w*)', 'kassike', '\\d+ \\w+', 'ja|ning', 'k\\w+e']
+    for strategy in ['ALL', 'MAX', 'MIN']:
+        naive = RegexTagger(regexes, conflict_resolving_strategy=strategy, return_layer=True, search_method='naive')
+        ahocorasick = RegexTagger(regexes, conflict_resolving_strategy=strategy, return_layer=True,
+                                  search_method='ahocorasick')
+        assert naive.tag(text) == ahocorasick.tag(text)
+
+
+def test_literal_prefix():
+    assert literal_prefix('kass\\w*') == 'kass'
+    assert literal_prefix('ab?c') == 'a'
+    assert literal_prefix('a\\.b\\d') == 'a.b'
+    assert literal_prefix('ab(c|d)') == 'ab'
+    assert literal_prefix('ab|cd') == ''
+    assert literal_prefix('(?i)abc') == ''
+    assert literal_prefix('\\bab') == ''
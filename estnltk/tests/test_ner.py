@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function, absolute_import
+import os
+import codecs
+import shutil
+import tempfile
 import unittest
 from copy import deepcopy
 
 import estnltk
 from ..estner.featureextraction import MorphFeatureExtractor, LocalFeatureExtractor, GazetteerFeatureExtractor, \
-    apply_templates
+    apply_templates, CompiledTemplates
+from ..estner.gazetteertrie import open_trie, ROOT
 from ..estner.ner import Token
 from ..core import as_unicode
 from ..text import Text
@@ -48,6 +53,32 @@ class TestFeatureExtractor(unittest.TestCase):
         self.assertTrue('lem[0]|lem[1]=b|c' in t['F'])
         self.assertTrue('lem[0]|lem[1]=b|d' in t['F'])
 
+    def test_compiled_templates(self):
+        templates = [(('lem', 0),), (('lem', -1), ('pos', 1)), (('pos', 2),)]
+        toks = []
+        for lem, pos in [('a', 'S'), (['b', 'c'], None), ('d', 'V'), ('e', 'Z')]:
+            t = Token()
+            t['lem'] = lem
+            t['pos'] = pos
+            toks.append(t)
+        features = CompiledTemplates(templates).features(toks)
+        self.assertListEqual(features, [['lem[0]=a', 'pos[2]=V'],
+                                        ['lem[0]=b', 'lem[0]=c', 'lem[-1]|pos[1]=a|V', 'pos[2]=Z'],
+                                        ['lem[0]=d', 'lem[-1]|pos[1]=b|Z', 'lem[-1]|pos[1]=c|Z'],
+                                        ['lem[0]=e']])
+        apply_templates(toks, CompiledTemplates(templates))
+        self.assertListEqual([t['F'] for t in toks], features)
+
+    def test_sentence_features_same_as_apply_templates(self):
+        text = Text('Mr Alexander Graham Bell on tuntud teadlane. Ta elas Ameerikas.')
+        fex = NerTagger().fex
+        doc = json_document_to_estner_document(text)
+        fex.extract([doc])
+        for snt in doc.sentences:
+            features = fex.sentence_features(snt)
+            apply_templates(snt, fex.settings.TEMPLATES)
+            self.assertListEqual(features, [t.feature_list() for t in snt])
+
 
 class TestGazetteerFeatureExtractor(unittest.TestCase):
     def test(self):
@@ -88,6 +119,39 @@ class TestGazetteerFeatureExtractor(unittest.TestCase):
         self.assertTrue('gaz' not in t)
 
 
+class TestGazetteerTrie(unittest.TestCase):
+    def test(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            gazetteer_file = os.path.join(tmpdir, 'gazetteer.txt')
+            with codecs.open(gazetteer_file, 'wb', 'utf-8') as f:
+                f.write('tallinn\tloc\ntallinna ülikool\torg\ntallinna ülikool\tloc\n'
+                        'tallinna\tper\ngraham bell\tpeop\n')
+            trie = open_trie(gazetteer_file)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 'gazetteer.trie')))
+            self.assertEqual(trie['tallinn'], {'loc'})
+            self.assertEqual(trie['tallinna ülikool'], {'org', 'loc'})
+            self.assertTrue('graham bell' in trie)
+            self.assertFalse('graham' in trie)
+            self.assertFalse('tallinna ülikooli' in trie)
+
+            node = trie.walk(ROOT, 'tallinna')
+            self.assertEqual(trie.labels(node), {'per'})
+            node = trie.child(node, 'ülikool')
+            self.assertEqual(trie.labels(node), {'org', 'loc'})
+            self.assertIsNone(trie.child(node, 'ülikool'))
+            trie.close()
+
+            # the trie is rebuilt, if the gazetteer has changed
+            with codecs.open(gazetteer_file, 'ab', 'utf-8') as f:
+                f.write('tartu\tloc\n')
+            trie = open_trie(gazetteer_file)
+            self.assertEqual(trie['tartu'], {'loc'})
+            trie.close()
+        finally:
+            shutil.rmtree(tmpdir)
+
+
 class TestMorphFeatureExtractor(unittest.TestCase):
     def test(self):
         fex = MorphFeatureExtractor()
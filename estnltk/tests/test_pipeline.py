@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+
+from ..text import Text
+from ..pipeline import Pipeline, process_corpus
+from ..names import *
+
+
+DOCUMENTS = ['Jänes oli parajasti põllu peal. Tallinnas elab Mari Tamm.',
+             'Hunt jooksis metsas.',
+             {'text': 'Karuott magas laanes. Toomas läks Tartusse.'},
+             'Natukene teksti']
+
+
+class PipelineTest(unittest.TestCase):
+
+    def test_same_as_serial(self):
+        expected = [Text(document).tag_named_entities() for document in DOCUMENTS]
+        with Pipeline([ANALYSIS, NAMED_ENTITIES], processes=2, max_in_flight=1) as pipeline:
+            results = list(pipeline.process(DOCUMENTS * 2))
+        self.assertEqual(len(results), len(DOCUMENTS) * 2)
+        for text, expected_text in zip(results, expected * 2):
+            self.assertIsInstance(text, Text)
+            self.assertListEqual(text[WORDS], expected_text[WORDS])
+            self.assertListEqual(text[NAMED_ENTITIES], expected_text[NAMED_ENTITIES])
+
+    def test_as_dict_batches(self):
+        expected = [Text(document).tag_analysis() for document in DOCUMENTS]
+        results = list(process_corpus(iter(DOCUMENTS), [ANALYSIS], processes=2, batch_size=3, as_dict=True))
+        self.assertEqual(len(results), len(DOCUMENTS))
+        for result, expected_text in zip(results, expected):
+            self.assertNotIsInstance(result, Text)
+            self.assertEqual(result[TEXT], expected_text[TEXT])
+            self.assertListEqual(result[WORDS], expected_text[WORDS])
+
+    def test_unknown_layers(self):
+        self.assertRaises(ValueError, Pipeline, [LABEL, 'nonexistent'], processes=1)
+        self.assertRaises(ValueError, Pipeline, [], processes=1)
@@ -90,6 +90,23 @@ class MaltParserSupportTest(unittest.TestCase):
         self.assertEqual(treeStr, '(oli Auhinnaks (tekk ilus valge .))')
 
 
+    def test_maltparser_server_reuse(self):
+        mparser_server = MaltParser( use_server=True )
+        mparser_single = MaltParser( use_server=False )
+        text = Text('Kohtusid suur hunt ja kuri lammas. Auhinnaks oli ilus valge tekk.')
+        text.tag_analysis()
+        results_single = mparser_single.parse_text(text, return_type="conll")
+        # The same worker should be reused across calls
+        pids = []
+        for i in range(2):
+            results_server = mparser_server.parse_text(text, return_type="conll")
+            self.assertListEqual( results_server, results_single )
+            self.assertIsNotNone( mparser_server._server )
+            pids.append( mparser_server._server._process.pid )
+        self.assertEqual( pids[0], pids[1] )
+        mparser_server.close()
+
+
     def test_reading_from_conll_file_1(self):
         test_conll_string = \
 '''1	Ken	Ken	H	H	sg|n	4	@SUBJ	_	_
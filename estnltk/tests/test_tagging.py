@@ -2,7 +2,7 @@
 from __future__ import unicode_literals, print_function, absolute_import
 
 import unittest
-from ..text import Text
+from ..text import Text, analyze_texts
 from ..names import *
 
 
@@ -117,3 +117,26 @@ class TaggingTest(unittest.TestCase):
         self.assertTrue(text.is_tagged(VERB_CHAINS))
         self.assertFalse(text.is_tagged(WORDNET))
 
+
+
+class AnalyzeTextsTest(unittest.TestCase):
+
+    def test_same_as_tag_analysis(self):
+        contents = ['Jänes oli parajasti põllu peal. Hunt jooksis metsas.',
+                    'Natukene teksti',
+                    'Karuott magas laanes. Kõik oli vaikne.']
+        expected = [Text(content).tag_analysis() for content in contents]
+        for batch_size in [None, 1, 2]:
+            texts = analyze_texts([Text(content) for content in contents], batch_size=batch_size)
+            for text, expected_text in zip(texts, expected):
+                self.assertTrue(text.is_tagged(ANALYSIS))
+                self.assertListEqual(text[WORDS], expected_text[WORDS])
+
+    def test_text_options(self):
+        contents = ['Jänes oli parajasti põllu peal.', 'Karuott magas laanes.']
+        options = [{}, {'disambiguate': False, 'guess': False}]
+        expected = [Text(content, **kw).tag_analysis() for content, kw in zip(contents, options)]
+        texts = analyze_texts([Text(content, **kw) for content, kw in zip(contents, options)])
+        for text, expected_text in zip(texts, expected):
+            self.assertListEqual(text[WORDS], expected_text[WORDS])
+        self.assertNotEqual(Text(contents[1]).tag_analysis()[WORDS], texts[1][WORDS])
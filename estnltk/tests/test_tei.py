@@ -1,14 +1,92 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function, absolute_import
 
-from ..teicorpus import parse_tei_corpora
-from ..core import AA_PATH
+from ..teicorpus import parse_tei_corpora, yield_tei_corpora, yield_tei_corpus, parse_div, tokenize_documents
+from ..core import AA_PATH, get_filenames
+from ..names import *
+from bs4 import BeautifulSoup
 
+import os
+import shutil
+import tempfile
+import types
 import unittest
 
+TEI = '''<?xml version="1.0" encoding="{0}"?>
+<teiCorpus xmlns="http://www.tei-c.org/ns/1.0">
+<TEI><text><body>
+  <div1 type="ajakirjanumber">
+    <head> Number 1 </head>
+    <div2 type="rubriik"><head> Uudised </head>
+      <div3 type="artikkel"><head> Esimene <gap/> lugu </head>
+        <p> <bibl> <author> <s> Mari Maasikas </s> </author> </bibl> </p>
+        <p> <s> Esimene lause . </s> <s> Teine <hi rend="kaldkiri">lause</hi> . </s> </p>
+        <p> <s> </s> </p>
+      </div3>
+    </div2>
+    <div2 type="artikkel"><head> Õun </head>
+      <p> <s> Kolmas lause . </s> </p>
+      <div3 type="artikkel"><head> Sees </head><p> <s> Neljas lause . </s> </p></div3>
+    </div2>
+  </div1>
+</body></text></TEI>
+</teiCorpus>
+'''
+
 
 class TeiTest(unittest.TestCase):
 
     def test_parse_tei(self):
         docs = parse_tei_corpora(AA_PATH, 'tea_AA_00')
         self.assertEqual(53, len(docs))
+
+    def test_yield_tei_with_processes(self):
+        docs = yield_tei_corpora(AA_PATH, 'tea_AA_00', processes=2)
+        self.assertIsInstance(docs, types.GeneratorType)
+        self.assertListEqual(parse_tei_corpora(AA_PATH, 'tea_AA_00'), list(docs))
+
+    def test_same_as_beautifulsoup(self):
+        for fnm in get_filenames(AA_PATH, '', '.xml'):
+            path = os.path.join(AA_PATH, fnm)
+            self.assertListEqual(parse_with_beautifulsoup(path, ['artikkel']), list(yield_tei_corpus(path)))
+
+
+def parse_with_beautifulsoup(path, target):
+    # the parsing of the files before the incremental parser
+    with open(path, 'rb') as f:
+        soup = BeautifulSoup(f.read().decode('utf-8'), 'html5lib')
+    documents = []
+    for div1 in soup.find_all('div1'):
+        documents.extend(parse_div(div1, dict(), target))
+    return tokenize_documents(documents)
+
+
+class TeiStructureTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_structure(self):
+        first, second = yield_tei_corpus(self.write('utf-8'))
+        self.assertEqual('Esimene', first['title'])
+        self.assertEqual('Mari Maasikas', first['author'])
+        self.assertEqual('Number 1', first['ajakirjanumber'])
+        self.assertEqual('Uudised', first['rubriik'])
+        self.assertEqual('Mari Maasikas\n\nEsimene lause .\nTeine lause .', first[TEXT])
+        self.assertEqual('Õun', second['title'])
+        self.assertNotIn('rubriik', second)
+        self.assertNotIn('author', second)
+        self.assertEqual('Kolmas lause .\n\nNeljas lause .', second[TEXT])
+
+    def test_encoding(self):
+        docs = list(yield_tei_corpus(self.write('iso-8859-15')))
+        self.assertEqual('Õun', docs[1]['title'])
+
+    def write(self, encoding):
+        fnm = os.path.join(self.tmpdir, 'corpus.xml')
+        with open(fnm, 'wb') as f:
+            f.write(TEI.format(encoding).encode(encoding))
+        return fnm
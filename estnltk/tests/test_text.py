@@ -3,7 +3,7 @@ from __future__ import unicode_literals, print_function, absolute_import
 
 import unittest
 
-from ..text import Text
+from ..text import Text, TextView
 from ..names import *
 from pprint import pprint
 
@@ -62,6 +62,14 @@ class TokenizationTest(unittest.TestCase):
                 self.assertFalse(s < sentence_end < e )
 
 
+    def test_pretokenized_paragraphs(self):
+        text = Text('Esimene lause. Teine lause.\n\nKolmas lause.')
+        text.tokenize_words()
+        expected = text[SENTENCES]
+        pretokenized = Text({TEXT: text[TEXT], PARAGRAPHS: text[PARAGRAPHS], WORDS: text[WORDS]})
+        self.assertListEqual(expected, pretokenized.tokenize_sentences()[SENTENCES])
+
+
 class TextSplittingTest(unittest.TestCase):
 
     def test_split_by_sentences(self):
@@ -113,6 +121,63 @@ class TextSplittingTest(unittest.TestCase):
         self.assertListEqual(expected, texts)
 
 
+class TextViewTest(unittest.TestCase):
+
+    def test_sentence_views(self):
+        text = Text('Esimene lause. Teine lause, kus Mari elab Tallinnas.')
+        text.tag_analysis()
+        views = text.sentence_views()
+        sentences = text.split_by_sentences()
+        self.assertTrue(all(isinstance(view, TextView) for view in views))
+        self.assertListEqual(sentences, views)
+        for view, sentence in zip(views, sentences):
+            self.assertListEqual(sentence.word_texts, view.word_texts)
+            self.assertListEqual(sentence.lemmas, view.lemmas)
+            self.assertListEqual(sentence.postags, view.postags)
+            self.assertListEqual(sentence.word_spans, view.word_spans)
+        self.assertEqual((15, 52), views[1].span)
+
+    def test_views_refer_to_parent(self):
+        text = Text('Esimene lause. Teine lause.')
+        text.tag_analysis()
+        view = text.sentence_views()[1]
+        self.assertEqual(1, len(dict.keys(view)))  # only the text is stored, before layers are accessed
+        self.assertIs(text.words[3][ANALYSIS], view.words[0][ANALYSIS])
+        view.words[0][START] = 1
+        self.assertEqual(15, text.words[3][START])
+
+    def test_views_of_unsorted_layer(self):
+        text = Text('Esimene lause. Teine lause.')
+        text[WORDS] = [{START: 21, END: 26, TEXT: 'lause'}, {START: 0, END: 7, TEXT: 'Esimene'}]
+        text[SENTENCES] = [{START: 0, END: 14}, {START: 15, END: 27}]
+        views = text.sentence_views()
+        # unsorted layers are divided the same way as by split_by
+        sentences = text.split_by_sentences()
+        self.assertListEqual([sentence.word_spans for sentence in sentences], [view.word_spans for view in views])
+
+
+class TaggingPlanTest(unittest.TestCase):
+
+    def test_plan(self):
+        text = Text('Mari elab Tallinnas.')
+        self.assertListEqual([PARAGRAPHS, SENTENCES, WORDS, ANALYSIS, LABEL, NAMED_ENTITIES, CLAUSE_ANNOTATION, CLAUSES],
+                             text.tagging_plan([NAMED_ENTITIES, CLAUSES]))
+        text.tag_analysis()
+        self.assertListEqual([TIMEXES], text.tagging_plan([WORDS, TIMEXES]))
+
+    def test_unknown_layer(self):
+        self.assertRaises(ValueError, Text('Mari elab.').tagging_plan, ['unknown'])
+
+    def test_tag_layers(self):
+        text = Text('Mari elab Tallinnas.')
+        timings = {}
+        text.tag_layers([CLAUSES], timings=timings)
+        self.assertTrue(text.is_tagged(CLAUSES))
+        self.assertFalse(text.is_tagged(NAMED_ENTITIES))
+        self.assertListEqual(sorted([PARAGRAPHS, SENTENCES, WORDS, ANALYSIS, CLAUSE_ANNOTATION, CLAUSES]), sorted(timings))
+        self.assertListEqual([], text.tagging_plan([CLAUSES]))
+
+
 class TextDivideTest(unittest.TestCase):
 
     def test_divide(self):
@@ -126,6 +191,24 @@ class TextDivideTest(unittest.TestCase):
         divisions[2][1]['text'] = 'LAUSE'
         self.assertEqual(text.words[7]['text'], 'LAUSE')
 
+    def test_memoized(self):
+        text = self.text.tokenize_words()
+        divisions = text.divide()
+        self.assertIs(divisions, text.divide())
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1}, text.division_cache_info())
+
+    def test_memo_invalidated(self):
+        text = self.text.tokenize_words()
+        divisions = text.divide()
+        text[SENTENCES] = [{START: 0, END: 27}, {START: 28, END: 41}]
+        self.assertEqual(0, text.division_cache_info()['size'])
+        self.assertListEqual([6, 3], [len(sentence) for sentence in text.divide()])
+        # a layer replaced with a dict method is detected as well
+        dict.update(text, {WORDS: text[WORDS][:4]})
+        self.assertListEqual([4, 0], [len(sentence) for sentence in text.divide()])
+        self.assertIsNot(divisions, text.divide())
+        self.assertEqual(3, text.division_cache_info()['misses'])
+
     @property
     def text(self):
         return Text('Esimene lause. Teine lause. Kolmas lause!')
@@ -4,6 +4,8 @@ from __future__ import unicode_literals, print_function, absolute_import
 import unittest
 import datetime
 import codecs
+import threading
+import time
 
 from ..text import Text
 from ..timex import TimexTagger
@@ -131,6 +133,82 @@ class TimexTest(unittest.TestCase):
         timextagger._process.terminate()
 
 
+    def test_worker_pool(self):
+        from multiprocessing.pool import ThreadPool
+        creation = datetime.datetime(1986, 12, 21)
+        single = TimexTagger()
+        expected = [Text(example, creation_date=creation, timex_tagger=single).timexes
+                    for example in self.examples]
+        single.close()
+        pooled = TimexTagger(workers=2)
+        tag = lambda example: Text(example, creation_date=creation, timex_tagger=pooled).timexes
+        threads = ThreadPool(4)
+        self.assertListEqual(threads.map(tag, self.examples), expected)
+        threads.terminate()
+        stats = pooled.stats()
+        self.assertEqual(len(stats), 2)
+        self.assertEqual(sum(worker['requests'] for worker in stats), len(self.examples))
+        self.assertListEqual([(worker['queue_depth'], worker['pool_queue_depth']) for worker in stats],
+                             [(0, 0), (0, 0)])
+        # dead workers are restarted
+        pooled._pool.workers[0]._process.kill()
+        pooled._pool.workers[0]._process.wait()
+        self.assertFalse(pooled.is_alive())
+        self.assertEqual(pooled._pool.health_check(), 1)
+        self.assertTrue(pooled.is_alive())
+        self.assertListEqual(tag(self.examples[0]), expected[0])
+        pooled.close()
+
+
+    def test_queue_depth(self):
+        tagger = TimexTagger()
+        document = Text(self.examples[0]).tag_analysis()
+        line = tagger._prepare_input(document)
+        # keep the tagger busy, so that the next requests have to wait
+        tagger._lock.acquire()
+        waiting = [threading.Thread(target=tagger.process_line, args=(line, )) for _ in range(2)]
+        for thread in waiting:
+            thread.start()
+        for _ in range(100):
+            if tagger.queue_depth == 2:
+                break
+            time.sleep(0.05)
+        self.assertEqual(tagger.stats()[0]['queue_depth'], 2)
+        tagger._lock.release()
+        for thread in waiting:
+            thread.join()
+        self.assertEqual(tagger.stats()[0]['queue_depth'], 0)
+        self.assertEqual(tagger.stats()[0]['requests'], 2)
+        tagger.close()
+
+    def test_tag_documents(self):
+        creation = datetime.datetime(1986, 12, 21)
+        single = TimexTagger()
+        expected = [Text(example, creation_date=creation, timex_tagger=single).timexes
+                    for example in self.examples]
+        # stop reading in the middle, the rest of the written documents must not leak into the next call
+        threads = []
+
+        def texts():
+            for example in self.examples:
+                threads.append(threading.current_thread())
+                yield Text(example)
+
+        documents = single.tag_documents(texts(), batch_size=5, creation_date=creation)
+        self.assertListEqual(next(documents)[TIMEXES], expected[0])
+        # the tagger is reserved for the unfinished generator
+        self.assertRaises(RuntimeError, Text('Täna on reede.', timex_tagger=single).tag_timexes)
+        documents.close()
+        self.assertListEqual(threads, [threading.current_thread()] * len(threads))
+        self.assertListEqual(single.tag_document(Text(self.examples[0]).tag_analysis(), creation_date=creation)[TIMEXES],
+                             expected[0])
+        for tagger in [single, TimexTagger(workers=2)]:
+            documents = tagger.tag_documents((Text(example) for example in self.examples), batch_size=3,
+                                             creation_date=creation)
+            self.assertListEqual([document[TIMEXES] for document in documents], expected)
+            tagger.close()
+
+
 
 def timex_to_row(example, timex):
     toks = [example]
@@ -36,6 +36,41 @@ class InternalSynsetOffsetQueryTest(unittest.TestCase):
     
     self.assertTrue(all(offset in result for offset in [idx_offset_pair[1] for idx_offset_pair in idx_offset_pairs]))    
 
+class IndexQueryTest(unittest.TestCase):
+
+  def setUp(self):
+    self.index = wn._get_index()
+    self.assertIsNotNone(self.index)
+
+  def test_offsets_match_soi_file(self):
+    idx_offset_pairs = [(1,111),(4967,12606307),(12672,26079737),(34800,58069170),(65518,91684951)]
+
+    self.assertListEqual([self.index.synset_offset(idx) for idx,_ in idx_offset_pairs],[offset for _,offset in idx_offset_pairs])
+    self.assertIsNone(self.index.synset_offset(10**9))
+
+  def test_offsets_match_text_scan(self):
+    idxes = [7,5421,21450,41785]
+    wn.USE_INDEX = False
+    try:
+      expected = wn._get_synset_offsets(idxes)
+    finally:
+      wn.USE_INDEX = True
+    self.assertListEqual(wn._get_synset_offsets(idxes),expected)
+
+  def test_unknown_offset_same_as_text_scan(self):
+    wn.USE_INDEX = False
+    try:
+      self.assertRaises(KeyError,wn._get_synset_offsets,[10**9])
+    finally:
+      wn.USE_INDEX = True
+    self.assertRaises(KeyError,wn._get_synset_offsets,[10**9])
+
+  def test_synset_idxes(self):
+    self.assertListEqual(self.index.synset_idxes('koer'),[267,63803])
+    self.assertListEqual(self.index.synset_idxes('0-tüüpi grammatika','n'),[44950])
+    self.assertListEqual(self.index.synset_idxes('0-tüüpi grammatika','v'),[])
+    self.assertListEqual(self.index.synset_idxes('0-tüüpi'),[])
+
 class SynsetKeyTest(unittest.TestCase):
   
   def test_key_derivation(self):
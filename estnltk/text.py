@@ -11,23 +11,19 @@ from .core import as_unicode, POSTAG_DESCRIPTIONS, CASES, PLURALITY, VERB_TYPES
 from .core import VERB_CHAIN_RES_PATH
 from .names import *
 from .dividing import divide, divide_by_spans
+from .columnar import ColumnarLayer, LAYER_TYPES
 from .vabamorf import morf as vabamorf
-from .ner import NerTagger
-from .timex import TimexTagger
-from .wordnet_tagger import WordnetTagger
-from .clausesegmenter import ClauseSegmenter
-from .mw_verbs.verbchain_detector import VerbChainDetector
 from .textcleaner import TextCleaner
 from .tokenizers import EstWordTokenizer
-from .syntax import MaltParser, VISLCG3Parser, build_trees_from_text
 
 import six
-import pandas
+import time
 import nltk.data
 import regex as re
 from nltk.tokenize.regexp import RegexpTokenizer
 
 from cached_property import cached_property
+from bisect import bisect_left, bisect_right
 from copy import deepcopy
 from collections import defaultdict
 from pprint import pprint
@@ -36,17 +32,7 @@ from pprint import pprint
 # default functionality
 paragraph_tokenizer = RegexpTokenizer('\n\n', gaps=True, discard_empty=True)
 
-# use NLTK-s sentence tokenizer for Estonian, in case it is not downloaded, try to download it first
 sentence_tokenizer = None
-try:
-    sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
-except LookupError:
-    import nltk.downloader
-    nltk.downloader.download('punkt')
-finally:
-    if sentence_tokenizer is None:
-        sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
-
 word_tokenizer = EstWordTokenizer()
 nertagger = None
 timextagger = None
@@ -57,9 +43,23 @@ wordnet_tagger = None
 syntactic_parser = None
 
 
+def load_default_sentence_tokenizer():
+    # use NLTK-s sentence tokenizer for Estonian, in case it is not downloaded, try to download it first
+    global sentence_tokenizer
+    if sentence_tokenizer is None:
+        try:
+            sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
+        except LookupError:
+            from nltk import downloader
+            downloader.download('punkt')
+            sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
+    return sentence_tokenizer
+
+
 def load_default_ner_tagger():
     global nertagger
     if nertagger is None:
+        from .ner import NerTagger
         nertagger = NerTagger()
     return nertagger
 
@@ -67,6 +67,7 @@ def load_default_ner_tagger():
 def load_default_timex_tagger():
     global timextagger
     if timextagger is None:
+        from .timex import TimexTagger
         timextagger = TimexTagger()
     return timextagger
 
@@ -74,6 +75,7 @@ def load_default_timex_tagger():
 def load_default_clausesegmenter():
     global clausesegmenter
     if clausesegmenter is None:
+        from .clausesegmenter import ClauseSegmenter
         clausesegmenter = ClauseSegmenter()
     return clausesegmenter
 
@@ -81,6 +83,7 @@ def load_default_clausesegmenter():
 def load_default_verbchain_detector():
     global verbchain_detector
     if verbchain_detector is None:
+        from .mw_verbs.verbchain_detector import VerbChainDetector
         verbchain_detector = VerbChainDetector(resourcesPath=VERB_CHAIN_RES_PATH)
     return verbchain_detector
 
@@ -88,10 +91,80 @@ def load_default_verbchain_detector():
 def load_default_syntactic_parser():
     global syntactic_parser
     if syntactic_parser is None:
+        from .syntax import MaltParser
         syntactic_parser = MaltParser()
     return syntactic_parser
 
 
+# the layers that must be tagged before a layer can be tagged
+LAYER_DEPENDENCIES = {
+    PARAGRAPHS: (),
+    SENTENCES: (PARAGRAPHS, ),
+    WORDS: (SENTENCES, ),
+    ANALYSIS: (WORDS, ),
+    LABEL: (ANALYSIS, ),
+    NAMED_ENTITIES: (LABEL, ),
+    TIMEXES: (ANALYSIS, ),
+    CLAUSE_ANNOTATION: (ANALYSIS, ),
+    CLAUSES: (CLAUSE_ANNOTATION, ),
+    VERB_CHAINS: (CLAUSES, ),
+    WORDNET: (ANALYSIS, ),
+    # the syntactic parsers choose the disambiguation of the morphological analysis themselves
+    LAYER_CONLL: (WORDS, ),
+    LAYER_VISLCG3: (WORDS, ),
+}
+
+
+def analyze_texts(texts, batch_size=None, **kwargs):
+    """Tag ``words`` layers of several :py:class:`~estnltk.text.Text` instances with
+    morphological analysis attributes.
+
+    Sentences of all texts are analyzed with batched calls to the vabamorf library
+    (see :py:func:`estnltk.vabamorf.morf.analyze_sentences`) instead of one call per sentence.
+    Sentence boundaries are preserved and each text is analyzed with its own options,
+    so the results are the same as with :py:meth:`Text.tag_analysis`.
+
+    Parameters
+    ----------
+    texts: list of Text
+        The texts to be analyzed. Words are tokenized first, if necessary.
+    batch_size: int
+        Maximum number of sentences sent to vabamorf in a single call (default: no limit).
+    kwargs:
+        Analysis options passed to :py:func:`estnltk.vabamorf.morf.analyze_sentences`.
+        They override the options of the texts.
+
+    Returns
+    -------
+    list of Text
+        The input texts.
+    """
+    texts = list(texts)
+    # the sentences of the texts with equal options are analyzed together
+    groups = []
+    for text in texts:
+        if not text.is_tagged(WORDS):
+            text.tokenize_words()
+        options = dict(text.get_kwargs(), **kwargs)
+        for group_options, group_sentences in groups:
+            if group_options == options:
+                break
+        else:
+            group_sentences = []
+            groups.append((options, group_sentences))
+        group_sentences.extend(text.divide(WORDS, SENTENCES))
+    for options, sentences in groups:
+        size = batch_size or max(len(sentences), 1)
+        for batch_start in range(0, len(sentences), size):
+            batch = sentences[batch_start:batch_start+size]
+            all_analysis = vabamorf.analyze_sentences([[word[TEXT] for word in sentence] for sentence in batch], **options)
+            for sentence, sentence_analysis in zip(batch, all_analysis):
+                for word, analysis in zip(sentence, sentence_analysis):
+                    word[ANALYSIS] = analysis[ANALYSIS]
+                    word[TEXT] = analysis[TEXT]
+    return texts
+
+
 class Text(dict):
     """Central class of Estnltk that is the main interface of performing
     all NLP operations.
@@ -130,6 +203,9 @@ class Text(dict):
             Either VISLCG3 based syntactic analyser or MaltParser.
         """
         encoding = kwargs.get('encoding', 'utf-8')
+        self.__divisions = {}
+        self.__division_hits = 0
+        self.__division_misses = 0
         if isinstance(text_or_instance, dict):
             super(Text, self).__init__(text_or_instance)
             self[TEXT] = as_unicode(self[TEXT], encoding)
@@ -142,8 +218,8 @@ class Text(dict):
     def __load_functionality(self, **kwargs):
         self.__paragraph_tokenizer = kwargs.get(
             'paragraph_tokenizer', paragraph_tokenizer)
-        self.__sentence_tokenizer = kwargs.get(
-            'sentence_tokenizer', sentence_tokenizer)
+        self.__sentence_tokenizer = kwargs.get( # punkt model is loaded on the first sentence tokenization
+            'sentence_tokenizer', None)
         self.__word_tokenizer = kwargs.get(
             'word_tokenizer', word_tokenizer)
         self.__ner_tagger = kwargs.get( # ner models take time to load, load only when needed
@@ -161,6 +237,14 @@ class Text(dict):
         self.__text_cleaner = kwargs.get('text_cleaner', textcleaner)
         self.__syntactic_parser = kwargs.get('syntactic_parser', syntactic_parser)
 
+    def __setitem__(self, key, value):
+        super(Text, self).__setitem__(key, value)
+        self.__invalidate_divisions(key)
+
+    def __delitem__(self, key):
+        super(Text, self).__delitem__(key)
+        self.__invalidate_divisions(key)
+
     def get_kwargs(self):
         """Get the keyword arguments that were passed to the :py:class:`~estnltk.text.Text` when it was constructed."""
         return self.__kwargs
@@ -194,7 +278,73 @@ class Text(dict):
 
     def tag_all(self):
         """Tag all layers."""
-        return self.tag_timexes().tag_named_entities().tag_verb_chains()
+        return self.tag_layers([TIMEXES, NAMED_ENTITIES, VERB_CHAINS])
+
+    def tagging_plan(self, layers):
+        """Compute the layers that must be tagged to obtain the given layers.
+
+        Only the layers that are not tagged yet are included, the layers they depend on
+        (see ``LAYER_DEPENDENCIES``) come before them.
+
+        Parameters
+        ----------
+        layers: list of str
+            The names of the required layers.
+
+        Returns
+        -------
+        list of str
+            The layers to be tagged in the order of tagging.
+
+        Raises
+        ------
+        ValueError
+            If a layer has no tagger.
+        """
+        mapping = self.layer_tagger_mapping
+        plan = []
+
+        def visit(layer):
+            if layer in plan or self.is_tagged(layer):
+                return
+            if layer not in mapping:
+                raise ValueError('No tagger for layer <{0}>!'.format(layer))
+            for dependency in LAYER_DEPENDENCIES.get(layer, ()):
+                visit(dependency)
+            plan.append(layer)
+
+        for layer in layers:
+            visit(layer)
+        return plan
+
+    def tag_layers(self, layers, timings=None):
+        """Tag the given layers and the layers they depend on.
+
+        Each missing layer is tagged once, in the order given by :py:meth:`~estnltk.text.Text.tagging_plan`.
+        The taggers share the division of words into sentences (see :py:meth:`~estnltk.text.Text.divide`).
+
+        Parameters
+        ----------
+        layers: list of str
+            The names of the required layers.
+        timings: dict
+            If given, the time (in seconds) spent on tagging each layer is added to it.
+
+        Returns
+        -------
+        Text
+            This text instance.
+        """
+        mapping = self.layer_tagger_mapping
+        for layer in self.tagging_plan(layers):
+            # a tagger may have created a later layer as a side effect
+            if self.is_tagged(layer):
+                continue
+            start = time.time()
+            mapping[layer]()
+            if timings is not None:
+                timings[layer] = timings.get(layer, 0.0) + time.time() - start
+        return self
 
     def texts(self, layer, sep=' '):
         """Retrieve texts for given layer.
@@ -243,22 +393,31 @@ class Text(dict):
         list of (int, int)
             List of (start, end) tuples.
         """
+        elems = self[layer]
+        if isinstance(elems, ColumnarLayer):
+            return list(zip(elems.starts, elems.ends))
         spans = []
-        for data in self[layer]:
+        for data in elems:
             spans.append((data[START], data[END]))
         return spans
 
     def starts(self, layer):
         """Retrieve start positions of elements if given layer."""
+        elems = self[layer]
+        if isinstance(elems, ColumnarLayer):
+            return list(elems.starts)
         starts = []
-        for data in self[layer]:
+        for data in elems:
             starts.append(data[START])
         return starts
 
     def ends(self, layer):
         """Retrieve end positions of elements if given layer."""
+        elems = self[layer]
+        if isinstance(elems, ColumnarLayer):
+            return list(elems.ends)
         ends = []
-        for data in self[layer]:
+        for data in elems:
             ends.append(data[END])
         return ends
 
@@ -350,12 +509,14 @@ class Text(dict):
             SENTENCES: self.tokenize_sentences,
             WORDS: self.tokenize_words,
             ANALYSIS: self.tag_analysis,
+            LABEL: self.tag_labels,
             TIMEXES: self.tag_timexes,
             NAMED_ENTITIES: self.tag_named_entities,
             CLAUSE_ANNOTATION: self.tag_clause_annotations,
             CLAUSES: self.tag_clauses,
-            LAYER_CONLL:   self.tag_syntax_vislcg3,
-            LAYER_VISLCG3: self.tag_syntax_maltparser,
+            VERB_CHAINS: self.tag_verb_chains,
+            LAYER_CONLL:   self.tag_syntax_maltparser,
+            LAYER_VISLCG3: self.tag_syntax_vislcg3,
             WORDNET: self.tag_wordnet
         }
 
@@ -419,13 +580,20 @@ class Text(dict):
         """
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
+        if self.__sentence_tokenizer is None:
+            self.__sentence_tokenizer = load_default_sentence_tokenizer()
         tok  = self.__sentence_tokenizer
         text = self.text
         dicts = []
+        has_words = self.is_tagged(WORDS)
+        if has_words:
+            words = self[WORDS]
+            word_starts = self.starts(WORDS)
+            words_sorted = all(a <= b for a, b in zip(word_starts, word_starts[1:]))
         for paragraph in self[PARAGRAPHS]:
             para_start, para_end = paragraph[START], paragraph[END]
             para_text = text[para_start:para_end]
-            if not self.is_tagged(WORDS):
+            if not has_words:
                 # Non-hack variant: word tokenization has not been applied yet,
                 # so we proceed in natural order (first sentences, then words)
                 spans = tok.span_tokenize(para_text)
@@ -434,8 +602,14 @@ class Text(dict):
             else:
                 # A hack variant: word tokenization has already been made, so
                 # we try to use existing word tokenization (first words, then sentences)
-                para_words = \
-                    [ w for w in self[WORDS] if w[START]>=para_start and w[END]<=para_end ]
+                if words_sorted:
+                    # find the words of the paragraph by binary search, instead of scanning all words
+                    para_words = \
+                        [ w for w in words[bisect_left(word_starts, para_start):bisect_right(word_starts, para_end)] \
+                          if w[END]<=para_end ]
+                else:
+                    para_words = \
+                        [ w for w in words if w[START]>=para_start and w[END]<=para_end ]
                 para_word_texts = \
                     [ w[TEXT] for w in para_words ]
                 try:
@@ -464,18 +638,19 @@ class Text(dict):
                     sentenceDict = \
                         {'start': firstToken[START], 'end': lastToken[END]}
                     dicts.append( sentenceDict )
-                # Note: We also need to invalidate the cached properties providing the
-                #       sentence information, as otherwise, if the properties have been
-                #       called already, new calls would return the old state of sentence 
-                #       tokenization;
-                for sentence_attrib in ['sentences', 'sentence_texts', 'sentence_spans', \
-                                        'sentence_starts', 'sentence_ends']:
-                    try:
-                        # invalidate the cache
-                        delattr(self, sentence_attrib)
-                    except AttributeError:
-                        # it's ok, if the cached property has not been called yet
-                        pass
+        if has_words:
+            # Note: We also need to invalidate the cached properties providing the
+            #       sentence information, as otherwise, if the properties have been
+            #       called already, new calls would return the old state of sentence 
+            #       tokenization;
+            for sentence_attrib in ['sentences', 'sentence_texts', 'sentence_spans', \
+                                    'sentence_starts', 'sentence_ends']:
+                try:
+                    # invalidate the cache
+                    delattr(self, sentence_attrib)
+                except AttributeError:
+                    # it's ok, if the cached property has not been called yet
+                    pass
         self[SENTENCES] = dicts
         return self
 
@@ -538,10 +713,10 @@ class Text(dict):
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         sentences = self.divide(WORDS, SENTENCES)
-        for sentence in sentences:
-            texts = [word[TEXT] for word in sentence]
-            all_analysis = vabamorf.analyze(texts, **self.__kwargs)
-            for word, analysis in zip(sentence, all_analysis):
+        texts = [[word[TEXT] for word in sentence] for sentence in sentences]
+        all_analysis = vabamorf.analyze_sentences(texts, **self.__kwargs)
+        for sentence, sentence_analysis in zip(sentences, all_analysis):
+            for word, analysis in zip(sentence, sentence_analysis):
                 word[ANALYSIS] = analysis[ANALYSIS]
                 word[TEXT] = analysis[TEXT]
         return self
@@ -558,6 +733,8 @@ class Text(dict):
         """The list of words representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
+        if isinstance(self[WORDS], ColumnarLayer):
+            return self[WORDS].values(TEXT)
         return [word[TEXT] for word in self[WORDS]]
 
     @cached_property
@@ -593,6 +770,9 @@ class Text(dict):
         for dict in dicts:
             if element in dict:
                 matches.append(dict[element])
+        return self.__join_matches(matches, element, sep)
+
+    def __join_matches(self, matches, element, sep):
         if len(matches) == 1:
             return matches[0]
         elif len(matches) > 1:
@@ -612,7 +792,10 @@ class Text(dict):
             As morphological analysis cannot always yield unambiguous results, we
             return ambiguous values separated by the pipe character as default.
         """
-        return [self.__get_key(word[ANALYSIS], element, sep) for word in self.words]
+        words = self.words
+        if isinstance(words, ColumnarLayer):
+            return [self.__join_matches(matches, element, sep) for matches in words.analysis_values(element)]
+        return [self.__get_key(word[ANALYSIS], element, sep) for word in words]
 
     @cached_property
     def roots(self):
@@ -644,6 +827,8 @@ class Text(dict):
         """
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
+        if isinstance(self[WORDS], ColumnarLayer):
+            return self[WORDS].analysis_values(LEMMA)
         return [[an[LEMMA] for an in word[ANALYSIS]] for word in self[WORDS]]
 
     @cached_property
@@ -683,6 +868,8 @@ class Text(dict):
     def postag_lists(self):
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
+        if isinstance(self[WORDS], ColumnarLayer):
+            return self[WORDS].analysis_values(POSTAG)
         return [[an[POSTAG] for an in word[ANALYSIS]] for word in self[WORDS]]
 
     @cached_property
@@ -722,6 +909,7 @@ class Text(dict):
     def tag_syntax_vislcg3(self):
         """ Changes default syntactic parser to VISLCG3Parser, performs syntactic analysis,
             and stores the results in the layer named LAYER_VISLCG3."""
+        from .syntax import VISLCG3Parser
         if not self.__syntactic_parser or not isinstance(self.__syntactic_parser, VISLCG3Parser):
             self.__syntactic_parser = VISLCG3Parser()
         return self.tag_syntax()
@@ -729,6 +917,7 @@ class Text(dict):
     def tag_syntax_maltparser(self):
         """ Changes default syntactic parser to MaltParser, performs syntactic analysis,
             and stores the results in the layer named LAYER_CONLL."""
+        from .syntax import MaltParser
         if not self.__syntactic_parser or not isinstance(self.__syntactic_parser, MaltParser):
             self.__syntactic_parser = MaltParser()
         return self.tag_syntax()
@@ -738,6 +927,7 @@ class Text(dict):
             and stores the found syntactic analyses: into the layer LAYER_CONLL (if MaltParser 
             is used, default), or into the layer LAYER_VISLCG3 (if VISLCG3Parser is used).
         """
+        from .syntax import MaltParser, VISLCG3Parser
         # Load default Syntactic tagger:
         if self.__syntactic_parser is None:
             self.__syntactic_parser = load_default_syntactic_parser()
@@ -768,6 +958,7 @@ class Text(dict):
             Otherwise, the *layer* must be provided by the user and it must be 
             either LAYER_CONLL or LAYER_VISLCG3. 
         """
+        from .syntax import MaltParser, VISLCG3Parser
         # If no layer specified, decide the layer based on the type of syntactic
         # analyzer used:
         if not layer and self.__syntactic_parser:
@@ -800,12 +991,14 @@ class Text(dict):
     @cached_property
     def syntax_trees_conll(self):
         """ Return syntactic trees built from CONLL (MaltParser's) syntactic annotation. """
+        from .syntax import build_trees_from_text
         assert LAYER_CONLL in self, '(!) Missing syntactic annotations layer: '+LAYER_CONLL+'!'
         return build_trees_from_text( self, layer=LAYER_CONLL )
 
     @cached_property
     def syntax_trees_vislcg3(self):
         """ Return syntactic trees built from VISL CG3's syntactic annotations. """
+        from .syntax import build_trees_from_text
         assert LAYER_VISLCG3 in self, '(!) Missing syntactic annotations layer: '+LAYER_VISLCG3+'!'
         return build_trees_from_text( self, layer=LAYER_VISLCG3 )
 
@@ -856,7 +1049,7 @@ class Text(dict):
         """The elements of ``named_entities`` layer."""
         if not self.is_tagged(NAMED_ENTITIES):
             self.tag_named_entities()
-        phrases = self.split_by(NAMED_ENTITIES)
+        phrases = self.views(NAMED_ENTITIES)
         return [' '.join(phrase.lemmas) for phrase in phrases]
 
     @cached_property
@@ -1117,6 +1310,7 @@ class Text(dict):
         """
         global wordnet_tagger
         if wordnet_tagger is None: # cached wn tagger
+            from .wordnet_tagger import WordnetTagger
             wordnet_tagger = WordnetTagger()
         self.__wordnet_tagger = wordnet_tagger
         if len(kwargs) > 0:
@@ -1247,6 +1441,52 @@ class Text(dict):
             return isinstance(elems[0][START], list)
         return False
 
+    def compact(self, layers=None):
+        """Store layers in columns instead of lists of dicts, to reduce the memory use of large texts.
+
+        The elements of the layers can still be accessed as dicts, see :py:class:`~estnltk.columnar.ColumnarLayer`.
+        Layers of multispans cannot be stored in columns and are left as they are.
+        Use :py:meth:`~estnltk.text.Text.expand` before serializing the text.
+
+        Parameters
+        ----------
+        layers: list of str
+            The layers to store in columns (default: all simple layers).
+            Layers that are already columnar are compacted again.
+
+        Returns
+        -------
+        Text
+            This text instance.
+        """
+        if layers is None:
+            layers = [layer for layer, value in self.items() if isinstance(value, LAYER_TYPES)]
+        for layer in layers:
+            if isinstance(self[layer], ColumnarLayer) or self.is_simple(layer):
+                self[layer] = ColumnarLayer(self[layer])
+        self.__clear_cached_properties()
+        return self
+
+    def expand(self):
+        """Convert columnar layers back to lists of dicts.
+
+        Returns
+        -------
+        Text
+            This text instance.
+        """
+        for layer, value in list(self.items()):
+            if isinstance(value, ColumnarLayer):
+                self[layer] = value.to_list()
+        self.__clear_cached_properties()
+        return self
+
+    def __clear_cached_properties(self):
+        # the cached properties may refer to the replaced layers
+        for name in list(self.__dict__):
+            if isinstance(getattr(type(self), name, None), cached_property):
+                del self.__dict__[name]
+
     def tag_with_regex(self, name, pattern, flags=0):
         if name in self:
             raise ValueError('Layer or attribute with name <{0}> already exists!'.format(name))
@@ -1287,7 +1527,7 @@ class Text(dict):
         N = len(spans)
         results = [{TEXT: text} for text in self.texts_from_spans(spans, sep=sep)]
         for elem in self:
-            if isinstance(self[elem], list):
+            if isinstance(self[elem], LAYER_TYPES):
                 splits = divide_by_spans(self[elem], spans, translate=True, sep=sep)
                 for idx in range(N):
                     results[idx][elem] = splits[idx]
@@ -1318,6 +1558,38 @@ class Text(dict):
         """Split the text into individual sentences."""
         return self.split_by(SENTENCES)
 
+    def views(self, layer, sep=' '):
+        """Split the text into lightweight views defined by elements of given layer.
+
+        Unlike :py:meth:`~estnltk.text.Text.split_by`, this does not copy the layers of the text.
+        The views refer to the layers of this text and take the elements covered by their spans
+        only when a layer is first accessed. The element dictionaries are copied with translated
+        positions, but their values (e.g. the morphological analysis) are shared with this text.
+
+        If the given layer is a multilayer, this falls back to :py:meth:`~estnltk.text.Text.split_by`.
+
+        Parameters
+        ----------
+        layer: str
+            String determining the layer that is used to define the start and end positions of resulting views.
+        sep: str (default: ' ')
+            The separator to use to join texts of multilayer elements.
+
+        Returns
+        -------
+        list of TextView
+        """
+        if not self.is_tagged(layer):
+            self.tag(layer)
+        if self.is_multi(layer):
+            return self.split_by(layer, sep=sep)
+        division = LayerDivision(self, self.spans(layer), sep=sep)
+        return [TextView(self, division, idx) for idx in range(len(division.spans))]
+
+    def sentence_views(self):
+        """Split the text into lightweight views of individual sentences."""
+        return self.views(SENTENCES)
+
     def split_by_words(self):
         """Split the text into individual words."""
         return self.split_by(WORDS)
@@ -1377,6 +1649,10 @@ class Text(dict):
         by: str
             Each resulting bin is defined by spans of this element.
 
+        The result is memoized until either of the layers is reassigned, so the returned
+        lists are shared between calls and must not be modified.
+        Changing the positions of the elements in place is not detected.
+
         Returns
         -------
         list of (list of dict)
@@ -1385,7 +1661,33 @@ class Text(dict):
             self.tag(layer)
         if not self.is_tagged(by):
             self.tag(by)
-        return divide(self[layer], self[by])
+        elements, spans = self[layer], self[by]
+        cached = self.__divisions.get((layer, by))
+        # the layers may also have been replaced or extended by dict methods that bypass __setitem__
+        if cached is not None and cached[0] is elements and cached[1] is spans and cached[2] == (len(elements), len(spans)):
+            self.__division_hits += 1
+            return cached[3]
+        self.__division_misses += 1
+        bins = divide(elements, spans)
+        self.__divisions[(layer, by)] = (elements, spans, (len(elements), len(spans)), bins)
+        return bins
+
+    def division_cache_info(self):
+        """Return the statistics of memoized :py:meth:`~estnltk.text.Text.divide` results.
+
+        Returns
+        -------
+        dict
+            Dictionary with keys 'hits', 'misses' and 'size'.
+        """
+        return {'hits': self.__division_hits, 'misses': self.__division_misses, 'size': len(self.__divisions)}
+
+    def __invalidate_divisions(self, layer):
+        # unpickling sets the items before the attributes
+        divisions = self.__dict__.get('_Text__divisions')
+        if divisions:
+            for key in [key for key in divisions if layer in key]:
+                del divisions[key]
 
     # ///////////////////////////////////////////////////////////////////
     # FILTERING
@@ -1409,6 +1711,153 @@ class Text(dict):
         return ZipBuilder(self)
 
 
+class LayerDivision(object):
+    """Divides the layer elements of a text among the spans of its views.
+
+    Each layer is prepared once, when it is first accessed by any of the views.
+    Elements of simple layers that are sorted by their start positions are found with
+    binary search, other layers are divided with :py:func:`~estnltk.dividing.divide_by_spans`.
+
+    Parameters
+    ----------
+    text: Text
+        The text, whose layers are divided.
+    spans: list of (int, int)
+        The spans of the views.
+    sep: str (default: ' ')
+        The separator to use to join texts of multilayer elements.
+    """
+
+    def __init__(self, text, spans, sep=' '):
+        self.text = text
+        self.spans = spans
+        self.sep = sep
+        self.__prepared = {}
+
+    def elements(self, layer, idx):
+        """The elements of the layer covered by the span with given index.
+
+        The positions of the elements are translated according to the span.
+        """
+        elements = self.text[layer]
+        prepared = self.__prepared.get(layer)
+        if prepared is None or prepared[0] is not elements:
+            prepared = (elements, ) + self.__prepare(elements)
+            self.__prepared[layer] = prepared
+        _, starts, bins = prepared
+        if bins is not None:
+            return bins[idx]
+        start, end = self.spans[idx]
+        result = []
+        for i in range(bisect_left(starts, start), bisect_right(starts, end)):
+            elem = elements[i]
+            if elem[END] <= end:
+                elem = dict(elem)
+                elem[START] -= start
+                elem[END] -= start
+                result.append(elem)
+        return result
+
+    def __prepare(self, elements):
+        if len(elements) > 0 and isinstance(elements[0][START], int):
+            starts = [elem[START] for elem in elements]
+            if all(a <= b for a, b in zip(starts, starts[1:])):
+                return starts, None
+        return None, divide_by_spans(elements, self.spans, translate=True, sep=self.sep)
+
+
+class TextView(Text):
+    """A piece of a :py:class:`~estnltk.text.Text` that refers to the layers of the parent text.
+
+    The layers of the parent text are taken over lazily, when they are first accessed.
+    Elements are included in a layer of the view, if they are covered by the span of the view,
+    and their positions are translated according to the span. Only the element dictionaries are copied,
+    so the values of their attributes are shared with the parent text.
+
+    Views are created with :py:meth:`~estnltk.text.Text.views`.
+
+    Parameters
+    ----------
+    parent: Text
+        The text the view refers to.
+    division: LayerDivision
+        The division of the parent text's layers among the views.
+    idx: int
+        The index of the span of this view in the division.
+    """
+
+    def __init__(self, parent, division, idx):
+        self.__parent = parent
+        self.__division = division
+        self.__idx = idx
+        start, end = division.spans[idx]
+        super(TextView, self).__init__({TEXT: parent[TEXT][start:end]}, **parent.get_kwargs())
+
+    @property
+    def parent(self):
+        """The text the view refers to."""
+        return self.__parent
+
+    @property
+    def span(self):
+        """The span of the view in the parent text."""
+        return self.__division.spans[self.__idx]
+
+    def __parent_layers(self):
+        return [layer for layer, value in self.__parent.items()
+                if isinstance(value, LAYER_TYPES) and not dict.__contains__(self, layer)]
+
+    def __getitem__(self, key):
+        try:
+            return dict.__getitem__(self, key)
+        except KeyError:
+            if key == TEXT or key not in self.__parent or not isinstance(self.__parent[key], LAYER_TYPES):
+                raise
+        elements = self.__division.elements(key, self.__idx)
+        dict.__setitem__(self, key, elements)
+        return elements
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        return key != TEXT and key in self.__parent and isinstance(self.__parent[key], LAYER_TYPES)
+
+    def keys(self):
+        return list(dict.keys(self)) + self.__parent_layers()
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return dict.__len__(self) + len(self.__parent_layers())
+
+    def __eq__(self, other):
+        if isinstance(other, TextView):
+            other = dict(other.items())
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    if six.PY2:
+        def iterkeys(self):
+            return iter(self.keys())
+
+        def itervalues(self):
+            return iter(self.values())
+
+        def iteritems(self):
+            return iter(self.items())
+
+
 class ZipBuilder(object):
     """Helper class to aggregate various :py:class:`~estnltk.text.Text` properties in a simple way.
     Uses builder pattern.
@@ -1445,6 +1894,7 @@ class ZipBuilder(object):
 
     @property
     def as_dataframe(self):
+        import pandas
         df = pandas.DataFrame.from_dict(self.as_dict)
         return df[self.__keys]
 
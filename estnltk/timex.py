@@ -5,6 +5,7 @@ from .javaprocess import JavaProcess, JAVARES_PATH
 from .names import *
 
 from pprint import pprint
+from collections import deque
 
 import os
 import json
@@ -14,26 +15,83 @@ import datetime
 class TimexTagger(JavaProcess):
     """Class for extracting temporal (TIMEX) expressions."""
     
-    def __init__(self):
-        JavaProcess.__init__(self, 'Ajavt.jar', ['-pyvabamorf', '-r', os.path.join(JAVARES_PATH, 'reeglid.xml')])
+    def __init__(self, workers=1):
+        """Initialize the tagger.
+
+        Parameters
+        ----------
+        workers: int
+            The number of Java VMs running the tagger (default: 1).
+            Use more than one, if the tagger is shared between several threads.
+        """
+        JavaProcess.__init__(self, 'Ajavt.jar', ['-pyvabamorf', '-r', os.path.join(JAVARES_PATH, 'reeglid.xml')],
+                             workers=workers)
 
     def tag_document(self, document, **kwargs):
-        # get the arguments
-        remove_unnormalized_timexes = kwargs.get('remove_unnormalized_timexes', True)
+        output = json.loads(self.process_line(self._prepare_input(document, **kwargs)))
+        return self._process_output(document, output, **kwargs)
+
+    def tag_documents(self, documents, batch_size=10, **kwargs):
+        """Tag timexes of several documents.
+
+        Up to `batch_size` documents are written to the tagger before the result of the
+        first one is read, so the Java VM does not wait for the caller between the
+        documents. If the tagger has several workers, the documents are tagged concurrently.
+        The documents are taken from `documents` and prepared in the calling thread.
+
+        A tagger with a single worker is reserved for the generator until it is exhausted
+        or closed, tagging other documents with it in the meantime raises RuntimeError.
+
+        Parameters
+        ----------
+        documents: iterable of Text
+            The documents to be tagged, consumed lazily. Morphological analysis is
+            added to the documents that do not have it.
+        batch_size: int
+            The maximal number of documents sent to the tagger, but not yet yielded (default: 10).
+        kwargs:
+            The same arguments as for :py:meth:`tag_document`.
+
+        Yields
+        ------
+        Text
+            The tagged documents, in input order, each as soon as it is ready.
+        """
+        sent = deque()
+
+        def lines():
+            for document in documents:
+                if not document.is_tagged(ANALYSIS):
+                    document.tag_analysis()
+                line = self._prepare_input(document, **kwargs)
+                sent.append(document)
+                yield line
+
+        for output in self.iter_process_lines(lines(), max_in_flight=batch_size):
+            yield self._process_output(sent.popleft(), json.loads(output), **kwargs)
+
+    def _prepare_input(self, document, **kwargs):
         creation_date = kwargs.get('creation_date', datetime.datetime.now())
         creation_date = creation_date.strftime('%Y-%m-%dT%H:%M')
 
         # add creation date to document
         document[CREATION_DATE] = creation_date
 
-        # detect timexes
+        # only the positions, texts and the analysis fields read by the tagger are sent
         input_data = {
             CREATION_DATE: creation_date,
-            SENTENCES: [{WORDS: words} for words in document.divide()]
+            SENTENCES: [{WORDS: [{START: word[START],
+                                  END: word[END],
+                                  TEXT: word[TEXT],
+                                  ANALYSIS: [dict((k, analysis[k]) for k in TIMEX_ANALYSIS_FIELDS if k in analysis)
+                                             for analysis in word[ANALYSIS]]}
+                                 for word in words]}
+                        for words in document.divide()]
         }
-        output = json.loads(self.process_line(json.dumps(input_data)))
+        return json.dumps(input_data)
 
-        # process output
+    def _process_output(self, document, output, **kwargs):
+        remove_unnormalized_timexes = kwargs.get('remove_unnormalized_timexes', True)
         timexes = collect_timexes(output)
         if remove_unnormalized_timexes:
             timexes = remove_unnormalized(timexes)
@@ -47,6 +105,9 @@ class TimexTagger(JavaProcess):
         return document
 
 
+# the fields of the morphological analysis used by the timex tagger
+TIMEX_ANALYSIS_FIELDS = (ROOT, ENDING, FORM, POSTAG)
+
 RENAMING_MAP = {
     'temporalFunction': TMX_TEMP_FUNCTION,
     'anchorTimeID': TMX_ANCHOR_TID,
@@ -1,20 +1,23 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function, absolute_import
 
+import io
+import os
+import glob
 import unittest
-from ..word_tokenizer import EstWordTokenizer
-
-tokenizer = EstWordTokenizer()
+from ..word_tokenizer import EstWordTokenizer, word_tokenize, word_span_tokenize
 
 
 class WordTokenizerTest(unittest.TestCase):
 
+    tokenizer = EstWordTokenizer()
+
     def test_ordinals(self):
         text = '19. sajandil toimus 19. sajandil toimus 19.'
         expected_tokens = ['19.', 'sajandil', 'toimus', '19.', 'sajandil', 'toimus', '19.']
         expected_spans = [(0, 3), (4, 12), (13, 19), (20, 23), (24, 32), (33, 39), (40, 43)]
 
-        tokens, spans = tokenizer.tokenize(text), tokenizer.span_tokenize(text)
+        tokens, spans = self.tokenizer.tokenize(text), self.tokenizer.span_tokenize(text)
 
         self.assertListEqual(expected_tokens, tokens)
         self.assertListEqual(expected_spans, spans)
@@ -24,7 +27,7 @@ class WordTokenizerTest(unittest.TestCase):
         expected_tokens = ['25-26', 'D-vitaamini', 'esma-', 'ja', '-järel', '8.-12.']
         expected_spans = [(0, 5), (6, 17), (18, 23), (24, 26), (27, 33), (34, 40)]
 
-        tokens, spans = tokenizer.tokenize(text), tokenizer.span_tokenize(text)
+        tokens, spans = self.tokenizer.tokenize(text), self.tokenizer.span_tokenize(text)
 
         self.assertListEqual(expected_tokens, tokens)
         self.assertListEqual(expected_spans, spans)
@@ -36,7 +39,7 @@ class WordTokenizerTest(unittest.TestCase):
         expected_tokens = ['25­26', 'D—vitaamini', 'esma–', 'ja', '−järel', '8.—12.']
         expected_spans = [(0, 5), (6, 17), (18, 23), (24, 26), (27, 33), (34, 40)]
         
-        tokens, spans = tokenizer.tokenize(text), tokenizer.span_tokenize(text)
+        tokens, spans = self.tokenizer.tokenize(text), self.tokenizer.span_tokenize(text)
         
         self.assertListEqual(expected_tokens, tokens)
         self.assertListEqual(expected_spans, spans)
@@ -46,7 +49,7 @@ class WordTokenizerTest(unittest.TestCase):
         expected_tokens = ['3.14', '3,14', '3/4']
         expected_spans = [(0, 4), (5, 9), (10, 13)]
 
-        tokens, spans = tokenizer.tokenize(text), tokenizer.span_tokenize(text)
+        tokens, spans = self.tokenizer.tokenize(text), self.tokenizer.span_tokenize(text)
 
         self.assertListEqual(expected_tokens, tokens)
         self.assertListEqual(expected_spans, spans)
@@ -56,7 +59,7 @@ class WordTokenizerTest(unittest.TestCase):
         expected_tokens = ['v.a', 'dekaan', 'M.', 'Munak', 'XI', 'sajandist', 'e.Kr', 'm.a.j']
         expected_spans = [(0, 3), (4, 10), (11, 13), (14, 19), (20, 22), (23, 32), (33, 37), (38, 43)]
         
-        tokens, spans = tokenizer.tokenize(text), tokenizer.span_tokenize(text)
+        tokens, spans = self.tokenizer.tokenize(text), self.tokenizer.span_tokenize(text)
 
         self.assertListEqual(expected_tokens, tokens)
         self.assertListEqual(expected_spans, spans)
@@ -65,13 +68,26 @@ class WordTokenizerTest(unittest.TestCase):
         text1 = 'Iga päev teeme valikuid.Valime kõike.'
         expected_tokens = ['Iga', 'päev', 'teeme', 'valikuid', '.', 'Valime', 'kõike', '.']
         expected_spans  = [(0, 3), (4, 8), (9, 14), (15, 23), (23, 24), (24, 30), (31, 36), (36, 37)]
-        tokens, spans = tokenizer.tokenize(text1), tokenizer.span_tokenize(text1)
+        tokens, spans = self.tokenizer.tokenize(text1), self.tokenizer.span_tokenize(text1)
         self.assertListEqual(expected_tokens, tokens)
         self.assertListEqual(expected_spans, spans)
         
         text2 = 'Ja siis veel ühe.Ja veel ühe.'
         expected_tokens = ['Ja', 'siis', 'veel', 'ühe', '.', 'Ja', 'veel', 'ühe', '.'] 
         expected_spans  = [(0, 2), (3, 7), (8, 12), (13, 16), (16, 17), (17, 19), (20, 24), (25, 28), (28, 29)]
-        tokens, spans = tokenizer.tokenize(text2), tokenizer.span_tokenize(text2)
+        tokens, spans = self.tokenizer.tokenize(text2), self.tokenizer.span_tokenize(text2)
         self.assertListEqual(expected_tokens, tokens)
         self.assertListEqual(expected_spans, spans)
+
+
+class SinglePassWordTokenizerTest(WordTokenizerTest):
+
+    tokenizer = EstWordTokenizer(single_pass=True)
+
+    def test_same_as_word_tokenize(self):
+        examples = os.path.join(os.path.dirname(__file__), '..', '..', 'wiki', 'text-examples', '*.txt')
+        for fnm in glob.glob(examples):
+            text = io.open(fnm, encoding='utf-8').read()
+            self.assertListEqual(word_tokenize(text)[1], word_span_tokenize(text))
+        text = '19.-20. sajand, e.m.a 3,14-4/5 E.Kr. -- a.-b. M.M. x.Y-z ' * 3
+        self.assertListEqual(word_tokenize(text)[1], word_span_tokenize(text))
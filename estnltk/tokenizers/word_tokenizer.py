@@ -12,6 +12,11 @@ following cases:
 - name abbreviations:  E. Talvik ; M. Unt
 
 See https://github.com/estnltk/estnltk/issues/25 for more info.
+
+With ``EstWordTokenizer(single_pass=True)``, the tokens are joined in a single pass over the
+matches of the token pattern, with the same results. The modes can be compared with::
+
+    python -m estnltk.tokenizers.word_tokenizer
 """
 from __future__ import unicode_literals, print_function, absolute_import
 
@@ -20,11 +25,15 @@ from nltk.tokenize.api import StringTokenizer
 
 from estnltk.textcleaner import EST_ALPHA, EST_ALPHA_UPPER
 
+import re as stdlib_re
 import regex as re
 
 wptokenizer = WordPunctTokenizer()
 digits = re.compile('\d+')
 
+# the pattern and flags of WordPunctTokenizer
+token_pattern = stdlib_re.compile(r'\w+|[^\w\s]+', stdlib_re.UNICODE | stdlib_re.MULTILINE | stdlib_re.DOTALL)
+
 #  Listing of different hypen/minus/dash symbols in utf8;
 #  It is likely that these symbols are used interchangeably with the regular hypen symbol;
 hypens_dashes = re.compile('^(-|\xad|\u2212|\uFF0D|\u02D7|\uFE63|\u002D|\u2010|\u2011|\u2012|\u2013|\u2014|\u2015|\u2212)$')
@@ -76,6 +85,11 @@ def join_fraction(left, middle, right):
 bi_rules = [join_ordinals, join_hyphen, join_name_abbreviation]
 tri_rules = [join_range, join_fraction, join_abbreviation]
 
+# The tokens, one of which a rule requires to be present in the window.
+# As joined tokens are never among them, only the tokens of WordPunctTokenizer can be.
+HYPHENS = frozenset('-\xad\u2212\uFF0D\u02D7\uFE63\u002D\u2010\u2011\u2012\u2013\u2014\u2015\u2212')
+TRI_MIDDLES = HYPHENS | frozenset(['.-', ',', '.', '/']) | frozenset('.' + hyphen for hyphen in HYPHENS)
+
 
 def apply_rules(tokens, spans, n, rules):
     res_tokens, res_spans = [], []
@@ -109,10 +123,89 @@ def word_tokenize(text):
     return tokens, spans
 
 
+def word_span_tokenize(text):
+    """Compute the spans of the same tokens as :py:func:`word_tokenize`, in a single pass.
+
+    The tri-rules and bi-rules are applied as the matches of the token pattern come in.
+    A span is passed on from the tri-rules to the bi-rules, and from the bi-rules to the result,
+    as soon as no later window can include it. The rules are only called for windows that
+    contain a token they require (see ``TRI_MIDDLES`` and ``HYPHENS``).
+
+    Returns
+    -------
+    list of (int, int)
+        The spans of the tokens.
+    """
+    tri, bi, spans = [], [], []
+
+    def push_bi(span):
+        bi.append(span)
+        if len(bi) == 2:
+            (ls, le), (rs, re_) = bi
+            if le == rs:
+                left, right = text[ls:le], text[rs:re_]
+                if right == '.' or right in HYPHENS or left in HYPHENS:
+                    for rule in bi_rules:
+                        if rule(left, right):
+                            bi[:] = [(ls, re_)]
+                            return
+            spans.append(bi.pop(0))
+
+    for match in token_pattern.finditer(text):
+        tri.append(match.span())
+        if len(tri) == 3:
+            (ls, le), (ms, me), (rs, re_) = tri
+            if le == ms and me == rs:
+                middle = text[ms:me]
+                if middle in TRI_MIDDLES:
+                    left, right = text[ls:le], text[rs:re_]
+                    if any(rule(left, middle, right) for rule in tri_rules):
+                        tri[:] = [(ls, re_)]
+                        continue
+            push_bi(tri.pop(0))
+    for span in tri:
+        push_bi(span)
+    spans.extend(bi)
+    return spans
+
+
 class EstWordTokenizer(StringTokenizer):
+    """Estonian word tokenizer.
+
+    Parameters
+    ----------
+    single_pass: bool
+        Use :py:func:`word_span_tokenize` instead of :py:func:`word_tokenize` (default: False).
+    """
+
+    def __init__(self, single_pass=False):
+        self.single_pass = single_pass
 
     def tokenize(self, s):
+        if self.single_pass:
+            return [s[start:end] for start, end in word_span_tokenize(s)]
         return word_tokenize(s)[0]
 
     def span_tokenize(self, s):
+        if self.single_pass:
+            return word_span_tokenize(s)
         return word_tokenize(s)[1]
+
+
+def _benchmark():
+    import io
+    import os
+    import glob
+    import timeit
+    examples = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'wiki', 'text-examples', '*.txt')
+    text = '\n\n'.join(io.open(fnm, encoding='utf-8').read() for fnm in sorted(glob.glob(examples)))
+    n_tokens = len(word_span_tokenize(text))
+    for single_pass in (False, True):
+        tokenizer = EstWordTokenizer(single_pass=single_pass)
+        elapsed = min(timeit.repeat(lambda: tokenizer.span_tokenize(text), number=1, repeat=5))
+        print('single_pass={0:<6} {1} tokens {2:.4f}s {3:,.0f} tokens/s'.format(
+            str(single_pass), n_tokens, elapsed, n_tokens / elapsed))
+
+
+if __name__ == '__main__':
+    _benchmark()
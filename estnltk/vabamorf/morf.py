@@ -30,6 +30,7 @@ import six
 import re
 import operator
 from functools import reduce
+from collections import OrderedDict
 
 # path listings
 PACKAGE_PATH = os.path.dirname(__file__)
@@ -84,6 +85,65 @@ def deconvert(word):
         return word
 
 
+class AnalysisCache(object):
+    """Bounded least-recently-used cache with hit/miss statistics.
+
+    Used by :py:class:`Vabamorf` for caching postprocessed analysis records and
+    word level analysis results (see :py:meth:`Vabamorf.enable_cache`).
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of cached items.
+    hits: int
+        Number of lookups that found the item in the cache.
+    misses: int
+        Number of lookups that did not find the item in the cache.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        """Return the cached value of `key` or None, if it is not cached."""
+        value = self._data.pop(key, None)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data[key] = value # mark as the most recently used
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store the `value` of `key`, evicting the least recently used item, if the cache is full."""
+        self._data.pop(key, None)
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all items and reset the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self):
+        """Return the cache statistics.
+
+        Returns
+        -------
+        dict
+            Dictionary with keys 'hits', 'misses', 'size' and 'maxsize'.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
+
+
 class Vabamorf(object):
     """Class for performing main tasks of morphological analysis.
 
@@ -125,6 +185,47 @@ class Vabamorf(object):
 
         """
         self._morf = vm.Vabamorf(convert(lex_path), convert(disamb_lex_path))
+        self.analysis_cache = None
+        self.word_cache = None
+
+    def enable_cache(self, analysis_maxsize=100000, word_maxsize=100000):
+        """Enable caching of analysis results.
+
+        Two caches are used:
+
+        * analysis cache stores postprocessed analysis records, keyed on the raw root, ending,
+          clitic, part-of-speech, form and phonetic/compound flags;
+        * word cache stores the analysis of whole words; it is only used for analysis without
+          disambiguation, as then the results depend only on the word itself.
+
+        Parameters
+        ----------
+        analysis_maxsize: int
+            The maximum size of the analysis cache (None disables the cache).
+        word_maxsize: int
+            The maximum size of the word cache (None disables the cache).
+        """
+        self.analysis_cache = AnalysisCache(analysis_maxsize) if analysis_maxsize else None
+        self.word_cache = AnalysisCache(word_maxsize) if word_maxsize else None
+
+    def disable_cache(self):
+        """Disable caching of analysis results."""
+        self.analysis_cache = None
+        self.word_cache = None
+
+    def cache_info(self):
+        """Return the statistics of analysis and word caches.
+
+        Returns
+        -------
+        dict
+            Dictionary with keys 'analysis' and 'word' containing the output of
+            :py:meth:`AnalysisCache.info` or None, if the cache is disabled.
+        """
+        return {
+            'analysis': self.analysis_cache.info() if self.analysis_cache is not None else None,
+            'word': self.word_cache.info() if self.word_cache is not None else None
+        }
 
     def analyze(self, words, **kwargs):
         """Perform morphological analysis and disambiguation of given text.
@@ -157,6 +258,9 @@ class Vabamorf(object):
         # convert words to native strings
         words = [convert(w) for w in words]
 
+        if self.word_cache is not None and not kwargs.get('disambiguate', True):
+            return self._analyze_cached(words, **kwargs)
+
         morfresults = self._morf.analyze(
             vm.StringVector(words),
             kwargs.get('disambiguate', True),
@@ -166,7 +270,77 @@ class Vabamorf(object):
         trim_phonetic = kwargs.get('phonetic', False)
         trim_compound = kwargs.get('compound', True)
 
-        return [postprocess_result(mr, trim_phonetic, trim_compound) for mr in morfresults]
+        return [postprocess_result(mr, trim_phonetic, trim_compound, self.analysis_cache) for mr in morfresults]
+
+    def _analyze_cached(self, words, **kwargs):
+        """Analyze words without disambiguation, using the word cache.
+
+        Words missing from the cache are analyzed together in a single call.
+        """
+        guess = kwargs.get('guess', True)
+        propername = kwargs.get('propername', True)
+        trim_phonetic = kwargs.get('phonetic', False)
+        trim_compound = kwargs.get('compound', True)
+        keys = [(w, guess, propername, trim_phonetic, trim_compound) for w in words]
+
+        results = [self.word_cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            morfresults = self._morf.analyze(
+                vm.StringVector([words[i] for i in missing]),
+                False,
+                guess,
+                True, # phonetic and compound information
+                propername)
+            for i, mr in zip(missing, morfresults):
+                results[i] = postprocess_result(mr, trim_phonetic, trim_compound, self.analysis_cache)
+                self.word_cache.put(keys[i], results[i])
+        # the callers are free to modify the results, so return copies of the cached values
+        return [copy_result(result) for result in results]
+
+    def analyze_sentences(self, sentences, **kwargs):
+        """Perform morphological analysis and disambiguation of several sentences at once.
+
+        All sentences are sent to the vabamorf library in a single call, which avoids the
+        overhead of calling :py:meth:`analyze` separately for each sentence.
+        Each sentence is still analyzed and disambiguated separately.
+
+        Parameters
+        ----------
+        sentences: list of (list of str)
+            List of sentences, each given as a list of pretokenized words.
+        disambiguate: boolean (default: True)
+            Disambiguate the output and remove incosistent analysis.
+        guess: boolean (default: True)
+            Use guessing in case of unknown words
+        propername: boolean (default: True)
+            Perform additional analysis of proper names.
+        compound: boolean (default: True)
+            Add compound word markers to root forms.
+        phonetic: boolean (default: False)
+            Add phonetic information to root forms.
+
+        Returns
+        -------
+        list of (list of dict)
+            List of analysis for each word of each sentence in input.
+        """
+        if self.word_cache is not None and not kwargs.get('disambiguate', True):
+            return [self._analyze_cached([convert(w) for w in sentence], **kwargs) for sentence in sentences]
+
+        sentences = vm.SentenceVector([[convert(w) for w in sentence] for sentence in sentences])
+
+        morfresults = self._morf.analyzeSentences(
+            sentences,
+            kwargs.get('disambiguate', True),
+            kwargs.get('guess', True),
+            True, # phonetic and compound information
+            kwargs.get('propername', True))
+        trim_phonetic = kwargs.get('phonetic', False)
+        trim_compound = kwargs.get('compound', True)
+
+        return [[postprocess_result(mr, trim_phonetic, trim_compound, self.analysis_cache) for mr in sentence]
+                for sentence in morfresults]
 
     def disambiguate(self, words):
         """Disambiguate previously analyzed words.
@@ -299,12 +473,46 @@ class Vabamorf(object):
         return [deconvert(w) for w in words]
 
 
-def postprocess_result(morphresult, trim_phonetic, trim_compound):
-    """Postprocess vabamorf wrapper output."""
+def postprocess_result(morphresult, trim_phonetic, trim_compound, cache=None):
+    """Postprocess vabamorf wrapper output.
+
+    If `cache` (an :py:class:`AnalysisCache`) is given, it is used for looking up and storing
+    postprocessed analysis records.
+    """
     word, analysis = morphresult
+    if cache is None:
+        analysis = [postprocess_analysis(a, trim_phonetic, trim_compound) for a in analysis]
+    else:
+        analysis = [postprocess_analysis_cached(a, trim_phonetic, trim_compound, cache) for a in analysis]
     return {
         'text': deconvert(word),
-        'analysis': [postprocess_analysis(a, trim_phonetic, trim_compound) for a in analysis]
+        'analysis': analysis
+    }
+
+
+def postprocess_analysis_cached(analysis, trim_phonetic, trim_compound, cache):
+    """Postprocess a single analysis, reusing the result from `cache` if possible."""
+    key = (analysis.root, analysis.ending, analysis.clitic, analysis.partofspeech, analysis.form,
+           trim_phonetic, trim_compound)
+    record = cache.get(key)
+    if record is None:
+        record = postprocess_analysis(analysis, trim_phonetic, trim_compound)
+        cache.put(key, record)
+    return copy_analysis(record)
+
+
+def copy_analysis(record):
+    """Copy a postprocessed analysis record, so that the copy can be modified independently."""
+    record = dict(record)
+    record['root_tokens'] = list(record['root_tokens'])
+    return record
+
+
+def copy_result(result):
+    """Copy a postprocessed word analysis, so that the copy can be modified independently."""
+    return {
+        'text': result['text'],
+        'analysis': [copy_analysis(a) for a in result['analysis']]
     }
 
 
@@ -464,6 +672,32 @@ def analyze(words, **kwargs):
     return Vabamorf.instance().analyze(words, **kwargs)
 
 
+def analyze_sentences(sentences, **kwargs):
+    """Perform morphological analysis and disambiguation of several sentences at once.
+
+    Parameters
+    ----------
+    sentences: list of (list of str)
+        List of sentences, each given as a list of pretokenized words.
+    disambiguate: boolean (default: True)
+        Disambiguate the output and remove incosistent analysis.
+    guess: boolean (default: True)
+        Use guessing in case of unknown words
+    propername: boolean (default: True)
+        Perform additional analysis of proper names.
+    compound: boolean (default: True)
+        Add compound word markers to root forms.
+    phonetic: boolean (default: False)
+        Add phonetic information to root forms.
+
+    Returns
+    -------
+    list of (list of dict)
+        List of analysis for each word of each sentence in input.
+    """
+    return Vabamorf.instance().analyze_sentences(sentences, **kwargs)
+
+
 def disambiguate(words):
     """Disambiguate previously analyzed words.
 
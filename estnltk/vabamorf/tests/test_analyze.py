@@ -3,7 +3,8 @@ from __future__ import unicode_literals, print_function, absolute_import
 
 import unittest
 import operator
-from ..morf import trim_phonetics, get_group_tokens, postprocess_analysis, convert, analyze
+from ..morf import trim_phonetics, get_group_tokens, postprocess_analysis, convert, analyze, analyze_sentences
+from ..morf import Vabamorf, AnalysisCache
 from ..vabamorf import Analysis
 from functools import reduce
 
@@ -236,6 +237,60 @@ class TextIsSameAsListTest(unittest.TestCase):
         return SAMPLE_TEXT
 
 
+class AnalyzeSentencesTest(unittest.TestCase):
+
+    def test_same_as_analyze(self):
+        sentences = [['Jänes', 'oli', 'parajasti', 'põllu', 'peal', '.'],
+                     [],
+                     ['Hunt', 'jooksis', 'metsas', '.']]
+        for disambiguate in [True, False]:
+            expected = [analyze(sentence, disambiguate=disambiguate) for sentence in sentences]
+            result = analyze_sentences(sentences, disambiguate=disambiguate)
+            self.assertListEqual(expected, result)
+
+
+class AnalysisCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.morf = Vabamorf.instance()
+
+    def tearDown(self):
+        self.morf.disable_cache()
+
+    def test_lru_eviction(self):
+        cache = AnalysisCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertDictEqual(cache.info(), {'hits': 2, 'misses': 1, 'size': 2, 'maxsize': 2})
+
+    def test_same_as_uncached(self):
+        for disambiguate in [True, False]:
+            self.morf.disable_cache()
+            expected = self.morf.analyze(SAMPLE_TEXT, disambiguate=disambiguate)
+            self.morf.enable_cache()
+            self.assertListEqual(self.morf.analyze(SAMPLE_TEXT, disambiguate=disambiguate), expected)
+            self.assertListEqual(self.morf.analyze(SAMPLE_TEXT, disambiguate=disambiguate), expected)
+            info = self.morf.cache_info()
+            if disambiguate:
+                self.assertGreater(info['analysis']['hits'], 0)
+                self.assertEqual(info['word']['hits'] + info['word']['misses'], 0)
+            else:
+                self.assertGreaterEqual(info['word']['hits'], len(expected))
+
+    def test_results_are_copies(self):
+        self.morf.enable_cache()
+        first = self.morf.analyze(['kassid', 'kassid'], disambiguate=False)
+        first[0]['analysis'][0]['root_tokens'].append('koer')
+        first[1]['analysis'][0]['lemma'] = 'koer'
+        second = self.morf.analyze(['kassid'], disambiguate=False)
+        self.assertListEqual(second[0]['analysis'][0]['root_tokens'], ['kass'])
+        self.assertEqual(second[0]['analysis'][0]['lemma'], 'kass')
+
+
 class DisambiguationTest(unittest.TestCase):
 
     def test_disambiguation(self):
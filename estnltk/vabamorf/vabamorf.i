@@ -47,6 +47,8 @@ namespace std {
     %template(WordAnalysis) pair<string, vector<Analysis> >;
     %template(SentenceAnalysis) vector<pair<string, vector<Analysis> > >;
     %template(StringVector) vector<std::string>;
+    %template(SentenceVector) vector<vector<std::string> >;
+    %template(SentenceAnalysisVector) vector<vector<pair<string, vector<Analysis> > > >;
     %template(SpellingSuggestions) vector<SpellingResults>;
     %template(Syllables) vector<Syllable>;
     %template(SentenceSyllables) vector<vector<Syllable> >;
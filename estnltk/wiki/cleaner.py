@@ -69,6 +69,13 @@ def ignoreTag(tag):
 for tag in ignoredTags:
     ignoreTag(tag)
 
+# The same tags in single patterns, so that clean scans the text once for all of them.
+# The matches of the separate patterns that these skip are nested in their matches,
+# so dropSpans removes the same text.
+selfClosing_tags_pattern = re.compile(r'<\s*(?:%s)\b[^>]*/\s*>' % '|'.join(selfClosingTags), re.DOTALL | re.IGNORECASE)
+ignored_tags_left = re.compile(r'<(?:%s)\b[^>/]*>' % '|'.join(ignoredTags), re.IGNORECASE)
+ignored_tags_right = re.compile(r'</\s*(?:%s)>' % '|'.join(ignoredTags), re.IGNORECASE)
+
 def dropNested(text, openDelim, closeDelim):
     """
     A matching function for nested expressions, e.g. namespaces and tables.
@@ -162,15 +169,12 @@ def clean(text):
             spans.append((m.start(), m.end()))
 
     # Drop self-closing tags
-    for pattern in selfClosing_tag_patterns:
-        for m in pattern.finditer(text):
-            spans.append((m.start(), m.end()))
+    for m in selfClosing_tags_pattern.finditer(text):
+        spans.append((m.start(), m.end()))
 
     # Drop ignored tags
-    for left, right in ignored_tag_patterns:
-        for m in left.finditer(text):
-            spans.append((m.start(), m.end()))
-        for m in right.finditer(text):
+    for pattern in (ignored_tags_left, ignored_tags_right):
+        for m in pattern.finditer(text):
             spans.append((m.start(), m.end()))
 
     # Bulk remove all spans
@@ -178,7 +182,9 @@ def clean(text):
 
     # Drop discarded elements
     for tag in discardElements:
-        text = dropNested(text, r'<\s*%s\b[^>/]*>' % tag, r'<\s*/\s*%s>' % tag)
+        # the patterns are case sensitive, an element can only be found if its name occurs in the text
+        if tag in text:
+            text = dropNested(text, r'<\s*%s\b[^>/]*>' % tag, r'<\s*/\s*%s>' % tag)
 
     # Expand placeholders
     for pattern, placeholder in placeholder_tag_patterns:
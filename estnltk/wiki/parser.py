@@ -8,8 +8,11 @@ import re
 from xml.etree.ElementTree import iterparse
 import argparse
 from bz2 import BZ2File
+import sys
 import time
+import multiprocessing
 from copy import copy
+from collections import deque
 from .infoBox import infoBoxParser
 from .sections import sectionsParser
 from .references import referencesFinder,refsParser
@@ -18,6 +21,7 @@ from .jsonWriter import jsonWriter
 from .cleaner import clean
 from .internalLink import findBalanced
 from .cleaner import dropSpans
+from ..corpus_store import CorpusStoreWriter, SHARD_SIZE
 
 # Matches bold/italic
 bold_italic = re.compile(r"'''''(.*?)'''''")
@@ -81,6 +85,38 @@ def templatesCollector(text, open, close):
 
     return text, others
 
+def parsePage(pageObj, text):
+    """Parse the wikitext of a page into the page object: references, infobox, templates,
+    categories and the sections with their links, images and tables."""
+
+    #Finds and marks nicely all the references in the article, returns a tag:reference dictionary
+    text, refsDict = referencesFinder(text)
+
+    #Infoboxes
+    m = re.search(ib, text)
+    if m:
+        text, pageObj['infobox'] = infoBoxParser(text)
+
+    #Finds links in references TODO: find unbracketed external links
+
+    if refsDict:
+        refsDict = refsParser(refsDict)
+        pageObj['references'] = refsDict
+    #Categories, cleaning, and other element.
+    if '{' in text:
+        text, pageObj['other'] = templatesCollector(text, '{', '}')
+
+    text, catList = categoryParser(text)
+    text = clean(text)
+    pageObj['categories'] = catList
+
+    #SectionParser is where all the work with links, images etc gets done
+    sectionobj = (sectionsParser(text))
+    pageObj['sections'] = sectionobj
+
+    return pageObj
+
+
 def etWikiParser(data, outputdir, verbose = False):
     global dropcount
 
@@ -134,32 +170,7 @@ def etWikiParser(data, outputdir, verbose = False):
                 print(pageObj)
                 continue
             compStart = time.time()
-
-    #Finds and marks nicely all the references in the article, returns a tag:reference dictionary
-            text, refsDict = referencesFinder(text)
-
-    #Infoboxes
-            m = re.search(ib, text)
-            if m:
-                text, pageObj['infobox'] = infoBoxParser(text)
-
-#Finds links in references TODO: find unbracketed external links
-
-            if refsDict:
-                refsDict = refsParser(refsDict)
-                pageObj['references'] = refsDict
-#Categories, cleaning, and other element.
-            if '{' in text:
-                text, pageObj['other'] = templatesCollector(text, '{', '}')
-
-            text, catList = categoryParser(text)
-            text = clean(text)
-            pageObj['categories'] = catList
-
-#SectionParser is where all the work with links, images etc gets done
-            sectionobj = (sectionsParser(text))
-            pageObj['sections'] = sectionobj
-
+            parsePage(pageObj, text)
 
             #Precious time
 
@@ -178,6 +189,161 @@ def etWikiParser(data, outputdir, verbose = False):
             #print('Totaltime: ' , totalTime)
 
 
+def isRedirect(text):
+    return '#REDIRECT' in text or '#suuna' in text
+
+
+def dumpPages(source):
+    """Read the pages of a dump one by one, discarding the parsed XML elements.
+
+    Parameters
+    ----------
+    source: str or file object
+        The dump file, for example a BZ2File.
+
+    Yields
+    ------
+    (str, str, str)
+        The title, timestamp and wikitext of every revision, also redirects.
+    """
+    title = timestamp = None
+    root = None
+    for event, elem in iterparse(source, ('start', 'end')):
+        if root is None:
+            root = elem
+        if event == 'start':
+            continue
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if tag == 'title':
+            title = as_unicode(elem.text) if elem.text else elem.text
+        elif tag == 'timestamp':
+            timestamp = as_unicode(elem.text) if elem.text else elem.text
+        elif tag == 'text':
+            yield title, timestamp, as_unicode(elem.text) if elem.text else elem.text
+        elif tag == 'page':
+            # the pages are children of the root
+            root.clear()
+            title = timestamp = None
+
+
+def parsePages(pages):
+    """Parse a batch of (title, timestamp, text) pages into page objects, as etWikiParser does."""
+    pageObjs = []
+    for title, timestamp, text in pages:
+        pageObj = {'title': title, 'url': linkBegin + title.replace(' ', '_')}
+        if timestamp is not None:
+            pageObj['timestamp'] = timestamp
+        pageObjs.append(parsePage(pageObj, text))
+    return pageObjs
+
+
+def pageBatches(pages, batchSize, stats):
+    """Group the pages into batches, dropping the redirects and pages without text."""
+    batch = []
+    for title, timestamp, text in pages:
+        if text is None or isRedirect(text):
+            stats['dropped'] += 1
+            continue
+        stats['characters'] += len(text)
+        batch.append((title, timestamp, text))
+        if len(batch) >= batchSize:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parseBatches(batches, processes=None, maxInFlight=None):
+    """Parse the page batches, in a pool of worker processes if `processes` is given.
+
+    Yields
+    ------
+    list of dict
+        The page objects of every batch, in the order of the batches.
+    """
+    if not processes or processes <= 1:
+        for batch in batches:
+            yield parsePages(batch)
+        return
+    maxInFlight = maxInFlight or 2 * processes
+    pool = multiprocessing.Pool(processes)
+    try:
+        inFlight = deque()
+        for batch in batches:
+            inFlight.append(pool.apply_async(parsePages, (batch, )))
+            if len(inFlight) >= maxInFlight:
+                yield inFlight.popleft().get()
+        while inFlight:
+            yield inFlight.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def openDump(inputfile):
+    if inputfile.endswith('.bz2'):
+        return BZ2File(inputfile)
+    return open(inputfile, 'rb')
+
+
+def convertDump(inputfile, outputdir, processes=None, batchSize=100, shardSize=SHARD_SIZE, reportEvery=30.0,
+                verbose=False):
+    """Convert a Wikipedia dump to a corpus store of JSON-lines shards.
+
+    The (bz2 compressed) dump is read as a stream, the pages are parsed in batches by the worker
+    processes and written to the shards of a :py:class:`~estnltk.corpus_store.CorpusStore`
+    with the titles in its index. The page objects are the same as the files of etWikiParser.
+
+    Parameters
+    ----------
+    inputfile: str
+        The path of the dump, ending with .bz2 or .xml.
+    outputdir: str
+        The directory of the new corpus store.
+    processes: int
+        The number of worker processes (default: parse in this process).
+    batchSize: int
+        The number of pages sent to a worker at once.
+    shardSize: int
+        The maximum size of a shard in bytes.
+    reportEvery: float
+        The interval of progress reports in seconds, or None for no reports.
+    verbose: boolean
+        Print the titles of the written pages.
+
+    Returns
+    -------
+    dict
+        The statistics: the numbers of written and dropped pages, characters of wikitext,
+        seconds and written pages per second.
+    """
+    stats = {'pages': 0, 'dropped': 0, 'characters': 0}
+    start = lastReport = time.time()
+    with openDump(inputfile) as dump:
+        with CorpusStoreWriter(outputdir, shardSize, meta_keys=('title', )) as writer:
+            batches = pageBatches(dumpPages(dump), batchSize, stats)
+            for pageObjs in parseBatches(batches, processes):
+                for pageObj in pageObjs:
+                    writer.add(pageObj)
+                    if verbose:
+                        print(pageObj['title'])
+                stats['pages'] += len(pageObjs)
+                if reportEvery is not None and time.time() - lastReport >= reportEvery:
+                    lastReport = time.time()
+                    printProgress(stats, lastReport - start)
+    stats['seconds'] = time.time() - start
+    stats['pages_per_second'] = stats['pages'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+    if reportEvery is not None:
+        printProgress(stats, stats['seconds'])
+    return stats
+
+
+def printProgress(stats, seconds):
+    print('{0} pages written, {1} dropped, {2:.0f} pages/s, {3:.2f} M characters/s'.format(
+        stats['pages'], stats['dropped'], stats['pages'] / seconds, stats['characters'] / seconds / 1e6),
+        file=sys.stderr)
+
+
 def main():
 
     parser = argparse.ArgumentParser(description='Parse Estonian Wikipedia dump file to Article Name.json files in a specified folder')
@@ -192,13 +358,27 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true",
                         help='Print written article titles and count.')
 
+    parser.add_argument("-s", "--store", action="store_true",
+                        help='Write the articles to JSON-lines shards of a corpus store instead of one file per article.')
+
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help='Number of worker processes parsing the articles (with --store).')
+
+    parser.add_argument("-b", "--batch-size", type=int, default=100,
+                        help='Number of articles sent to a worker at once (with --store).')
+
 
     args = parser.parse_args()
     outputDir = args.directory
     inputFile = args.inputfile
     verbose = args.verbose
 
-    if inputFile[-3:] == 'bz2':
+    if args.store:
+        if inputFile[-3:] not in ('bz2', 'xml'):
+            print("WRONG FILE FORMAT! \nTry etwiki-latest-pages-articles.xml.bz2 from https://dumps.wikimedia.org/etwiki/latest/")
+            return
+        convertDump(inputFile, outputDir, args.processes, args.batch_size, verbose=verbose)
+    elif inputFile[-3:] == 'bz2':
         print('BZ2', inputFile)
         with BZ2File(inputFile) as xml_file:
             data = parse_and_remove(xml_file, "wikimedia/wikimedia")
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import bz2
+import json
+import shutil
+import tempfile
+import unittest
+from xml.etree.ElementTree import ParseError
+
+from ..parser import parse_and_remove, etWikiParser, convertDump
+from ...corpus_store import CorpusStore
+
+PAGE = '''<page><title>{0}</title><ns>0</ns><revision><timestamp>2015-03-22T08:25:09Z</timestamp>
+<text xml:space="preserve">{1}</text></revision></page>'''
+
+ARTICLE = '''\'\'\'{0}\'\'\' on [[Eesti]] [[linn|linnaks]].&lt;ref&gt;Allikas. 2006.&lt;/ref&gt;
+{{{{Vaata|Teine}}}}
+== Ajalugu ==
+Seal on &lt;small&gt;muuseum&lt;/small&gt; ja [http://www.muuseum.ee koduleht].
+* punkt
+[[Kategooria:Eesti linnad]]
+'''
+
+
+class DumpTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        pages = [PAGE.format('Linn {0}'.format(i), ARTICLE.format('Linn {0}'.format(i))) for i in range(5)]
+        pages.append(PAGE.format('Suunamine', '#suuna [[Linn 1]]'))
+        dump = '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/">{0}</mediawiki>'.format('\n'.join(pages))
+        self.dump = os.path.join(self.tmpdir, 'etwiki.xml.bz2')
+        with bz2.BZ2File(self.dump, 'wb') as f:
+            f.write(dump.encode('utf-8'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_same_as_files(self):
+        outdir = os.path.join(self.tmpdir, 'json')
+        with bz2.BZ2File(self.dump) as f:
+            etWikiParser(parse_and_remove(f, 'wikimedia/wikimedia'), outdir)
+        expected = {}
+        for fnm in os.listdir(outdir):
+            with open(os.path.join(outdir, fnm), 'rb') as f:
+                page = json.loads(f.read().decode('utf-8'))
+                expected[page['title']] = page
+
+        for processes in (None, 2):
+            path = os.path.join(self.tmpdir, 'store{0}'.format(processes))
+            stats = convertDump(self.dump, path, processes=processes, batchSize=2, reportEvery=None)
+            self.assertEqual(5, stats['pages'])
+            self.assertEqual(1, stats['dropped'])
+            with CorpusStore(path) as store:
+                self.assertEqual(['Linn {0}'.format(i) for i in range(5)],
+                                 [store.metadata(doc_id)['title'] for doc_id in store])
+                for doc_id in store:
+                    page = store[doc_id]
+                    self.assertEqual(expected[page['title']], page)
+
+    def test_broken_dump(self):
+        with bz2.BZ2File(self.dump) as f:
+            data = f.read()
+        broken = os.path.join(self.tmpdir, 'broken.xml')
+        with open(broken, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        path = os.path.join(self.tmpdir, 'store')
+        self.assertRaises(ParseError, convertDump, broken, path, batchSize=1, reportEvery=None)
+        self.assertRaises(ValueError, CorpusStore, path)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""Binary, memory-mapped lookup index for Estonian WordNet.
+
+The index is built once from the text files `lit_pos_synidx.txt` (lemma and part-of-speech to synset indices)
+and `kb69a-utf8.soi` (synset index to byte offset in the WordNet file) and then opened with mmap, so that
+lemma lookups are done with binary search and offset lookups by direct indexing, without rescanning the text files.
+
+File layout (all integers are little-endian unsigned 32-bit, unless noted otherwise):
+
+  header       : magic (4 bytes), version, size of the literal file, size of the offset file,
+                 number of keys, position of the key table, size of the offset table, position of the offset table
+  key records  : for every `lemma:pos` key (sorted by UTF-8 bytes): key length (16-bit), key, number of synset
+                 indices, synset indices
+  key table    : position of every key record
+  offset table : byte offset in the WordNet file for every synset index (NO_OFFSET, if the index is missing)
+
+The index can be built ahead of time with::
+
+    python -m estnltk.wordnet.index
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import mmap
+import codecs
+import struct
+from collections import defaultdict
+
+MAGIC = b'EWNI'
+VERSION = 1
+NO_OFFSET = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<4s7I')
+_UINT = struct.Struct('<I')
+_KEY_LEN = struct.Struct('<H')
+
+
+def _file_size(path):
+    return os.path.getsize(path)
+
+
+def build_index(lit_pos_file, soi_file, index_file):
+    """Builds the binary index from the WordNet text files.
+
+    Parameters
+    ----------
+    lit_pos_file : str
+      Path of the file mapping `lemma:pos` to synset indices.
+    soi_file : str
+      Path of the file mapping synset indices to byte offsets in the WordNet file.
+    index_file : str
+      Path of the index file to be written.
+
+    """
+    keys = defaultdict(list)
+    with codecs.open(lit_pos_file, 'rb', 'utf-8') as fin:
+        for line in fin:
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            literal, pos, idxes = line.rsplit(':', 2)
+            keys[(literal + ':' + pos).encode('utf-8')].extend(int(x) for x in idxes.split())
+
+    offsets = {}
+    with codecs.open(soi_file, 'rb', 'utf-8') as fin:
+        for line in fin:
+            split_line = line.split(':')
+            if len(split_line) == 2:
+                offsets[int(split_line[0])] = int(split_line[1])
+    offset_table_size = max(offsets) + 1 if offsets else 0
+
+    records = []
+    key_positions = []
+    position = _HEADER.size
+    for key in sorted(keys):
+        idxes = keys[key]
+        record = b''.join([_KEY_LEN.pack(len(key)), key, _UINT.pack(len(idxes)),
+                           struct.pack('<%dI' % len(idxes), *idxes)])
+        key_positions.append(position)
+        records.append(record)
+        position += len(record)
+    key_table_pos = position
+    offset_table_pos = key_table_pos + _UINT.size * len(key_positions)
+
+    offset_table = [NO_OFFSET] * offset_table_size
+    for idx, offset in offsets.items():
+        offset_table[idx] = offset
+
+    # write to a temporary file first, so that concurrent readers never see a partial index
+    tmp_file = '%s.%d.tmp' % (index_file, os.getpid())
+    with open(tmp_file, 'wb') as fout:
+        fout.write(_HEADER.pack(MAGIC, VERSION, _file_size(lit_pos_file), _file_size(soi_file),
+                                len(key_positions), key_table_pos, offset_table_size, offset_table_pos))
+        for record in records:
+            fout.write(record)
+        fout.write(struct.pack('<%dI' % len(key_positions), *key_positions))
+        fout.write(struct.pack('<%dI' % offset_table_size, *offset_table))
+    os.rename(tmp_file, index_file)
+
+
+class WordNetIndex(object):
+    """Memory-mapped WordNet lookup index.
+
+    Parameters
+    ----------
+    index_file : str
+      Path of the index file created by `build_index`.
+
+    """
+
+    def __init__(self, index_file):
+        with open(index_file, 'rb') as fin:
+            self._mmap = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.lit_pos_size, self.soi_size, self._n_keys, self._key_table_pos,
+         self._offset_table_size, self._offset_table_pos) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('Not a WordNet index file: {0}'.format(index_file))
+
+    def close(self):
+        self._mmap.close()
+
+    def is_up_to_date(self, lit_pos_file, soi_file):
+        """Checks whether the index was built from the given versions of the text files."""
+        return self.lit_pos_size == _file_size(lit_pos_file) and self.soi_size == _file_size(soi_file)
+
+    def _key_at(self, i):
+        position = _UINT.unpack_from(self._mmap, self._key_table_pos + i * _UINT.size)[0]
+        key_len = _KEY_LEN.unpack_from(self._mmap, position)[0]
+        key_start = position + _KEY_LEN.size
+        return self._mmap[key_start:key_start + key_len], key_start + key_len
+
+    def _idxes_at(self, position):
+        n_idxes = _UINT.unpack_from(self._mmap, position)[0]
+        return list(struct.unpack_from('<%dI' % n_idxes, self._mmap, position + _UINT.size))
+
+    def _lower_bound(self, key):
+        lo, hi = 0, self._n_keys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def synset_idxes(self, lemma, pos=None):
+        """Returns the sorted synset indices of `lemma`, restricted to `pos`, if provided.
+
+        Parameters
+        ----------
+        lemma : str
+          Literal of the sought synsets.
+        pos : str, optional
+          Part-of-speech of the sought synsets.
+
+        Returns
+        -------
+        list of ints
+          Synset indices. Empty list, if no match was found.
+
+        """
+        prefix = (lemma + ':').encode('utf-8')
+        if pos:
+            key = prefix + pos.encode('utf-8')
+            i = self._lower_bound(key)
+            if i < self._n_keys:
+                found_key, position = self._key_at(i)
+                if found_key == key:
+                    return sorted(self._idxes_at(position))
+            return []
+        idxes = []
+        i = self._lower_bound(prefix)
+        while i < self._n_keys:
+            found_key, position = self._key_at(i)
+            if not found_key.startswith(prefix):
+                break
+            if b':' not in found_key[len(prefix):]:
+                idxes.extend(self._idxes_at(position))
+            i += 1
+        return sorted(idxes)
+
+    def synset_offset(self, synset_idx):
+        """Returns the byte offset of the synset in the WordNet file, or None if the synset is unknown."""
+        if 0 <= synset_idx < self._offset_table_size:
+            offset = _UINT.unpack_from(self._mmap, self._offset_table_pos + synset_idx * _UINT.size)[0]
+            if offset != NO_OFFSET:
+                return offset
+        return None
+
+
+def open_index(lit_pos_file, soi_file, index_file):
+    """Opens the index, (re)building it first if it is missing or out of date.
+
+    Returns
+    -------
+    WordNetIndex
+      The opened index.
+      None, if the index could not be built or opened (e.g. the data directory is not writable).
+
+    """
+    try:
+        if os.path.exists(index_file):
+            index = WordNetIndex(index_file)
+            if index.is_up_to_date(lit_pos_file, soi_file):
+                return index
+            index.close()
+        build_index(lit_pos_file, soi_file, index_file)
+        return WordNetIndex(index_file)
+    except (IOError, OSError, ValueError, struct.error):
+        return None
+
+
+if __name__ == '__main__':
+    from estnltk.wordnet.wn import _LIT_POS_FILE, _SOI, _INDEX_FILE
+    build_index(_LIT_POS_FILE, _SOI, _INDEX_FILE)
+    print('WordNet index written to', _INDEX_FILE)
@@ -16,6 +16,7 @@ except ImportError: # Py3
     from io import StringIO
     
 from estnltk.wordnet.eurown import Parser
+from estnltk.wordnet.index import open_index
 from estnltk import analyze
 from estnltk.core import PACKAGE_PATH
 from estnltk.core import as_unicode
@@ -28,6 +29,7 @@ _SOI = os.path.join(DATA_DIR, "kb69a-utf8.soi")
 _WN_FILE = os.path.join(DATA_DIR, "kb69a-utf8.txt")
 _SENSE_FILE = os.path.join(DATA_DIR, "sense.txt")
 _MAX_TAX_FILE = os.path.join(DATA_DIR, "max_tax_depths.cnf")
+_INDEX_FILE = os.path.join(DATA_DIR, "lit_pos_synidx.idx")
 
 VERB = 'v'
 NOUN = 'n'
@@ -38,6 +40,9 @@ MAX_TAXONOMY_DEPTHS = {} # necessary for Leacock & Chodorow similarity measure
 
 parser = None
 
+USE_INDEX = True # use the binary lookup index (see estnltk.wordnet.index), if it can be built/opened
+_index = None
+
 with codecs.open(_MAX_TAX_FILE,'rb', 'utf-8') as fin:
     for line in fin:
         pos,max_depth = line.strip().split(':')
@@ -50,6 +55,25 @@ LEM_POS_2_SS_IDX = defaultdict(lambda: defaultdict(list)) # map lemma and pos to
 
 LOADED_POS = set()
 
+def _get_index():
+    """Returns the binary lookup index, or None if it is disabled or unavailable.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+    The index is built on the first call, if it does not exist yet. If the index cannot be
+    built or opened, text files are scanned instead.
+
+    """
+    global _index, USE_INDEX
+    if not USE_INDEX:
+        return None
+    if _index is None:
+        _index = open_index(_LIT_POS_FILE, _SOI, _INDEX_FILE)
+        if _index is None:
+            USE_INDEX = False
+    return _index
+
 def _get_synset_offsets(synset_idxes):
     """Returs pointer offset in the WordNet file for every synset index.
 
@@ -68,8 +92,22 @@ def _get_synset_offsets(synset_idxes):
     list of ints
       Lists pointer offsets in Wordnet file.
 
+    Raises
+    ------
+    KeyError
+      If a synset index is unknown.
 
     """
+    index = _get_index()
+    if index is not None:
+        offsets = []
+        for synset_idx in synset_idxes:
+            offset = index.synset_offset(synset_idx)
+            if offset is None:
+                raise KeyError(synset_idx)
+            offsets.append(offset)
+        return offsets
+
     offsets = {}
     current_seeked_offset_idx = 0
 
@@ -219,6 +257,12 @@ def synsets(lemma,pos=None):
     """
 
     def _get_synset_idxes(lemma,pos):
+        index = _get_index()
+        if index is not None:
+            idxes = index.synset_idxes(lemma,pos)
+            LEM_POS_2_SS_IDX[lemma][pos].extend(idxes)
+            return idxes
+
         line_prefix_regexp = "%s:%s:(.*)"%(lemma,pos if pos else "\w+") 
         line_prefix = re.compile(line_prefix_regexp)
 
@@ -58,6 +58,15 @@ typedef std::pair<std::string, AnalysisVector > WordAnalysis;
 // type for a string vector.
 typedef std::vector<std::string> StringVector;
 
+// type for a vector of sentences, each sentence being a vector of words.
+typedef std::vector<StringVector> SentenceVector;
+
+// type for storing analysis results of a sentence.
+typedef std::vector<WordAnalysis> SentenceAnalysis;
+
+// type for storing analysis results of a vector of sentences.
+typedef std::vector<SentenceAnalysis> SentenceAnalysisVector;
+
 
 /**
  * Class that represents a syllable.
@@ -125,6 +134,23 @@ public:
         const bool phonetic,
         const bool propername);
 
+    /**
+     * Analyze a vector of sentences in a single call.
+     * Each sentence is analyzed (and disambiguated) separately, as with
+     * the analyze method, so sentence boundaries are preserved.
+     * @param sentences The sentences to analyze, each given as a vector of words (UTF8).
+     * @param disambiguate Reduce the number of possible analysis by applying disambiguation.
+     * @param guess Try to guess unknown words.
+     * @param phonetic Add phonetic markup.
+     * @param propername Perform addigional proper name analysis.
+     */
+    SentenceAnalysisVector analyzeSentences(
+        SentenceVector const& sentences,
+        const bool disambiguate,
+        const bool guess,
+        const bool phonetic,
+        const bool propername);
+
     /**
      * Disambiguate a sentence that is already analyzed.
      * This method is a single step in a more complex